@@ -0,0 +1,144 @@
+import asyncio
+import inspect
+import json
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional
+from urllib.parse import parse_qsl, quote, unquote, urlsplit
+
+from fastapi import HTTPException
+from fastapi.routing import APIRoute
+
+MAX_BATCH_SIZE = 500
+
+# (dataset, path params, query params) -> payload, or an awaitable of one
+BatchHandler = Callable[[Any, Dict[str, str], Dict[str, str]], Any]
+
+
+@dataclass(frozen=True)
+class SubRequest:
+    key: str
+    path: str
+    query: Dict[str, str]
+
+
+def parse_sub_requests(items: List[Any]) -> List[SubRequest]:
+    """Accept "/path?x=1" strings or {"id": ..., "path": ...} objects; keys default to the path"""
+    requests = []
+    for i, item in enumerate(items):
+        if isinstance(item, str):
+            key, target = item, item
+        elif isinstance(item, dict) and isinstance(item.get("path"), str):
+            target = item["path"]
+            key = str(item.get("id", target))
+        else:
+            raise HTTPException(status_code=422, detail=f"Sub-request {i} needs a path")
+        url = urlsplit(target)
+        requests.append(SubRequest(key, unquote(url.path), dict(parse_qsl(url.query))))
+    return requests
+
+
+def _error(e: Exception) -> Dict:
+    if isinstance(e, HTTPException):
+        return {"status": e.status_code, "error": e.detail}
+    return {"status": 500, "error": str(e)}
+
+
+class BatchDispatcher:
+    """Runs many GET sub-requests against the app's routes inside one request.
+
+    Routes with a registered handler are answered straight from the shared
+    Dataset, with no routing, validation or serialization per item. Handlers
+    that return an awaitable (anything too slow for the event loop) are
+    awaited concurrently with each other. Any other
+    GET route is dispatched through the ASGI app in-process; those run
+    concurrently and read ``store.current`` like any request, so a reload
+    landing mid-batch can answer them from the newer dataset. JSON responses
+    are embedded as JSON, anything else as text. Each sub-request succeeds or
+    fails on its own.
+    """
+
+    def __init__(self, app, handlers: Dict[str, BatchHandler]):
+        self.app = app
+        self.handlers = handlers
+
+    def _match(self, path: str):
+        for route in self.app.routes:
+            if isinstance(route, APIRoute) and "GET" in route.methods:
+                match = route.path_regex.match(path)
+                if match:
+                    return route, match.groupdict()
+        return None, None
+
+    async def _via_asgi(self, request: SubRequest):
+        scope = {
+            "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1",
+            "method": "GET", "scheme": "http", "root_path": "",
+            "path": request.path, "raw_path": quote(request.path).encode(),
+            "query_string": "&".join(f"{quote(k)}={quote(v)}" for k, v in request.query.items()).encode(),
+            "headers": [], "client": None, "server": None,
+        }
+        status, content_type, body = 500, b"", []
+
+        async def receive():
+            return {"type": "http.request", "body": b"", "more_body": False}
+
+        async def send(message):
+            nonlocal status, content_type
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                content_type = next((value for name, value in message.get("headers", [])
+                                     if name.lower() == b"content-type"), b"")
+            elif message["type"] == "http.response.body":
+                body.append(message.get("body", b""))
+
+        await self.app(scope, receive, send)
+        raw = b"".join(body)
+        if not raw:
+            return status, None
+        if b"json" in content_type:
+            return status, json.loads(raw)
+        # /metrics, collapsed profiles and other text responses
+        return status, raw.decode("utf-8", errors="replace")
+
+    async def run(self, data, requests: List[SubRequest]) -> Dict[str, Dict]:
+        if len(requests) > MAX_BATCH_SIZE:
+            raise HTTPException(status_code=413, detail=f"At most {MAX_BATCH_SIZE} sub-requests per batch")
+
+        results: Dict[str, Optional[Dict]] = {}
+        pending, deferred = [], []
+        for request in requests:
+            route, params = self._match(request.path)
+            if route is None:
+                results[request.key] = {"status": 404, "error": "Not Found"}
+                continue
+            handler = self.handlers.get(route.path)
+            if handler is None:
+                results[request.key] = None  # keeps the caller's order
+                deferred.append(request)
+                continue
+            try:
+                body = handler(data, params, request.query)
+            except Exception as e:
+                results[request.key] = _error(e)
+                continue
+            if inspect.isawaitable(body):
+                results[request.key] = None
+                pending.append((request, body))
+            else:
+                results[request.key] = {"status": 200, "body": body}
+
+        bodies = await asyncio.gather(*(body for _, body in pending), return_exceptions=True)
+        for (request, _), body in zip(pending, bodies):
+            results[request.key] = _error(body) if isinstance(body, Exception) else {"status": 200, "body": body}
+
+        outcomes = await asyncio.gather(*(self._via_asgi(request) for request in deferred), return_exceptions=True)
+        for request, outcome in zip(deferred, outcomes):
+            if isinstance(outcome, Exception):
+                results[request.key] = _error(outcome)
+            else:
+                status, body = outcome
+                results[request.key] = (
+                    {"status": status, "body": body} if status < 400
+                    else {"status": status, "error": (body or {}).get("detail") if isinstance(body, dict) else body}
+                )
+        return results
@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+"""
+/batch throughput vs the same lookups as individual GETs.
+
+Each batch mixes /player/{name}/insights and /player/{name}/bowling-stats for
+real batters. Both sides run in-process through TestClient, so the saving
+shown is server-side overhead only; every individual call would also pay a
+network round trip in production.
+
+Usage: python benchmarks/bench_batch.py
+"""
+import sys
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from fastapi.testclient import TestClient
+
+from main import app, store
+
+SIZES = [10, 50, 200]
+REPEAT = 10
+
+
+def timed(fn):
+    start = time.perf_counter()
+    for _ in range(REPEAT):
+        fn()
+    return (time.perf_counter() - start) / REPEAT
+
+
+def main():
+    with TestClient(app) as client:
+        players = store.current.scatter_frame.index.tolist()
+        print(f"{'items':>5} {'individual':>22} {'batch':>22} {'speedup':>8}")
+        for size in SIZES:
+            paths = [
+                f"/player/{players[i // 2 % len(players)]}/{'insights' if i % 2 else 'bowling-stats'}"
+                for i in range(size)
+            ]
+            individual = timed(lambda: [client.get(path) for path in paths])
+            batched = timed(lambda: client.post("/batch", json={"requests": paths}))
+            print(f"{size:>5} {individual * 1000:8.2f}ms {size / individual:7.0f} items/s "
+                  f"{batched * 1000:8.2f}ms {size / batched:7.0f} items/s {individual / batched:7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
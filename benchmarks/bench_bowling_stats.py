@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Benchmark the bowling-stats lookups: boolean-mask scan + iterrows vs the startup hash index.
+
+Per-request cost of the index should stay flat as the batter-vs-bowler table grows.
+
+Usage: python benchmarks/bench_bowling_stats.py
+"""
+import sys
+import time
+from pathlib import Path
+
+import pandas as pd
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from datasets import build_strike_rate_index
+from schema import BATTER_VS_BOWLER_SCHEMA, normalize
+
+DATA_DIR = Path(__file__).resolve().parent.parent / "data"
+ROW_COUNTS = [1_259, 10_000, 100_000, 1_000_000]
+PLAYER = 'Virat Kohli'
+
+
+def legacy_lookup(batter_vs_bowler_data, player_name):
+    """The per-request scan that used to live in get_player_bowling_stats"""
+    player_stats = batter_vs_bowler_data[batter_vs_bowler_data['Batter_Name'] == player_name]
+    bowling_stats = {}
+    for _, row in player_stats.iterrows():
+        bowling_stats[row['bowler.type']] = row['StrikeRate']
+    return bowling_stats
+
+
+def synthetic_table(base, rows):
+    """Tile the real table up to `rows` rows, renaming batters in each copy"""
+    copies = -(-rows // len(base))
+    frames = []
+    for i in range(copies):
+        frame = base.copy()
+        if i:
+            frame['Batter_Name'] = frame['Batter_Name'] + f" #{i}"
+        frames.append(frame)
+    return normalize(pd.concat(frames, ignore_index=True).head(rows), BATTER_VS_BOWLER_SCHEMA)
+
+
+def per_call(fn, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat
+
+
+def main():
+    base = pd.read_csv(DATA_DIR / BATTER_VS_BOWLER_SCHEMA.filename)
+    print(f"{'rows':>9} {'scan µs':>12} {'index µs':>10} {'build ms':>10}")
+    for rows in ROW_COUNTS:
+        table = synthetic_table(base, rows)
+
+        start = time.perf_counter()
+        index = build_strike_rate_index(table, 'Batter_Name', 'bowler.type', 'StrikeRate')
+        build = time.perf_counter() - start
+
+        assert index[PLAYER] == legacy_lookup(table, PLAYER)
+        scan = per_call(lambda: legacy_lookup(table, PLAYER), 20 if rows < 100_000 else 3)
+        lookup = per_call(lambda: index.get(PLAYER), 100_000)
+        print(f"{rows:>9} {scan * 1e6:>12.1f} {lookup * 1e6:>10.3f} {build * 1e3:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
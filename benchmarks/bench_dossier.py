@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+Opposition page assembly: the old call fan-out vs one /team/{team}/dossier call.
+
+The fan-out is /teams/{team}/players, then /player/{name}/insights and
+/player/{name}/bowling-stats per player, plus the team's insights and
+bowling-stats. Both run in-process through TestClient, so the numbers leave
+out network latency. In production every extra round trip adds a client RTT.
+
+Usage: python benchmarks/bench_dossier.py
+"""
+import sys
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from fastapi.testclient import TestClient
+
+from main import TEAM_PLAYERS, app, responses
+
+REPEAT = 20
+VENUE = "MA Chidambaram Stadium, Chepauk, Chennai"
+
+
+def fan_out(client, team):
+    calls = 1
+    players = client.get(f"/teams/{team}/players").json()["players"]
+    for player in players:
+        client.get(f"/player/{player}/insights")
+        client.get(f"/player/{player}/bowling-stats")
+        calls += 2
+    client.get(f"/team/{team}/insights")
+    client.get(f"/team/{team}/bowling-stats")
+    client.get(f"/venue/{VENUE}/insights")
+    return calls + 3
+
+
+def timed(fn, repeat=REPEAT):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = fn()
+    return (time.perf_counter() - start) / repeat, result
+
+
+def main():
+    with TestClient(app) as client:
+        print(f"{'team':<28} {'fan-out':>18} {'dossier (cold)':>15} {'dossier (cached)':>17}")
+        for team in TEAM_PLAYERS:
+            fan, calls = timed(lambda: fan_out(client, team))
+
+            def cold():
+                responses._by_dataset.clear()
+                return client.get(f"/team/{team}/dossier", params={"venue": VENUE})
+            single, _ = timed(cold)
+            cached, _ = timed(lambda: client.get(f"/team/{team}/dossier", params={"venue": VENUE}))
+            print(f"{team:<28} {fan * 1000:8.2f}ms ({calls:2d} calls) {single * 1000:13.2f}ms {cached * 1000:15.2f}ms")
+
+
+if __name__ == "__main__":
+    main()
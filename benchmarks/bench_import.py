@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Cold-start cost of the curated insight corpus.
+
+Compares importing insights.py (what main.py used to do at import time)
+against loading the marshal artifact, each in a fresh interpreter with an
+empty app bytecode cache, then measures time-to-first-byte of a real server for
+/health and the first /player/{name}/insights request with the corpus
+imported eagerly vs loaded lazily.
+
+Usage: python benchmarks/bench_import.py
+"""
+import os
+import shutil
+import socket
+import subprocess
+import sys
+import time
+import urllib.request
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.append(str(ROOT))
+
+from insight_corpus import build_corpus
+
+REPEAT = 5
+
+EAGER = "import insights"
+LAZY = "from insight_corpus import load_corpus; load_corpus()"
+
+
+def cold_env():
+    # Drop the app's bytecode (not the stdlib's) so every run compiles the
+    # app modules from source, like a freshly built container
+    shutil.rmtree(ROOT / "__pycache__", ignore_errors=True)
+    return {**os.environ, "PYTHONDONTWRITEBYTECODE": "1"}
+
+
+# Stdlib modules the server has already imported by the time insights load
+PRELOADED = "import argparse, hashlib, importlib, marshal, pathlib, threading"
+
+
+def import_seconds(statement, cold):
+    script = f"{PRELOADED}; import time; t = time.perf_counter(); {statement}; print(time.perf_counter() - t)"
+    if cold:
+        env = cold_env()
+    else:
+        env = {key: value for key, value in os.environ.items() if key != "PYTHONDONTWRITEBYTECODE"}
+        subprocess.run([sys.executable, "-c", script], cwd=ROOT, env=env, check=True, capture_output=True)
+    out = subprocess.run([sys.executable, "-c", script], cwd=ROOT, env=env,
+                         capture_output=True, text=True, check=True).stdout
+    return float(out.strip().splitlines()[-1])
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def first_byte(port, path, deadline):
+    while time.perf_counter() < deadline:
+        try:
+            with urllib.request.urlopen(f"http://127.0.0.1:{port}{path}", timeout=1) as response:
+                response.read(1)
+                return time.perf_counter()
+        except OSError:
+            time.sleep(0.005)
+    raise TimeoutError(path)
+
+
+def server_ttfb(prelude):
+    port = free_port()
+    script = f"{prelude}\nimport uvicorn, main\nuvicorn.run(main.app, host='127.0.0.1', port={port}, log_level='warning')"
+    start = time.perf_counter()
+    proc = subprocess.Popen([sys.executable, "-c", script], cwd=ROOT, env=cold_env(),
+                            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        health = first_byte(port, "/health", start + 60) - start
+        insights = first_byte(port, "/player/Trent%20Boult/insights", start + 60) - start
+    finally:
+        proc.terminate()
+        proc.wait()
+    return health, insights
+
+
+def median(values):
+    return sorted(values)[len(values) // 2]
+
+
+def main():
+    build_corpus()
+    print("Insight corpus load (median of %d fresh interpreters)" % REPEAT)
+    for label, statement in [("import insights.py", EAGER), ("marshal artifact", LAZY)]:
+        cold = median([import_seconds(statement, cold=True) for _ in range(REPEAT)])
+        warm = median([import_seconds(statement, cold=False) for _ in range(REPEAT)])
+        print(f"  {label:<20} cold pyc {cold * 1000:6.2f}ms   warm pyc {warm * 1000:6.2f}ms")
+
+    print("Server time-to-first-byte, cold pyc (median of %d)" % REPEAT)
+    for label, prelude in [("eager import", EAGER), ("lazy corpus", "")]:
+        runs = [server_ttfb(prelude) for _ in range(REPEAT)]
+        health = median([r[0] for r in runs])
+        insights = median([r[1] for r in runs])
+        print(f"  {label:<14} /health {health * 1000:7.1f}ms   first insights {insights * 1000:7.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Time a full recompute of the batting tables from synthetic ball-by-ball data.
+
+Generates DELIVERIES deliveries (about 55 four-season IPL cycles' worth) with
+realistic shapes: 10 teams, 30 batters each, 20 overs per innings, ~3% wides
+and ~5% wickets, then runs ingest.compute_tables() over them.
+
+Usage: python benchmarks/bench_ingest.py [deliveries]
+"""
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from ingest import BOWLER_TYPES, compute_tables
+
+DELIVERIES = 1_000_000
+TEAMS = 10
+SQUAD = 30
+BALLS_PER_INNINGS = 124  # 120 legal balls plus a few wides
+
+
+def synthetic_deliveries(n, seed=7):
+    rng = np.random.default_rng(seed)
+    innings_count = -(-n // BALLS_PER_INNINGS)
+    innings_id = np.repeat(np.arange(innings_count), BALLS_PER_INNINGS)[:n]
+    match_id = innings_id // 2
+    innings = innings_id % 2 + 1
+    position = np.arange(n) % BALLS_PER_INNINGS
+
+    team = (match_id + innings - 1) % TEAMS
+    # Batting order advances roughly every 12 balls
+    slot = np.minimum(position // 12, 10)
+    batter = team * SQUAD + (slot + match_id) % SQUAD
+
+    runs = rng.choice([0, 1, 2, 3, 4, 6], size=n, p=[0.36, 0.36, 0.07, 0.01, 0.13, 0.07])
+    wides = (rng.random(n) < 0.03).astype(int)
+    runs[wides == 1] = 0
+    out = rng.random(n) < 0.05
+
+    team_names = np.array([f"Team {i}" for i in range(TEAMS)])
+    batter_names = np.array([f"Batter {i}" for i in range(TEAMS * SQUAD)])
+    return pd.DataFrame({
+        'match_id': match_id,
+        'innings': innings,
+        'over': np.minimum(position // 6, 19),
+        'batting_team': team_names[team],
+        'batter': batter_names[batter],
+        'bowler_type': np.array(BOWLER_TYPES)[rng.integers(0, len(BOWLER_TYPES), n)],
+        'runs_batter': runs,
+        'extras': wides,
+        'wides': wides,
+        'player_dismissed': np.where(out, batter_names[batter], ''),
+    })
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else DELIVERIES
+    deliveries = synthetic_deliveries(n)
+
+    start = time.perf_counter()
+    tables = compute_tables(deliveries)
+    elapsed = time.perf_counter() - start
+
+    print(f"{n:,} deliveries recomputed in {elapsed:.2f} s ({n / elapsed / 1e6:.1f}M deliveries/s)")
+    for filename, table in tables.items():
+        print(f"  {filename}: {len(table)} rows x {len(table.columns)} columns")
+
+
+if __name__ == "__main__":
+    main()
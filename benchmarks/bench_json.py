@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+Response rendering cost: FastAPI's default path (jsonable_encoder + JSONResponse)
+vs NumpyJSONResponse, on the scatter and bowling-stats payloads.
+
+Usage: python benchmarks/bench_json.py
+"""
+import sys
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+from data_store import load_dataset
+from datasets import scatter_points
+from fast_json import NumpyJSONResponse, orjson
+
+DATA_DIR = Path(__file__).resolve().parent.parent / "data"
+REPEAT = 2_000
+
+
+def per_call(fn):
+    start = time.perf_counter()
+    for _ in range(REPEAT):
+        fn()
+    return (time.perf_counter() - start) / REPEAT
+
+
+def main():
+    data = load_dataset(DATA_DIR, use_snapshot=False)
+    everyone = data.scatter_frame.index.tolist()
+    matrix = data.bowler_type_matrix
+    payloads = {
+        "scatter (15 players)": {"scatter_data": scatter_points(data.scatter_frame, everyone[:15], [])},
+        "scatter (all players)": {"scatter_data": scatter_points(data.scatter_frame, everyone, everyone[:3])},
+        "bowling-stats": {"player": "KL Rahul", "bowling_stats": matrix.strike_rates("KL Rahul")},
+        # What a columnar endpoint could hand over without building rows at all
+        "strike-rate matrix (ndarray)": {"players": matrix.players, "strike_rate": matrix.strike_rate},
+    }
+
+    print(f"Serializer: {'orjson' if orjson else 'stdlib fallback'}")
+    for label, payload in payloads.items():
+        try:
+            default = per_call(lambda: JSONResponse(jsonable_encoder(payload)))
+            default_text = f"{default * 1e6:8.1f}us"
+        except (TypeError, ValueError) as e:
+            # jsonable_encoder can't take ndarrays, and JSONResponse rejects NaN
+            default_text = f"{'fails':>10} ({type(e).__name__})"
+        fast = per_call(lambda: NumpyJSONResponse(payload))
+        print(f"  {label:<30} default {default_text}   NumpyJSONResponse {fast * 1e6:7.1f}us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+/matchup/plan solve time over random opposition XIs and bowling attacks.
+
+Each trial draws 11 batters from the bowler-type matrix (plus the odd unknown
+name), 5-7 bowlers of random types and, for some, phase restrictions, then
+times plan_overs end to end. Exits non-zero if p99 breaks the 50ms budget.
+
+Usage: python benchmarks/bench_matchup.py [trials]
+"""
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+import numpy as np
+
+from data_store import load_dataset
+from matchup import PHASE_OVERS, Bowler, plan_overs
+
+DATA_DIR = Path(__file__).resolve().parent.parent / "data"
+BUDGET_MS = 50.0
+
+
+def random_attack(rng, types):
+    bowlers = []
+    for i in range(rng.randint(5, 7)):
+        phases = None
+        if rng.random() < 0.3:
+            phases = tuple(rng.sample(list(PHASE_OVERS), rng.randint(1, 2)))
+        bowlers.append(Bowler(f"Bowler {i}", rng.choice(types), phases=phases))
+    return bowlers
+
+
+def main():
+    trials = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    matrix = load_dataset(DATA_DIR, use_snapshot=False).bowler_type_matrix
+    rng = random.Random(7)
+    timings, infeasible = [], 0
+    for _ in range(trials):
+        batters = rng.sample(matrix.players, 11)
+        if rng.random() < 0.2:
+            batters[-1] = "Debutant"
+        bowlers = random_attack(rng, matrix.bowler_types)
+        start = time.perf_counter()
+        try:
+            plan_overs(matrix, batters, bowlers)
+        except ValueError:
+            infeasible += 1  # e.g. too many bowlers confined to one phase
+        timings.append((time.perf_counter() - start) * 1000)
+
+    p50, p99 = np.percentile(timings, [50, 99])
+    print(f"{trials} random squads ({infeasible} infeasible attacks rejected)")
+    print(f"  p50 {p50:6.2f}ms  p99 {p99:6.2f}ms  max {max(timings):6.2f}ms  (budget {BUDGET_MS:.0f}ms)")
+    if p99 > BUDGET_MS:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Per-request cost of MetricsMiddleware.
+
+Drives ASGI apps directly (no server, no client) so the only difference
+between the runs is the middleware: a bare endpoint that answers
+immediately, and the real app's /health and /player/{name}/bowling-stats
+routes with and without the middleware in the stack. Exits non-zero if the
+overhead exceeds the 20us budget.
+
+Usage: python benchmarks/bench_metrics.py
+"""
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from metrics import Metrics, MetricsMiddleware
+
+REPEAT = 10_000
+BUDGET_US = 20.0
+
+
+class Route:
+    path = "/bench/{item}"
+
+
+async def bare_app(scope, receive, send):
+    scope["route"] = Route
+    await send({"type": "http.response.start", "status": 200, "headers": [(b"content-type", b"application/json")]})
+    await send({"type": "http.response.body", "body": b'{"ok":true}'})
+
+
+def scope_for(path):
+    return {"type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET",
+            "scheme": "http", "path": path, "raw_path": path.encode(), "root_path": "", "query_string": b"",
+            "headers": [(b"host", b"bench")], "client": ("127.0.0.1", 1), "server": ("bench", 80)}
+
+
+async def per_request(app, path):
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        pass
+
+    for _ in range(REPEAT // 10):  # warm up
+        await app(scope_for(path), receive, send)
+    start = time.perf_counter()
+    for _ in range(REPEAT):
+        await app(scope_for(path), receive, send)
+    return (time.perf_counter() - start) / REPEAT * 1e6
+
+
+async def run():
+    import main
+    main.store.reload()
+    stack = main.app.build_middleware_stack()
+    # main's stack is ServerErrorMiddleware -> MetricsMiddleware -> CORS -> ...; time both sides of it
+    instrumented = stack.app
+    assert isinstance(instrumented, MetricsMiddleware)
+    uninstrumented = instrumented.app
+
+    cases = [
+        ("bare ASGI endpoint", MetricsMiddleware(bare_app, Metrics()), bare_app, "/bench/1"),
+        ("/health", instrumented, uninstrumented, "/health"),
+        ("/player/{name}/bowling-stats", instrumented, uninstrumented, "/player/Virat Kohli/bowling-stats"),
+    ]
+    worst = 0.0
+    for label, with_metrics, without, path in cases:
+        # Alternate the two so drift on a busy machine hits both alike
+        on, off = float("inf"), float("inf")
+        for _ in range(3):
+            off = min(off, await per_request(without, path))
+            on = min(on, await per_request(with_metrics, path))
+        worst = max(worst, on - off)
+        print(f"  {label:<30} without {off:7.2f}us  with {on:7.2f}us  overhead {on - off:5.2f}us")
+    print(f"Worst overhead {worst:.2f}us (budget {BUDGET_US:.0f}us)")
+    if worst > BUDGET_US:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    asyncio.run(run())
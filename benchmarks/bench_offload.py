@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+/health latency while heavy endpoints are saturated, with and without offload.
+
+Starts a real uvicorn server per configuration, keeps CONCURRENCY clients
+hammering /matchup/plan and /scatter-plot-data (half each), and meanwhile probes /health
+every few ms. With everything inline, /health waits behind whatever solve is
+on the loop; with the pools it should stay flat.
+
+Usage: python benchmarks/bench_offload.py [seconds per config]
+"""
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+from urllib.parse import quote
+from urllib.request import urlopen
+
+import numpy as np
+
+ROOT = Path(__file__).resolve().parent.parent
+PORT = 8765
+CONCURRENCY = 16
+CONFIGS = {
+    "idle baseline (no heavy load)": {"CONCURRENCY": "0"},
+    "inline (OFFLOAD_THREADS=0)": {"OFFLOAD_THREADS": "0"},
+    "thread pool (4 threads)": {"OFFLOAD_THREADS": "4"},
+    "thread + process pool (2 processes)": {"OFFLOAD_THREADS": "4", "OFFLOAD_PROCESSES": "2"},
+}
+
+BOWLERS = [
+    {"name": "A", "type": "Right arm pace"},
+    {"name": "B", "type": "Left arm pace"},
+    {"name": "C", "type": "Off spin"},
+    {"name": "D", "type": "Leg spin"},
+    {"name": "E", "type": "Right arm pace"},
+    {"name": "F", "type": "Slow left arm orthodox"},
+]
+
+
+class Connection:
+    """Keep-alive HTTP/1.1 over raw asyncio streams; far cheaper per request than
+    a full client, so the load generator doesn't eat the CPU it's measuring"""
+
+    @classmethod
+    async def open(cls):
+        self = cls()
+        self.reader, self.writer = await asyncio.open_connection("127.0.0.1", PORT)
+        return self
+
+    async def request(self, raw: bytes) -> int:
+        self.writer.write(raw)
+        status = int((await self.reader.readline()).split()[1])
+        length = 0
+        while (line := await self.reader.readline()) != b"\r\n":
+            if line.lower().startswith(b"content-length:"):
+                length = int(line.split(b":")[1])
+        await self.reader.readexactly(length)
+        return status
+
+    def close(self):
+        self.writer.close()
+
+
+def get(path: str) -> bytes:
+    return f"GET {quote(path, safe='/?=&,')} HTTP/1.1\r\nHost: bench\r\n\r\n".encode()
+
+
+def post(path: str, body) -> bytes:
+    data = json.dumps(body).encode()
+    return (f"POST {path} HTTP/1.1\r\nHost: bench\r\nContent-Type: application/json\r\n"
+            f"Content-Length: {len(data)}\r\n\r\n").encode() + data
+
+
+def wait_ready():
+    for _ in range(300):
+        try:
+            with urlopen(f"http://127.0.0.1:{PORT}/health", timeout=1):
+                return
+        except OSError:
+            time.sleep(0.1)
+    raise RuntimeError("server did not start")
+
+
+def fetch(path: str):
+    with urlopen(f"http://127.0.0.1:{PORT}{quote(path, safe='/?=&')}") as response:
+        return json.load(response)
+
+
+async def heavy_worker(requests, stop, done):
+    connection = await Connection.open()
+    i = 0
+    while not stop.is_set():
+        await connection.request(requests[i % len(requests)])
+        done.append(1)
+        i += 1
+    connection.close()
+
+
+async def measure(seconds, heavy_requests, concurrency):
+    stop, done = asyncio.Event(), []
+    workers = [asyncio.create_task(heavy_worker(heavy_requests, stop, done)) for _ in range(concurrency)]
+    await asyncio.sleep(2 if concurrency else 0.1)  # let the pools fill up
+    done.clear()
+    probe = await Connection.open()
+    health = get("/health")
+    latencies = []
+    start = time.perf_counter()
+    while time.perf_counter() - start < seconds:
+        t = time.perf_counter()
+        await probe.request(health)
+        latencies.append((time.perf_counter() - t) * 1000)
+        await asyncio.sleep(0.005)
+    elapsed = time.perf_counter() - start
+    stop.set()
+    await asyncio.gather(*workers)
+    probe.close()
+    return np.percentile(latencies, [50, 99]), len(done) / elapsed
+
+
+def main():
+    seconds = float(sys.argv[1]) if len(sys.argv) > 1 else 5.0
+    print(f"{CONCURRENCY} concurrent heavy clients, {os.cpu_count()} CPU(s)")
+    for label, env in CONFIGS.items():
+        server = subprocess.Popen(
+            [sys.executable, "-m", "uvicorn", "main:app", "--port", str(PORT), "--log-level", "warning"],
+            cwd=ROOT, env={**os.environ, **env}, stdout=subprocess.DEVNULL,
+        )
+        try:
+            wait_ready()
+            batters = fetch("/teams/Chennai Super Kings/players")["players"][:11]
+            players = [r["name"] for r in fetch("/players/search?q=a&limit=200")["results"]]
+            plan = post("/matchup/plan", {"batters": batters, "bowlers": BOWLERS})
+            heavy_requests = [
+                request for i in range(0, 50, 10)
+                for request in (plan, get("/scatter-plot-data?selected_players=" + ",".join(players[i:i + 60])))
+            ]
+            concurrency = int(env.get("CONCURRENCY", CONCURRENCY))
+            (p50, p99), throughput = asyncio.run(measure(seconds, heavy_requests, concurrency))
+        finally:
+            server.terminate()
+            server.wait()
+        print(f"  {label:<38} /health p50 {p50:6.2f}ms  p99 {p99:7.2f}ms   heavy {throughput:6.0f} req/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+/players/search latency against a 12k-name index.
+
+Builds the index from the real batting names plus synthetic first/last name
+combinations, runs a mix of prefix, surname, full-name and misspelt queries,
+and fails (exit 1) if the p99 per-query time exceeds the 1ms budget.
+
+Usage: python benchmarks/bench_player_search.py
+"""
+import random
+import sys
+import time
+from pathlib import Path
+
+import pandas as pd
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from player_search import build_player_search_index
+
+DATA_DIR = Path(__file__).resolve().parent.parent / "data"
+TARGET_NAMES = 12_000
+BUDGET_SECONDS = 0.001
+ROUNDS = 20
+
+
+def synthetic_names(real, count, rng):
+    firsts = sorted({name.split()[0] for name in real})
+    lasts = sorted({name.split()[-1] for name in real if len(name.split()) > 1})
+    names = set(real)
+    while len(names) < count:
+        names.add(f"{rng.choice(firsts)} {rng.choice(lasts)}")
+    return list(names)
+
+
+def misspell(name, rng):
+    token = max(name.split(), key=len)
+    i = rng.randrange(len(token) - 1)
+    return token[:i] + token[i + 1] + token[i] + token[i + 2:]
+
+
+def percentile(values, q):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * q))]
+
+
+def main():
+    rng = random.Random(7)
+    real = pd.read_csv(DATA_DIR / "IPL_21_24_Batting.csv")['Batter_Name'].dropna().tolist()
+    names = synthetic_names(real, TARGET_NAMES, rng)
+
+    start = time.perf_counter()
+    index = build_player_search_index(names)
+    print(f"Indexed {len(index.names)} names ({len(index.keys)} keys) in {(time.perf_counter() - start) * 1000:.0f}ms")
+
+    sample = rng.sample(real, 100)
+    queries = {
+        "1-2 char prefix": [name[:rng.randint(1, 2)] for name in sample],
+        "name prefix": [name[:rng.randint(3, 8)] for name in sample],
+        "surname": [name.split()[-1] for name in sample],
+        "full name": sample,
+        "misspelt": [misspell(name, rng) for name in sample],
+    }
+
+    worst = 0.0
+    for label, batch in queries.items():
+        timings = []
+        for _ in range(ROUNDS):
+            for query in batch:
+                t = time.perf_counter()
+                index.search(query, 10)
+                timings.append(time.perf_counter() - t)
+        p50, p99 = percentile(timings, 0.5), percentile(timings, 0.99)
+        worst = max(worst, p99)
+        print(f"  {label:<16} p50 {p50 * 1e6:7.1f}us   p99 {p99 * 1e6:7.1f}us")
+
+    verdict = "within" if worst <= BUDGET_SECONDS else "OVER"
+    print(f"Worst p99 {worst * 1e6:.1f}us is {verdict} the {BUDGET_SECONDS * 1e6:.0f}us budget")
+    return 0 if worst <= BUDGET_SECONDS else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Request latency while the dataset is being hot-reloaded.
+
+Fires a steady stream of /player/{name}/bowling-stats and /scatter-plot-data
+requests through the ASGI app, first with no reload running, then while a
+background thread force-reloads every 250 ms, and finally with reloads back
+to back (a worst case: the loader competes for the GIL the whole time).
+
+Usage: python benchmarks/bench_reload.py
+"""
+import asyncio
+import statistics
+import sys
+import threading
+import time
+from pathlib import Path
+
+import httpx
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from main import app, store
+
+REQUESTS = 2000
+PATHS = ["/player/Virat Kohli/bowling-stats", "/scatter-plot-data?selected_players=Rinku Singh"]
+
+
+async def run_load(client):
+    latencies = []
+    for i in range(REQUESTS):
+        start = time.perf_counter()
+        response = await client.get(PATHS[i % len(PATHS)])
+        latencies.append(time.perf_counter() - start)
+        assert response.status_code == 200
+    return latencies
+
+
+def summarize(label, latencies, reloads):
+    latencies = sorted(latencies)
+    p50 = statistics.median(latencies) * 1e3
+    p99 = latencies[int(len(latencies) * 0.99)] * 1e3
+    print(f"{label:<16} p50 {p50:6.3f} ms   p99 {p99:6.3f} ms   reloads {reloads}")
+
+
+async def main():
+    store.reload(force=True)
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        await run_load(client)  # warm up
+        summarize("baseline", await run_load(client), 0)
+
+        for label, interval in [("reload / 250ms", 0.25), ("back-to-back", 0)]:
+            stop = threading.Event()
+            reloads = []
+
+            def reload_loop():
+                while not stop.is_set():
+                    reloads.append(store.reload(force=True).generation)
+                    stop.wait(interval)
+
+            worker = threading.Thread(target=reload_loop)
+            worker.start()
+            try:
+                latencies = await run_load(client)
+            finally:
+                stop.set()
+                worker.join()
+            summarize(label, latencies, len(reloads))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""
+Per-request server cost of the static endpoints: building the payload and
+running it through FastAPI's encoder (the old path) vs the pre-serialized
+ResponseCache body, and vs a 304 for a client sending If-None-Match.
+
+Usage: python benchmarks/bench_response_cache.py
+"""
+import sys
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from starlette.requests import Request
+
+import main
+
+REPEAT = 20_000
+
+
+def request(etag=None):
+    headers = [(b"if-none-match", etag.encode())] if etag else []
+    return Request({"type": "http", "method": "GET", "path": "/", "headers": headers})
+
+
+def per_call(fn):
+    start = time.perf_counter()
+    for _ in range(REPEAT):
+        fn()
+    return (time.perf_counter() - start) / REPEAT
+
+
+def run():
+    main.store.reload(force=True)
+    data = main.store.current
+    builders = main.static_payloads(data)
+    print(f"{len(builders)} cacheable responses primed per dataset")
+
+    for key in ["/teams", "/team-scatter-plot-data", "/team/Chennai Super Kings/insights"]:
+        build = builders[key]
+        etag = main.responses.get(data, key, build).etag
+        encoder = per_call(lambda: JSONResponse(jsonable_encoder(build())))
+        cached = per_call(lambda: main.responses.respond(request(), data, key, build))
+        not_modified = per_call(lambda: main.responses.respond(request(etag), data, key, build))
+        print(f"  {key:<36} encoder {encoder * 1e6:6.1f}us   cached {cached * 1e6:5.1f}us   304 {not_modified * 1e6:5.1f}us")
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Benchmark /scatter-plot-data: legacy iterrows scan vs the precomputed scatter frame.
+
+Usage: python benchmarks/bench_scatter.py
+"""
+import sys
+import time
+from pathlib import Path
+
+import pandas as pd
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from datasets import build_scatter_frame, scatter_points
+from schema import BATTING_SCHEMA, normalize
+
+DATA_DIR = Path(__file__).resolve().parent.parent / "data"
+ROW_COUNTS = [300, 10_000, 100_000]
+
+KEY_PLAYERS = [
+    'Shubman Gill', 'Faf du Plessis', 'Ruturaj Gaikwad', 'Virat Kohli',
+    'KL Rahul', 'Jos Buttler', 'Sanju Samson', 'Shikhar Dhawan',
+    'Suryakumar Yadav', 'Yashasvi Jaiswal', 'Ishan Kishan', 'Rohit Sharma',
+    'Shivam Dube', 'Venkatesh Iyer', 'David Warner'
+]
+SELECTED = ['Rinku Singh', 'Tilak Varma', 'Heinrich Klaasen']
+
+
+def legacy_scatter(batting_data, selected_player_list):
+    """The per-request iterrows implementation that used to live in main.py"""
+    all_players_to_show = list(set(KEY_PLAYERS + selected_player_list))
+    scatter_data = []
+    for _, row in batting_data.iterrows():
+        if row['Batter_Name'] in all_players_to_show:
+            first_sr = row['strike_rate_1st_innings']
+            second_sr = row['strike_rate_2nd_innings']
+            if isinstance(first_sr, str) and first_sr.endswith('%'):
+                first_sr = float(first_sr.replace('%', ''))
+            if isinstance(second_sr, str) and second_sr.endswith('%'):
+                second_sr = float(second_sr.replace('%', ''))
+            scatter_data.append({
+                'name': row['Batter_Name'],
+                'first_innings_avg': float(row['batting_average_1st_innings']) if row['batting_average_1st_innings'] else 0,
+                'second_innings_avg': float(row['batting_average_2nd_innings']) if row['batting_average_2nd_innings'] else 0,
+                'first_innings_sr': float(first_sr) if first_sr else 0,
+                'second_innings_sr': float(second_sr) if second_sr else 0,
+                'isSelected': row['Batter_Name'] in selected_player_list
+            })
+    return scatter_data
+
+
+def synthetic_batting(base, rows):
+    """Tile the real batting table up to `rows` rows with unique batter names"""
+    base = base.dropna(subset=['Batter_Name'])
+    copies = -(-rows // len(base))
+    frames = []
+    for i in range(copies):
+        frame = base.copy()
+        if i:
+            frame['Batter_Name'] = frame['Batter_Name'] + f" #{i}"
+        frames.append(frame)
+    return pd.concat(frames, ignore_index=True).head(rows)
+
+
+def time_call(fn, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat
+
+
+def main():
+    base = pd.read_csv(DATA_DIR / "IPL_21_24_Batting.csv")
+    print(f"{'rows':>8} {'legacy ms':>12} {'indexed ms':>12} {'speedup':>9}")
+    for rows in ROW_COUNTS:
+        batting = synthetic_batting(base, rows)
+        frame = build_scatter_frame(normalize(batting, BATTING_SCHEMA))
+        players = set(KEY_PLAYERS + SELECTED)
+
+        legacy = time_call(lambda: legacy_scatter(batting, SELECTED), 1 if rows > 1000 else 5)
+        indexed = time_call(lambda: scatter_points(frame, players, SELECTED), 200)
+        print(f"{rows:>8} {legacy * 1e3:>12.3f} {indexed * 1e3:>12.3f} {legacy / indexed:>8.0f}x")
+
+
+if __name__ == "__main__":
+    main()
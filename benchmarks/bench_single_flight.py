@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+A 50-way burst of identical requests, with and without single-flight coalescing.
+
+Models the match-day dashboard opening on many laptops at once: BURST
+concurrent copies of the same /scatter-plot-data, /team/{team}/dossier
+(response cache cleared first) and /matchup/plan request, sent in-process
+through the ASGI app. Reports wall time per burst and how many computations
+actually ran.
+
+Usage: python benchmarks/bench_single_flight.py
+"""
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+import httpx
+
+import main
+from single_flight import SingleFlight
+
+BURST = 50
+ROUNDS = 5
+
+
+class NoCoalescing(SingleFlight):
+    async def do(self, key, compute):
+        self.calls += 1
+        self.computed += 1
+        return await compute()
+
+
+async def burst(client, method, url, **kwargs):
+    start = time.perf_counter()
+    responses = await asyncio.gather(*(client.request(method, url, **kwargs) for _ in range(BURST)))
+    assert all(response.status_code == 200 for response in responses), responses[0].text
+    return time.perf_counter() - start
+
+
+async def run():
+    main.store.reload()
+    main.offload.start()
+    players = main.store.current.scatter_frame.index.tolist()
+    batters = main.TEAM_PLAYERS["Chennai Super Kings"][:11]
+    bowlers = [{"name": name, "type": kind} for name, kind in [
+        ("A", "Right arm pace"), ("B", "Left arm pace"), ("C", "Off spin"),
+        ("D", "Leg spin"), ("E", "Right arm pace"), ("F", "Slow left arm orthodox")]]
+    cases = {
+        "/scatter-plot-data": ("GET", "/scatter-plot-data", {"params": {"selected_players": ",".join(players[:80])}}),
+        "/team/{team}/dossier": ("GET", "/team/Mumbai Indians/dossier", {"params": {"venue": "Wankhede"}}),
+        "/matchup/plan": ("POST", "/matchup/plan", {"json": {"batters": batters, "bowlers": bowlers}}),
+    }
+    transport = httpx.ASGITransport(app=main.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        print(f"{BURST}-way bursts, {ROUNDS} rounds each")
+        for label, (method, url, kwargs) in cases.items():
+            row = []
+            for flight in (NoCoalescing(), SingleFlight()):
+                main.flight = flight
+                elapsed = 0.0
+                for _ in range(ROUNDS):
+                    main.responses._by_dataset.clear()
+                    elapsed += await burst(client, method, url, **kwargs)
+                row.append((elapsed / ROUNDS, flight.computed / ROUNDS))
+            (off, off_runs), (on, on_runs) = row
+            print(f"  {label:<22} uncoalesced {off * 1000:7.1f}ms ({off_runs:4.1f} computations)   "
+                  f"single-flight {on * 1000:7.1f}ms ({on_runs:4.1f} computations)   {off / on:5.1f}x")
+    main.offload.shutdown()
+
+
+if __name__ == "__main__":
+    asyncio.run(run())
@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Startup data-load time: parsing the CSVs vs memory-mapping the binary snapshot.
+
+Runs on the real data/ directory and on a synthetic copy with every table
+tiled 50x. The snapshot figure includes the content-hash staleness check.
+
+Usage: python benchmarks/bench_startup.py
+"""
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import pandas as pd
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from schema import SCHEMAS, load_table
+from snapshot import build_snapshot, load_snapshot
+
+DATA_DIR = Path(__file__).resolve().parent.parent / "data"
+BLOWUP = 50
+
+
+def blow_up(data_dir, out_dir, factor):
+    """Write every CSV tiled `factor` times, suffixing key names so they stay unique"""
+    for schema in SCHEMAS:
+        raw = pd.read_csv(data_dir / schema.filename)
+        copies = []
+        for i in range(factor):
+            frame = raw.copy()
+            if i:
+                frame[schema.key] = frame[schema.key] + f" #{i}"
+            copies.append(frame)
+        pd.concat(copies, ignore_index=True).to_csv(out_dir / schema.filename, index=False)
+
+
+def best_of(fn, repeat=5):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def measure(label, data_dir):
+    snapshot_dir = build_snapshot(data_dir, Path(tempfile.mkdtemp()) / "snapshot")
+    csv = best_of(lambda: [load_table(data_dir, schema) for schema in SCHEMAS])
+    snap = best_of(lambda: load_snapshot(data_dir, snapshot_dir))
+    print(f"{label:<14} {csv * 1e3:>10.1f} {snap * 1e3:>13.1f} {csv / snap:>8.1f}x")
+
+
+def main():
+    print(f"{'dataset':<14} {'CSV ms':>10} {'snapshot ms':>13} {'speedup':>9}")
+    measure("current", DATA_DIR)
+    with tempfile.TemporaryDirectory() as tmp:
+        blow_up(DATA_DIR, Path(tmp), BLOWUP)
+        measure(f"{BLOWUP}x synthetic", Path(tmp))
+
+
+if __name__ == "__main__":
+    main()
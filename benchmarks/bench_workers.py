@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+serve.py scaling: memory per worker and throughput from 1 worker to the core count.
+
+For each worker count it starts serve.py and drives a mix of read endpoints
+(insights, bowling stats, search, scatter, dossier) from CONCURRENCY keep-alive
+connections. Memory is read after the load, once the workers have touched the
+data they serve. For each process it shows RSS and PSS (shared pages split
+between the processes mapping them) and private memory (pages that are this
+process's alone). Private memory is what each extra worker really costs.
+Compare it with the parent's RSS, roughly what an independent worker would cost.
+
+Usage: python benchmarks/bench_workers.py [max workers] [seconds per run]
+"""
+import asyncio
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+from bench_offload import Connection, fetch, get, wait_ready
+import bench_offload
+
+ROOT = Path(__file__).resolve().parent.parent
+PORT = bench_offload.PORT
+CONCURRENCY = 32
+
+
+def memory(pid: int) -> dict:
+    """kB figures from /proc/<pid>/smaps_rollup"""
+    values = {}
+    with open(f"/proc/{pid}/smaps_rollup") as f:
+        for line in f:
+            parts = line.split()
+            if len(parts) == 3 and parts[2] == "kB":
+                values[parts[0].rstrip(":")] = int(parts[1])
+    return {
+        "rss": values["Rss"], "pss": values["Pss"],
+        "private": values.get("Private_Clean", 0) + values.get("Private_Dirty", 0),
+    }
+
+
+def children(pid: int) -> list:
+    with open(f"/proc/{pid}/task/{pid}/children") as f:
+        return [int(child) for child in f.read().split()]
+
+
+async def drive(requests, seconds):
+    done = []
+    stop = asyncio.Event()
+
+    async def client(offset):
+        connection = await Connection.open()
+        i = offset
+        while not stop.is_set():
+            await connection.request(requests[i % len(requests)])
+            done.append(1)
+            i += 1
+        connection.close()
+
+    tasks = [asyncio.create_task(client(i)) for i in range(CONCURRENCY)]
+    await asyncio.sleep(seconds)
+    stop.set()
+    await asyncio.gather(*tasks)
+    return len(done) / seconds
+
+
+def main():
+    max_workers = int(sys.argv[1]) if len(sys.argv) > 1 else os.cpu_count()
+    seconds = float(sys.argv[2]) if len(sys.argv) > 2 else 5.0
+    print(f"{os.cpu_count()} CPU(s), {CONCURRENCY} connections, {seconds:.0f}s per run")
+    print(f"{'workers':>7} {'req/s':>8} {'parent RSS':>11} {'worker RSS':>11} {'worker PSS':>11} "
+          f"{'worker private':>15} {'total PSS':>10}")
+    for workers in range(1, max_workers + 1):
+        server = subprocess.Popen(
+            [sys.executable, "serve.py"], cwd=ROOT,
+            env={**os.environ, "WEB_CONCURRENCY": str(workers), "PORT": str(PORT)},
+            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+        )
+        try:
+            wait_ready()
+            players = [r["name"] for r in fetch("/players/search?q=a&limit=100")["results"]]
+            requests = []
+            for i, player in enumerate(players):
+                requests += [get(f"/player/{player}/insights"), get(f"/player/{player}/bowling-stats"),
+                             get(f"/players/search?q={player[:3]}")]
+                if i % 10 == 0:
+                    requests += [get(f"/scatter-plot-data?selected_players={player}"),
+                                 get("/team/Chennai Super Kings/dossier?venue=Chepauk")]
+            throughput = asyncio.run(drive(requests, seconds))
+
+            pids = children(server.pid) if workers > 1 else []
+            parent = memory(server.pid)
+            worker_memory = [memory(pid) for pid in pids] or [parent]
+            average = {key: sum(m[key] for m in worker_memory) / len(worker_memory) for key in parent}
+            total_pss = (parent["pss"] if pids else 0) + sum(m["pss"] for m in worker_memory)
+            print(f"{workers:>7} {throughput:>8.0f} {parent['rss'] / 1024:>9.1f}MB {average['rss'] / 1024:>9.1f}MB "
+                  f"{average['pss'] / 1024:>9.1f}MB {average['private'] / 1024:>13.1f}MB {total_pss / 1024:>8.1f}MB")
+        finally:
+            server.terminate()
+            server.wait()
+            time.sleep(0.5)
+
+
+if __name__ == "__main__":
+    main()
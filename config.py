@@ -1,4 +1,5 @@
 import os
+import tempfile
 from typing import List
 from dotenv import load_dotenv
 
@@ -19,6 +20,51 @@ class Settings:
     RAILWAY_HOST: str = os.getenv("RAILWAY_HOST", "iploppositionplanningbackend-game-planner.up.railway.app")
     RAILWAY_PORT: int = int(os.getenv("RAILWAY_PORT", "8000"))
     
+    # Data Loading
+    # Memory-map data/snapshot (built by `python snapshot.py build`) when it matches the CSVs
+    USE_DATA_SNAPSHOT: bool = os.getenv("USE_DATA_SNAPSHOT", "true").lower() == "true"
+    # Seconds between checks of data/ for changed CSVs; 0 disables hot reload on file change
+    DATA_WATCH_INTERVAL: float = float(os.getenv("DATA_WATCH_INTERVAL", "0"))
+    
+    # Player Rankings
+    # Batters need this many innings / balls faced to be ranked (10 innings gives the ~125-player pool)
+    RANK_MIN_INNINGS: int = int(os.getenv("RANK_MIN_INNINGS", "10"))
+    RANK_MIN_BALLS: float = float(os.getenv("RANK_MIN_BALLS", "0"))
+    # pandas rank method for ties: min, max, average, dense or first
+    RANK_TIE_METHOD: str = os.getenv("RANK_TIE_METHOD", "min")
+    
+    # Worker processes started by serve.py; they share the parent's loaded data copy-on-write
+    WEB_CONCURRENCY: int = int(os.getenv("WEB_CONCURRENCY", "1"))
+    # Set by serve.py in its workers: the parent pid that owns reloads and file watching
+    PREFORK_PARENT: int = 0
+    
+    # Request Execution
+    # Thread pool for pandas/numpy handler work; 0 runs everything on the event loop
+    OFFLOAD_THREADS: int = int(os.getenv("OFFLOAD_THREADS", "4"))
+    # Process pool for heavy analytics (the matchup planner); 0 uses the thread pool
+    OFFLOAD_PROCESSES: int = int(os.getenv("OFFLOAD_PROCESSES", "0"))
+    # Offloaded calls allowed to run or wait at once before requests get a 503
+    OFFLOAD_QUEUE_LIMIT: int = int(os.getenv("OFFLOAD_QUEUE_LIMIT", "64"))
+    
+    # Result Cache
+    # Bounds on cached payloads of parameterized endpoints (e.g. /scatter-plot-data)
+    RESULT_CACHE_ENTRIES: int = int(os.getenv("RESULT_CACHE_ENTRIES", "1024"))
+    RESULT_CACHE_MB: int = int(os.getenv("RESULT_CACHE_MB", "32"))
+    
+    # Request Profiling
+    # Fraction of requests profiled at random; admins can also send X-Profile: 1
+    PROFILE_SAMPLE_RATE: float = float(os.getenv("PROFILE_SAMPLE_RATE", "0"))
+    # Requests still running after this many ms are profiled from then on; 0 (default) disables
+    PROFILE_SLOW_MS: float = float(os.getenv("PROFILE_SLOW_MS", "0"))
+    PROFILE_INTERVAL_MS: float = float(os.getenv("PROFILE_INTERVAL_MS", "1"))
+    # Newest profiles kept on disk
+    PROFILE_DIR: str = os.getenv("PROFILE_DIR", os.path.join(tempfile.gettempdir(), "ipl-profiles"))
+    PROFILE_RING_SIZE: int = int(os.getenv("PROFILE_RING_SIZE", "50"))
+    
+    # Admin Configuration
+    # Token expected in the X-Admin-Token header; admin endpoints are disabled when unset
+    ADMIN_TOKEN: str = os.getenv("ADMIN_TOKEN", "")
+    
     # CORS Configuration
     CORS_ORIGINS: List[str] = [
         "http://localhost:3000",  # Local React development
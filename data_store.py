@@ -0,0 +1,280 @@
+import threading
+import time
+from dataclasses import dataclass, field, replace
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Optional
+
+import pandas as pd
+
+from datasets import (
+    BowlerTypeMatrix, VenuePhaseArray, build_bowler_type_matrix, build_scatter_frame,
+    build_strike_rate_index, build_team_scatter_frame, build_venue_phases
+)
+from schema import (
+    BATTING_SCHEMA, TEAM_SCHEMA, BATTER_VS_BOWLER_SCHEMA, TEAM_VS_BOWLER_SCHEMA, VENUE_SCHEMA,
+    SCHEMAS, load_table
+)
+from ranks import RankConfig, RankTable, compute_ranks
+from insight_engine import InsightBook, build_insight_book
+from player_search import PlayerSearchIndex, build_player_search_index
+from snapshot import load_snapshot, source_hash
+from venues import VenueResolver, build_venue_resolver
+
+
+@dataclass(frozen=True)
+class Dataset:
+    """One immutable, fully indexed view of the data directory.
+
+    Handlers read ``store.current`` once and use that object for the whole
+    request, so a reload swapping in a new Dataset never mixes tables from two
+    versions. Tables that failed to load are None and endpoints fall back to
+    their hardcoded defaults.
+    """
+    version: str
+    generation: int = 0
+    loaded_at: float = field(default_factory=time.time)
+    batting_data: Optional[pd.DataFrame] = None
+    team_data: Optional[pd.DataFrame] = None
+    batter_vs_bowler_data: Optional[pd.DataFrame] = None
+    team_vs_bowler_data: Optional[pd.DataFrame] = None
+    # Venue summary columns; the phase metrics live in venue_phases
+    venue_data: Optional[pd.DataFrame] = None
+    # Derived lookup structures
+    scatter_frame: Optional[pd.DataFrame] = None
+    team_scatter_frame: Optional[pd.DataFrame] = None
+    bowler_type_matrix: Optional[BowlerTypeMatrix] = None
+    team_bowling_index: Optional[Dict[str, Dict[str, float]]] = None
+    venue_phases: Optional[VenuePhaseArray] = None
+    venue_resolver: Optional[VenueResolver] = None
+    player_search: Optional[PlayerSearchIndex] = None
+    batting_ranks: Optional[RankTable] = None
+    team_ranks: Optional[RankTable] = None
+    insights: Optional[InsightBook] = None
+
+
+EMPTY_DATASET = Dataset(version="builtin")
+
+
+def _rank_batting(frame: pd.DataFrame, rank_config: RankConfig) -> Dict:
+    ranked, table = compute_ranks(frame, 'Batter_Name', rank_config)
+    return {'batting_data': ranked, 'batting_ranks': table, 'scatter_frame': build_scatter_frame(ranked)}
+
+
+def _rank_teams(frame: pd.DataFrame) -> Dict:
+    # Every franchise qualifies for the team rankings
+    ranked, table = compute_ranks(frame, 'batting_team', RankConfig())
+    return {'team_data': ranked, 'team_ranks': table, 'team_scatter_frame': build_team_scatter_frame(ranked)}
+
+
+def _player_search(tables: Dict, extra_names: Iterable[str]) -> PlayerSearchIndex:
+    names = list(extra_names)
+    weights = {}
+    batting = tables.get('batting_data')
+    if batting is not None:
+        batters = batting['Batter_Name'].astype(str).tolist()
+        names += batters
+        # More innings played ranks a name higher among equal matches
+        weights = dict(zip(batters, batting['Total_Innings_Played'].tolist()))
+    if tables.get('bowler_type_matrix') is not None:
+        names += tables['bowler_type_matrix'].players
+    return build_player_search_index(names, weights)
+
+
+def load_dataset(data_dir: Path, generation: int = 0, use_snapshot: bool = True,
+                 rank_config: RankConfig = RankConfig(), extra_player_names: Iterable[str] = ()) -> Dataset:
+    """Load every table in ``data_dir`` and build its indexes.
+
+    A failure in one table is reported and leaves that table (and anything
+    derived from it) empty rather than aborting the whole load.
+    ``extra_player_names`` (e.g. squad lists) are added to the player search index.
+    """
+    print(f"Loading data from: {data_dir}")
+    print(f"Data directory exists: {data_dir.exists()}")
+    if not data_dir.exists():
+        print("Data directory not found, using hardcoded data only")
+        return Dataset(version=EMPTY_DATASET.version, generation=generation,
+                       player_search=build_player_search_index(extra_player_names))
+
+    try:
+        content_hash = source_hash(data_dir)
+    except OSError as e:
+        print(f"Error hashing data directory: {e}")
+        content_hash = None
+    version = content_hash[:16] if content_hash else f"unhashed-{generation}"
+
+    snapshot = None
+    if use_snapshot and content_hash:
+        try:
+            snapshot = load_snapshot(data_dir, current_hash=content_hash)
+        except Exception as e:
+            print(f"Error loading data snapshot: {e}")
+    print("Loading data from snapshot" if snapshot else "No fresh data snapshot, parsing CSVs")
+
+    def load(schema):
+        return snapshot[schema.filename] if snapshot else load_table(data_dir, schema)
+
+    tables = {}
+    for name, schema, label, derive in [
+        ('batting_data', BATTING_SCHEMA, "batting data", lambda frame: _rank_batting(frame, rank_config)),
+        ('team_data', TEAM_SCHEMA, "team data", _rank_teams),
+        ('batter_vs_bowler_data', BATTER_VS_BOWLER_SCHEMA, "batter vs bowler data",
+         lambda frame: {'bowler_type_matrix': build_bowler_type_matrix(frame)}),
+        ('team_vs_bowler_data', TEAM_VS_BOWLER_SCHEMA, "team vs bowler data",
+         lambda frame: {'team_bowling_index': build_strike_rate_index(
+             frame, 'batting_team', 'bowling_type', 'strike_rate')}),
+        ('venue_data', VENUE_SCHEMA, "venue data",
+         lambda frame: {
+             **dict(zip(('venue_data', 'venue_phases'), build_venue_phases(frame))),
+             'venue_resolver': build_venue_resolver(frame['venue'].astype(str)),
+         }),
+    ]:
+        try:
+            frame = load(schema)
+            derived = derive(frame) if derive else {}
+            tables[name] = frame
+            tables.update(derived)
+            print(f"Loaded {label} successfully")
+        except Exception as e:
+            print(f"Error loading {label}: {e}")
+
+    try:
+        tables['insights'] = build_insight_book(
+            tables.get('batting_data'), tables.get('team_data'), tables.get('venue_data'),
+            tables.get('venue_phases'), rank_config, tables.get('batting_ranks'), tables.get('team_ranks'))
+        print(f"Generated insights in {tables['insights'].build_seconds * 1000:.1f}ms")
+    except Exception as e:
+        print(f"Error generating insights: {e}")
+
+    try:
+        tables['player_search'] = _player_search(tables, extra_player_names)
+    except Exception as e:
+        print(f"Error building player search index: {e}")
+
+    return Dataset(version=version, generation=generation, **tables)
+
+
+class DatasetStore:
+    """Holds the current Dataset and swaps in new ones on reload.
+
+    Reloads build a complete new Dataset off to the side and then replace the
+    ``current`` reference in a single assignment; readers never block on a
+    reload and never see a partially built one.
+    """
+
+    def __init__(self, data_dir: Path, use_snapshot: bool = True, rank_config: RankConfig = RankConfig(),
+                 extra_player_names: Optional[Callable[[], Iterable[str]]] = None):
+        self.data_dir = data_dir
+        self.use_snapshot = use_snapshot
+        self.rank_config = rank_config
+        # Called on every reload so the names can come from lazily loaded sources
+        self.extra_player_names = extra_player_names or (lambda: ())
+        self.current: Dataset = EMPTY_DATASET
+        self._reload_lock = threading.Lock()
+        self._listeners = []
+        self._watcher: Optional[threading.Thread] = None
+        self._stop_watching = threading.Event()
+
+    def reload(self, force: bool = False) -> Dataset:
+        """Load the data directory and swap it in; returns the (possibly unchanged) current Dataset.
+
+        Without ``force`` a reload whose content hash matches the current
+        version is skipped. Concurrent callers wait for the reload in progress.
+        """
+        with self._reload_lock:
+            current = self.current
+            if not force and current is not EMPTY_DATASET:
+                try:
+                    if source_hash(self.data_dir)[:16] == current.version:
+                        return current
+                except OSError:
+                    pass
+
+            dataset = load_dataset(self.data_dir, current.generation + 1, self.use_snapshot, self.rank_config,
+                                   self.extra_player_names())
+            self.current = dataset
+            print(f"Dataset version {dataset.version} (generation {dataset.generation}) is live")
+            self._publish(dataset)
+            return dataset
+
+    def rerank(self, rank_config: RankConfig) -> Dataset:
+        """Swap in a copy of the current Dataset ranked under ``rank_config``, without reparsing"""
+        with self._reload_lock:
+            current = self.current
+            self.rank_config = rank_config
+            if current.batting_data is None:
+                return current
+            ranked = _rank_batting(current.batting_data, rank_config)
+            insights = build_insight_book(
+                ranked['batting_data'], current.team_data, current.venue_data, current.venue_phases, rank_config,
+                ranked['batting_ranks'], current.team_ranks)
+            dataset = replace(current, generation=current.generation + 1, insights=insights, **ranked)
+            self.current = dataset
+            self._publish(dataset)
+            return dataset
+
+    def refresh_player_search(self) -> Dataset:
+        """Swap in a copy of the current Dataset whose search index has the latest extra names.
+
+        For name sources that load after the dataset (the insight corpus);
+        nothing changes when the index already has every name.
+        """
+        with self._reload_lock:
+            current = self.current
+            if current is EMPTY_DATASET:
+                return current
+            search = _player_search({'batting_data': current.batting_data,
+                                     'bowler_type_matrix': current.bowler_type_matrix}, self.extra_player_names())
+            if current.player_search is not None and search.names == current.player_search.names:
+                return current
+            dataset = replace(current, generation=current.generation + 1, player_search=search)
+            self.current = dataset
+            self._publish(dataset)
+            return dataset
+
+    def subscribe(self, callback: Callable[[Dataset], None]):
+        """Call ``callback`` with every Dataset swapped in from now on, right after the swap"""
+        self._listeners.append(callback)
+
+    def _publish(self, dataset: Dataset):
+        for callback in self._listeners:
+            try:
+                callback(dataset)
+            except Exception as e:
+                print(f"Error in dataset listener: {e}")
+
+    def file_signature(self):
+        """(mtime, size) of every CSV, for cheap change detection"""
+        signature = []
+        for schema in SCHEMAS:
+            try:
+                stat = (self.data_dir / schema.filename).stat()
+                signature.append((stat.st_mtime_ns, stat.st_size))
+            except OSError:
+                signature.append(None)
+        return signature
+
+    def _watch(self, interval: float):
+        last = self.file_signature()
+        while not self._stop_watching.wait(interval):
+            signature = self.file_signature()
+            if signature != last:
+                last = signature
+                print("Data directory changed, reloading")
+                try:
+                    self.reload()
+                except Exception as e:
+                    print(f"Error reloading data: {e}")
+
+    def start_watching(self, interval: float):
+        """Poll the CSVs every ``interval`` seconds and reload when one changes"""
+        if interval <= 0 or self._watcher is not None:
+            return
+        self._stop_watching.clear()
+        self._watcher = threading.Thread(target=self._watch, args=(interval,), name="data-watcher", daemon=True)
+        self._watcher.start()
+
+    def stop_watching(self):
+        if self._watcher is not None:
+            self._stop_watching.set()
+            self._watcher.join()
+            self._watcher = None
@@ -0,0 +1,271 @@
+import re
+import numpy as np
+import pandas as pd
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional
+
+from venues import venue_id
+
+# Output field -> source column in IPL_21_24_Batting.csv
+SCATTER_COLUMNS = {
+    'first_innings_avg': 'batting_average_1st_innings',
+    'second_innings_avg': 'batting_average_2nd_innings',
+    'first_innings_sr': 'strike_rate_1st_innings',
+    'second_innings_sr': 'strike_rate_2nd_innings',
+}
+
+
+def build_scatter_frame(batting_data: pd.DataFrame) -> pd.DataFrame:
+    """Build the typed, Batter_Name-indexed frame backing /scatter-plot-data.
+
+    Expects ``batting_data`` already normalized by schema.BATTING_SCHEMA.
+    Built once at load so a request only does a hash lookup on the index and
+    one positional slice. Missing values are stored as 0, which is what the
+    endpoint has always reported for empty cells. Batters listed more than
+    once in the CSV keep every row, as the endpoint always returned them.
+    """
+    frame = pd.DataFrame(
+        {field: batting_data[column].to_numpy('float64') for field, column in SCATTER_COLUMNS.items()}
+    )
+    frame.index = pd.Index(batting_data['Batter_Name'], name='name')
+    frame = frame[frame.index.notna()]
+    return frame.fillna(0.0)
+
+
+def scatter_points(scatter_frame: pd.DataFrame, players: Iterable[str], selected: Iterable[str]) -> List[Dict]:
+    """Return scatter rows for the given players, in data-file order"""
+    selected = set(selected)
+    # get_indexer_for: every row of a name listed twice, not just the first
+    positions = scatter_frame.index.get_indexer_for(list(players))
+    positions = np.unique(positions[positions >= 0])
+
+    names = scatter_frame.index[positions].tolist()
+    values = scatter_frame.to_numpy()[positions].tolist()
+    fields = list(scatter_frame.columns)
+
+    points = []
+    for name, row in zip(names, values):
+        point = {'name': name}
+        point.update(zip(fields, row))
+        point['isSelected'] = name in selected
+        points.append(point)
+    return points
+
+
+# Output field -> source column in IPL_Team_BattingData_21_24.csv
+TEAM_SCATTER_COLUMNS = {
+    'first_innings_avg': 'First.Innings.Average',
+    'second_innings_avg': 'Second.Innings.Average',
+    'first_innings_sr': 'strike_rate_1st_innings',
+    'second_innings_sr': 'strike_rate_2nd_innings',
+}
+
+
+def build_team_scatter_frame(team_data: pd.DataFrame) -> pd.DataFrame:
+    """Every numeric column of the team table as float64, indexed by team name.
+
+    Any of these columns can be an axis of /team-scatter-plot-data. Unlike the
+    player scatter, missing values stay NaN (served as null).
+    """
+    frame = team_data.select_dtypes('number').astype('float64')
+    frame.index = pd.Index(team_data['batting_team'].astype(str), name='name')
+    return frame[frame.index.notna() & ~frame.index.duplicated(keep='first')]
+
+
+def team_scatter_points(frame: pd.DataFrame, fields: Dict[str, str]) -> List[Dict]:
+    """One {'name', field: value} row per team, reading each output field from its column"""
+    values = frame[list(fields.values())].to_numpy().tolist()
+    return [{'name': name, **dict(zip(fields, row))} for name, row in zip(frame.index.tolist(), values)]
+
+
+def build_strike_rate_index(frame: pd.DataFrame, key_column: str, type_column: str,
+                            rate_column: str) -> Dict[str, Dict[str, float]]:
+    """Map each key (batter or team) to a ready-made {bowler type: strike rate} dict.
+
+    Bowler types keep the order they appear in the file, matching what the
+    bowling-stats endpoints used to build per request.
+    """
+    index: Dict[str, Dict[str, float]] = {}
+    keys = frame[key_column].astype(str).tolist()
+    types = frame[type_column].astype(str).tolist()
+    rates = frame[rate_column].to_numpy('float64').tolist()
+    for key, bowler_type, rate in zip(keys, types, rates):
+        index.setdefault(key, {})[bowler_type] = rate
+    return index
+
+
+@dataclass(frozen=True)
+class BowlerTypeMatrix:
+    """Dense players x bowler types view of Batters_StrikeRateVSBowlerType.csv.
+
+    ``runs``, ``balls_faced`` and ``strike_rate`` are read-only float64 arrays
+    of shape (len(players), len(bowler_types)); cells with no data are NaN and
+    ``present`` is False. Row and column positions are stable for the lifetime
+    of the matrix, so callers can keep the index maps around.
+    """
+    players: List[str]
+    bowler_types: List[str]
+    player_index: Dict[str, int]
+    type_index: Dict[str, int]
+    runs: np.ndarray
+    balls_faced: np.ndarray
+    strike_rate: np.ndarray
+    present: np.ndarray
+
+    def rows_for(self, players: Iterable[str]) -> np.ndarray:
+        """Row positions for ``players``; -1 where a player has no data"""
+        return np.array([self.player_index.get(name, -1) for name in players], dtype=np.intp)
+
+    def strike_rates(self, player: str) -> Optional[Dict[str, float]]:
+        """{bowler type: strike rate} for one player, or None if unknown"""
+        row = self.player_index.get(player)
+        if row is None:
+            return None
+        rates = self.strike_rate[row].tolist()
+        return {self.bowler_types[col]: rates[col] for col in np.flatnonzero(self.present[row]).tolist()}
+
+    def weakest_bowler_types(self, players: Iterable[str], min_balls: int = 0) -> Dict[str, Optional[str]]:
+        """Bowler type each player scores slowest against (None when nothing qualifies)"""
+        players = list(players)
+        rows = self.rows_for(players)
+        known = rows >= 0
+
+        rates = np.full((len(players), len(self.bowler_types)), np.nan)
+        rates[known] = self.strike_rate[rows[known]]
+        if min_balls:
+            balls = np.zeros_like(rates)
+            balls[known] = self.balls_faced[rows[known]]
+            rates[balls < min_balls] = np.nan
+
+        qualified = ~np.isnan(rates).all(axis=1)
+        weakest = np.argmin(np.where(np.isnan(rates), np.inf, rates), axis=1)
+        return {
+            name: self.bowler_types[col] if ok else None
+            for name, col, ok in zip(players, weakest.tolist(), qualified.tolist())
+        }
+
+
+def build_bowler_type_matrix(batter_vs_bowler_data: pd.DataFrame) -> BowlerTypeMatrix:
+    """Pivot the long batter-vs-bowler-type table into a BowlerTypeMatrix in one pass"""
+    player_codes, players = pd.factorize(batter_vs_bowler_data['Batter_Name'].astype(str), sort=False)
+    type_codes, bowler_types = pd.factorize(batter_vs_bowler_data['bowler.type'].astype(str), sort=False)
+    shape = (len(players), len(bowler_types))
+
+    def dense(column: str) -> np.ndarray:
+        values = np.full(shape, np.nan)
+        values[player_codes, type_codes] = batter_vs_bowler_data[column].to_numpy('float64')
+        values.setflags(write=False)
+        return values
+
+    present = np.zeros(shape, dtype=bool)
+    present[player_codes, type_codes] = True
+    present.setflags(write=False)
+
+    players = players.tolist()
+    bowler_types = bowler_types.tolist()
+    return BowlerTypeMatrix(
+        players=players,
+        bowler_types=bowler_types,
+        player_index={name: i for i, name in enumerate(players)},
+        type_index={name: j for j, name in enumerate(bowler_types)},
+        runs=dense('Runs'),
+        balls_faced=dense('BallsFaced'),
+        strike_rate=dense('StrikeRate'),
+        present=present,
+    )
+
+
+# Source column prefixes/suffixes for the venue phase axes
+VENUE_PHASES = {'powerplay': 'Powerplay', 'middle': 'MiddleOvers', 'death': 'DeathOvers'}
+VENUE_INNINGS = {'match': 'perMatch', 'first': 'First_Innings', 'second': 'Second_Innings'}
+_VENUE_PHASE_COLUMN = re.compile(
+    r"^(%s)_(.+)_(%s)$" % ("|".join(VENUE_PHASES.values()), "|".join(VENUE_INNINGS.values()))
+)
+
+
+@dataclass(frozen=True)
+class VenuePhaseArray:
+    """Venue x phase x innings x metric view of the phase columns in IPL_Venue_details.csv.
+
+    ``values`` is a read-only float32 array of shape
+    (len(venues), len(phases), len(innings), len(metrics)); combinations the
+    file doesn't have are NaN. Phases are "powerplay"/"middle"/"death" and
+    innings "match"/"first"/"second"; metrics keep the source names
+    ("Runs_Scored", "Dot_Pct", ...). Venues are looked up by canonical venue
+    ID (see venues.VenueResolver), not by display name.
+    """
+    venues: List[str]  # display names, in file order
+    phases: List[str]
+    innings: List[str]
+    metrics: List[str]
+    venue_index: Dict[str, int]
+    phase_index: Dict[str, int]
+    innings_index: Dict[str, int]
+    metric_index: Dict[str, int]
+    values: np.ndarray
+
+    def column(self, phase: str, innings: str, metric: str) -> np.ndarray:
+        """One metric for every venue, in venue order"""
+        return self.values[:, self.phase_index[phase], self.innings_index[innings], self.metric_index[metric]]
+
+    def value(self, venue: str, phase: str, innings: str, metric: str) -> Optional[float]:
+        row = self.venue_index.get(venue)
+        if row is None:
+            return None
+        value = float(self.column(phase, innings, metric)[row])
+        return None if np.isnan(value) else value
+
+    def phase_stats(self, venue: str, innings: str = 'match') -> Optional[Dict[str, Dict[str, float]]]:
+        """{phase: {metric: value}} for one venue, or None if unknown"""
+        row = self.venue_index.get(venue)
+        if row is None:
+            return None
+        # float32 -> 2 dp floats, the precision of the source file
+        block = self.values[row, :, self.innings_index[innings]].astype('float64').round(2).tolist()
+        return {
+            phase: {metric: value for metric, value in zip(self.metrics, values) if value == value}
+            for phase, values in zip(self.phases, block)
+        }
+
+
+def build_venue_phases(venue_data: pd.DataFrame):
+    """Split normalized venue data into (summary frame, VenuePhaseArray).
+
+    The summary frame keeps every column that isn't a phase metric; the phase
+    metrics move into one contiguous float32 array.
+    """
+    phase_names = {prefix: name for name, prefix in VENUE_PHASES.items()}
+    innings_names = {suffix: name for name, suffix in VENUE_INNINGS.items()}
+
+    cells, metrics = [], []
+    for column in venue_data.columns:
+        match = _VENUE_PHASE_COLUMN.match(column)
+        if match:
+            prefix, metric, suffix = match.groups()
+            if metric not in metrics:
+                metrics.append(metric)
+            cells.append((column, phase_names[prefix], innings_names[suffix], metric))
+
+    phases, innings = list(VENUE_PHASES), list(VENUE_INNINGS)
+    phase_index = {name: i for i, name in enumerate(phases)}
+    innings_index = {name: i for i, name in enumerate(innings)}
+    metric_index = {name: i for i, name in enumerate(metrics)}
+
+    values = np.full((len(venue_data), len(phases), len(innings), len(metrics)), np.nan, dtype=np.float32)
+    for column, phase, inning, metric in cells:
+        values[:, phase_index[phase], innings_index[inning], metric_index[metric]] = venue_data[column].to_numpy('float32')
+    values.setflags(write=False)
+
+    venues = venue_data['venue'].astype(str).tolist()
+    summary = venue_data.drop(columns=[cell[0] for cell in cells])
+    return summary, VenuePhaseArray(
+        venues=venues,
+        phases=phases,
+        innings=innings,
+        metrics=metrics,
+        venue_index={venue_id(name): i for i, name in enumerate(venues)},
+        phase_index=phase_index,
+        innings_index=innings_index,
+        metric_index=metric_index,
+        values=values,
+    )
@@ -0,0 +1,72 @@
+import json
+import math
+from typing import Any
+
+import numpy as np
+from fastapi.responses import JSONResponse
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is in requirements.txt
+    orjson = None
+
+_ORJSON_OPTIONS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS if orjson else 0
+
+
+def _default(value: Any):
+    """Types orjson doesn't know natively: pandas/numpy leftovers and sets"""
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, np.ndarray):
+        return _clean(value.tolist())
+    if isinstance(value, (set, frozenset)):
+        return list(value)
+    if hasattr(value, "tolist"):
+        return value.tolist()
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+
+def _clean(value: Any) -> Any:
+    """Stdlib fallback: the same value with NaN/inf as None and numpy types as Python ones"""
+    if isinstance(value, float):
+        return value if math.isfinite(value) else None
+    if isinstance(value, dict):
+        return {key: _clean(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_clean(item) for item in value]
+    if isinstance(value, np.ndarray):
+        if value.dtype.kind == 'f':
+            # One vectorized pass marks the non-finite cells before tolist()
+            return np.where(np.isfinite(value), value, None).tolist()
+        return value.tolist()
+    if isinstance(value, np.generic):
+        return _clean(value.item())
+    return value
+
+
+def dumps(content: Any) -> bytes:
+    """Serialize a response payload to UTF-8 JSON bytes.
+
+    NaN and +/-inf always become null. numpy scalars and arrays are written
+    directly (by orjson's native numpy support when it is installed), so
+    DataFrame-derived values never need converting one element at a time.
+    """
+    if orjson is not None:
+        return orjson.dumps(content, default=_default, option=_ORJSON_OPTIONS)
+    return json.dumps(_clean(content), ensure_ascii=False, allow_nan=False,
+                      separators=(",", ":"), default=_default).encode("utf-8")
+
+
+def loads(body: bytes) -> Any:
+    """Parse a body written by dumps()"""
+    return orjson.loads(body) if orjson is not None else json.loads(body)
+
+
+class NumpyJSONResponse(JSONResponse):
+    """JSONResponse rendered with dumps(): NaN-safe and numpy-aware.
+
+    Handlers return it directly so FastAPI skips jsonable_encoder.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
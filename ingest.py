@@ -0,0 +1,345 @@
+#!/usr/bin/env python3
+"""
+Ball-by-ball ingestion: derive the batting CSVs in data/ from a deliveries file.
+
+Replaces the external R pipeline that produced IPL_21_24_Batting.csv,
+IPL_Team_BattingData_21_24.csv, Batters_StrikeRateVSBowlerType.csv and
+Team_vs_BowlingType.csv. Every metric is a ratio of per-group sums, so the
+whole recompute is one pass to build per-delivery indicator arrays followed
+by vectorized grouped sums (np.bincount / groupby) per output table.
+
+Usage: python ingest.py deliveries.csv [--out-dir data]
+
+The deliveries file has one row per delivery, in match order, with columns:
+    match_id, innings, over, batting_team, batter, bowler_type,
+    runs_batter, extras, wides, player_dismissed
+``over`` is 0-based, ``bowler_type`` is one of the six BOWLER_TYPES,
+``wides`` is the wide runs on the ball (0 if not a wide) and
+``player_dismissed`` is empty when there was no wicket.
+"""
+import argparse
+import sys
+from pathlib import Path
+from typing import Dict, List
+
+import numpy as np
+import pandas as pd
+
+from schema import BATTER_VS_BOWLER_SCHEMA, BATTING_SCHEMA, TEAM_SCHEMA, TEAM_VS_BOWLER_SCHEMA, to_source_format
+
+DELIVERY_COLUMNS = [
+    'match_id', 'innings', 'over', 'batting_team', 'batter', 'bowler_type',
+    'runs_batter', 'extras', 'wides', 'player_dismissed',
+]
+BOWLER_TYPES = [
+    'Left arm wrist spin', 'Left arm pace', 'Leg spin', 'Off spin', 'Right arm pace', 'Slow left arm orthodox',
+]
+PACE_TYPES = {'Left arm pace', 'Right arm pace'}
+
+# Batter ball-number windows reported as strike_rate_balls_<lo>_<hi>
+BALL_WINDOWS = [(1, 10), (11, 20), (21, 30), (31, 40), (41, 50)]
+
+BATTING_COLUMNS = [
+    'Batter_Name', 'Total_Runs_Scored', 'Total_Innings_Played', 'Total_Times_Out',
+    'average_balls_faced_per_innings', 'batting_average', 'strike_rate', 'dot_ball_percentage',
+    'boundary_percentage', 'balls_per_boundary', 'non_boundary_strike_rate',
+    'strike_rate_first_5_balls', 'strike_rate_first_10_balls',
+    'batting_average_vs_pace', 'strike_rate_vs_pace', 'dot_ball_percentage_vs_pace',
+    'boundary_percentage_vs_pace', 'balls_per_boundary_vs_pace', 'non_boundary_strike_rate_vs_pace',
+    'strike_rate_first_5_balls_vs_pace', 'strike_rate_first_10_balls_vs_pace',
+    'batting_average_vs_spin', 'strike_rate_vs_spin', 'dot_ball_percentage_vs_spin',
+    'boundary_percentage_vs_spin', 'balls_per_boundary_vs_spin', 'non_boundary_strike_rate_vs_spin',
+    'strike_rate_first_5_balls_vs_spin', 'strike_rate_first_10_balls_vs_spin',
+    'batting_average_1st_innings', 'strike_rate_1st_innings',
+    'batting_average_2nd_innings', 'strike_rate_2nd_innings',
+    'strike_rate_balls_1_10', 'strike_rate_balls_11_20', 'strike_rate_balls_21_30',
+    'strike_rate_balls_31_40', 'strike_rate_balls_41_50',
+    'Rank_strike_rate', 'Rank_boundary_percentage', 'Rank_strike_rate_vs_pace', 'Rank_strike_rate_vs_spin',
+    'Rank_First.Innings.Average', 'Rank_Second.Innings.Average', 'Rank_dot_ball_percentage',
+    'Rank_dot_ball_percentage_vs_pace', 'Rank_dot_ball_percentage_vs_spin', 'Rank_boundary_percentage_vs_spin',
+    'Rank_boundary_percentage_vs_pace', 'Rank_batting_average', 'Rank_strike_rate_balls_1_10',
+    'Rank_strike_rate_balls_11_20', 'Rank_strike_rate_balls_21_30', 'Rank_strike_rate_balls_31_40',
+    'Rank_strike_rate_balls_41_50', 'Rank_balls_per_boundary', 'Rank_non_boundary_strike_rate',
+]
+
+TEAM_COLUMNS = [
+    'batting_team', 'average_balls_faced_per_innings', 'batting_average', 'balls_per_boundary',
+    'balls_per_boundary_vs_pace', 'batting_average_vs_spin', 'balls_per_boundary_vs_spin', 'strike_rate',
+    'dot_ball_percentage', 'boundary_percentage', 'non_boundary_strike_rate', 'strike_rate_first_5_balls',
+    'strike_rate_vs_pace', 'dot_ball_percentage_vs_pace', 'boundary_percentage_vs_pace',
+    'non_boundary_strike_rate_vs_pace', 'strike_rate_first_5_balls_vs_pace', 'strike_rate_first_10_balls_vs_pace',
+    'strike_rate_vs_spin', 'dot_ball_percentage_vs_spin', 'boundary_percentage_vs_spin',
+    'non_boundary_strike_rate_vs_spin', 'strike_rate_first_5_balls_vs_spin', 'strike_rate_first_10_balls_vs_spin',
+    'strike_rate_1st_innings', 'strike_rate_2nd_innings', 'strike_rate_balls_1_10', 'strike_rate_balls_11_20',
+    'strike_rate_balls_21_30', 'strike_rate_balls_31_40', 'strike_rate_balls_41_50',
+    'First.Innings.Average', 'Second.Innings.Average',
+    'Rank_strike_rate', 'Rank_boundary_percentage', 'Rank_strike_rate_vs_pace', 'Rank_strike_rate_vs_spin',
+    'Rank_First.Innings.Average', 'Rank_Second.Innings.Average', 'Rank_StrikeRate_in_Death_Overs',
+    'Rank_batting_average',
+]
+
+
+def _ratio(numerator, denominator, scale=1.0) -> np.ndarray:
+    """numerator / denominator * scale, NaN where the denominator is 0"""
+    numerator = np.asarray(numerator, dtype='float64')
+    denominator = np.asarray(denominator, dtype='float64')
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(denominator > 0, numerator / denominator * scale, np.nan)
+
+
+def prepare_deliveries(deliveries: pd.DataFrame) -> pd.DataFrame:
+    """Validate a raw deliveries frame and add the per-delivery flags the aggregations need"""
+    missing = [column for column in DELIVERY_COLUMNS if column not in deliveries.columns]
+    if missing:
+        raise ValueError(f"Deliveries file is missing columns: {missing}")
+
+    frame = deliveries[DELIVERY_COLUMNS].copy()
+    for column in ['innings', 'over', 'runs_batter', 'extras', 'wides']:
+        frame[column] = pd.to_numeric(frame[column], errors='coerce').fillna(0).astype('int32')
+    frame['player_dismissed'] = frame['player_dismissed'].fillna('').astype(str)
+    # Factorize the name columns once; every later groupby works on the codes
+    for column in ['batting_team', 'batter', 'bowler_type']:
+        frame[column] = frame[column].astype(str).astype('category')
+
+    runs = frame['runs_batter'].to_numpy()
+    legal = frame['wides'].to_numpy() == 0
+    frame['ball'] = legal.astype('int32')
+    frame['is_pace'] = frame['bowler_type'].isin(PACE_TYPES).to_numpy()
+    frame['is_four'] = legal & (runs == 4)
+    frame['is_six'] = legal & (runs == 6)
+    frame['is_dot'] = legal & (runs == 0)
+    # Batter's ball number within their innings (wides don't advance it)
+    frame['ball_number'] = frame.groupby(['match_id', 'innings', 'batter'], sort=False, observed=True)['ball'].cumsum()
+    return frame
+
+
+def _bucket_sums(codes: np.ndarray, groups: int, bucket: np.ndarray, buckets: int,
+                 measures: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+    """(groups x buckets) sums of each measure, one np.bincount per measure"""
+    key = codes * buckets + bucket
+    return {
+        measure: np.bincount(key, weights=values, minlength=groups * buckets).reshape(groups, buckets)
+        for measure, values in measures.items()
+    }
+
+
+def _segment_sums(frame: pd.DataFrame, key: str) -> pd.DataFrame:
+    """Per-group sums of every (segment x measure) combination.
+
+    Segments are overall, vs pace/spin, 1st/2nd innings, the batter's first
+    5/10 balls (overall and by bowler type) and each BALL_WINDOWS window.
+    Measures are runs, balls, dots, boundaries and boundary runs. Segments are
+    read off four partitions of the deliveries (bowler type, innings, opening
+    balls x bowler type, ball window), each summed with a single bincount per
+    measure over the group codes.
+    """
+    codes = frame[key].cat.codes.to_numpy().astype(np.intp)
+    groups = frame[key].cat.categories
+    n = len(groups)
+
+    runs = frame['runs_batter'].to_numpy('float64')
+    balls = frame['ball'].to_numpy('float64')
+    boundaries = (frame['is_four'] | frame['is_six']).to_numpy('float64')
+    measures = {
+        'runs': runs * balls,
+        'balls': balls,
+        'dots': frame['is_dot'].to_numpy('float64'),
+        'boundaries': boundaries,
+        'boundary_runs': runs * boundaries,
+    }
+
+    is_pace = frame['is_pace'].to_numpy().astype(np.intp)
+    innings = frame['innings'].to_numpy()
+    ball_number = frame['ball_number'].to_numpy()
+
+    by_type = _bucket_sums(codes, n, is_pace, 2, measures)
+    # Super-over innings (3+) go to bucket 0 and are only counted overall
+    by_innings = _bucket_sums(codes, n, np.where((innings == 1) | (innings == 2), innings, 0), 3, measures)
+    opening = np.where(ball_number <= 5, 0, np.where(ball_number <= 10, 1, 2))
+    by_opening = _bucket_sums(codes, n, opening * 2 + is_pace, 6, measures)
+    window = np.where((ball_number >= 1) & (ball_number <= 50), (ball_number - 1) // 10, len(BALL_WINDOWS))
+    by_window = _bucket_sums(codes, n, window, len(BALL_WINDOWS) + 1, measures)
+
+    sums = {}
+    for measure in measures:
+        spin, pace = by_type[measure][:, 0], by_type[measure][:, 1]
+        opening_sums = by_opening[measure]
+        first5_spin, first5_pace = opening_sums[:, 0], opening_sums[:, 1]
+        first10_spin, first10_pace = first5_spin + opening_sums[:, 2], first5_pace + opening_sums[:, 3]
+        segments = {
+            '': spin + pace,
+            'pace': pace,
+            'spin': spin,
+            'inn1': by_innings[measure][:, 1],
+            'inn2': by_innings[measure][:, 2],
+            'first5': first5_spin + first5_pace,
+            'first5_pace': first5_pace,
+            'first5_spin': first5_spin,
+            'first10': first10_spin + first10_pace,
+            'first10_pace': first10_pace,
+            'first10_spin': first10_spin,
+        }
+        for i, (lo, hi) in enumerate(BALL_WINDOWS):
+            segments[f'balls_{lo}_{hi}'] = by_window[measure][:, i]
+        for segment, values in segments.items():
+            sums[f'{segment}:{measure}'] = values
+    return pd.DataFrame(sums, index=pd.Index(groups, name=key))
+
+
+def _dismissal_counts(frame: pd.DataFrame, key: str) -> pd.DataFrame:
+    """Dismissals per group, overall and split by bowler type and innings"""
+    out = frame[frame['player_dismissed'] != '']
+    if key == 'batter':
+        # Credit the dismissed player, who may have been the non-striker
+        group = out['player_dismissed'].to_numpy()
+    else:
+        group = out[key].to_numpy()
+    is_pace = out['is_pace'].to_numpy()
+    innings = out['innings'].to_numpy()
+    counts = pd.DataFrame({
+        key: group,
+        '': 1.0,
+        'pace': is_pace.astype('float64'),
+        'spin': (~is_pace).astype('float64'),
+        'inn1': (innings == 1).astype('float64'),
+        'inn2': (innings == 2).astype('float64'),
+    })
+    return counts.groupby(key, sort=False, observed=True).sum()
+
+
+def _batting_metrics(sums: pd.DataFrame, outs: pd.DataFrame, innings_played: pd.Series) -> Dict[str, np.ndarray]:
+    """All ratio metrics shared by the batter and team tables"""
+    outs = outs.reindex(sums.index, fill_value=0.0)
+
+    def s(segment, measure):
+        return sums[f'{segment}:{measure}'].to_numpy()
+
+    metrics = {
+        'Total_Runs_Scored': s('', 'runs'),
+        'Total_Innings_Played': innings_played.reindex(sums.index, fill_value=0).to_numpy(),
+        'Total_Times_Out': outs[''].to_numpy(),
+        'average_balls_faced_per_innings': _ratio(s('', 'balls'), innings_played.reindex(sums.index).to_numpy()),
+    }
+    for segment, suffix in [('', ''), ('pace', '_vs_pace'), ('spin', '_vs_spin')]:
+        runs, balls = s(segment, 'runs'), s(segment, 'balls')
+        boundaries, boundary_runs = s(segment, 'boundaries'), s(segment, 'boundary_runs')
+        metrics[f'batting_average{suffix}'] = _ratio(runs, outs[segment].to_numpy())
+        metrics[f'strike_rate{suffix}'] = _ratio(runs, balls, 100)
+        metrics[f'dot_ball_percentage{suffix}'] = _ratio(s(segment, 'dots'), balls, 100)
+        metrics[f'boundary_percentage{suffix}'] = _ratio(boundaries, balls, 100)
+        metrics[f'balls_per_boundary{suffix}'] = _ratio(balls, boundaries)
+        metrics[f'non_boundary_strike_rate{suffix}'] = _ratio(runs - boundary_runs, balls - boundaries, 100)
+        for limit in (5, 10):
+            first = f'first{limit}_{segment}' if segment else f'first{limit}'
+            metrics[f'strike_rate_first_{limit}_balls{suffix}'] = _ratio(s(first, 'runs'), s(first, 'balls'), 100)
+    for segment, suffix in [('inn1', '1st_innings'), ('inn2', '2nd_innings')]:
+        metrics[f'batting_average_{suffix}'] = _ratio(s(segment, 'runs'), outs[segment].to_numpy())
+        metrics[f'strike_rate_{suffix}'] = _ratio(s(segment, 'runs'), s(segment, 'balls'), 100)
+    for lo, hi in BALL_WINDOWS:
+        segment = f'balls_{lo}_{hi}'
+        metrics[f'strike_rate_balls_{lo}_{hi}'] = _ratio(s(segment, 'runs'), s(segment, 'balls'), 100)
+    return metrics
+
+
+def _assemble(index: pd.Index, key_column: str, metrics: Dict[str, np.ndarray], columns: List[str]) -> pd.DataFrame:
+    frame = pd.DataFrame({key_column: index.to_numpy()})
+    for column in columns[1:]:
+        frame[column] = metrics[column] if column in metrics else np.nan
+    return frame
+
+
+def compute_batting_table(frame: pd.DataFrame) -> pd.DataFrame:
+    """Per-batter metrics in IPL_21_24_Batting.csv column order (Rank_* left empty)"""
+    sums = _segment_sums(frame, 'batter')
+    innings_played = frame.drop_duplicates(['match_id', 'innings', 'batter']).groupby('batter', sort=False, observed=True).size()
+    metrics = _batting_metrics(sums, _dismissal_counts(frame, 'batter'), innings_played)
+    for column in ['Total_Runs_Scored', 'Total_Innings_Played', 'Total_Times_Out']:
+        metrics[column] = metrics[column].astype('int64')
+    return _assemble(sums.index, 'Batter_Name', metrics, BATTING_COLUMNS)
+
+
+def compute_team_table(frame: pd.DataFrame) -> pd.DataFrame:
+    """Per-team metrics in IPL_Team_BattingData_21_24.csv column order (Rank_* left empty)"""
+    sums = _segment_sums(frame, 'batting_team')
+    team_innings = frame.drop_duplicates(['match_id', 'innings', 'batting_team'])
+    innings_played = team_innings.groupby('batting_team', sort=False, observed=True).size()
+    metrics = _batting_metrics(sums, _dismissal_counts(frame, 'batting_team'), innings_played)
+
+    # Average innings totals include extras
+    totals = (
+        frame.assign(total=frame['runs_batter'] + frame['extras'])
+        .groupby(['batting_team', 'match_id', 'innings'], sort=False, observed=True)['total'].sum()
+        .groupby(level=['batting_team', 'innings'], observed=True).mean()
+        .unstack('innings')
+        .reindex(sums.index)
+    )
+    metrics['First.Innings.Average'] = totals.get(1, pd.Series(np.nan, index=sums.index)).to_numpy()
+    metrics['Second.Innings.Average'] = totals.get(2, pd.Series(np.nan, index=sums.index)).to_numpy()
+    return _assemble(sums.index, 'batting_team', metrics, TEAM_COLUMNS)
+
+
+def _vs_bowler_type(frame: pd.DataFrame, key: str) -> pd.DataFrame:
+    legal = frame[frame['ball'] == 1]
+    table = legal.groupby([key, 'bowler_type'], sort=False, observed=True).agg(
+        runs=('runs_batter', 'sum'), balls=('ball', 'sum')
+    ).reset_index()
+    table['strike_rate'] = _ratio(table['runs'], table['balls'], 100)
+    return table
+
+
+def compute_batter_vs_bowler_table(frame: pd.DataFrame) -> pd.DataFrame:
+    """Batters_StrikeRateVSBowlerType.csv: runs, balls and strike rate per batter and bowler type"""
+    table = _vs_bowler_type(frame, 'batter')
+    return pd.DataFrame({
+        'Batter_Name': table['batter'], 'bowler.type': table['bowler_type'],
+        'Runs': table['runs'], 'BallsFaced': table['balls'], 'StrikeRate': table['strike_rate'],
+    })
+
+
+def compute_team_vs_bowler_table(frame: pd.DataFrame) -> pd.DataFrame:
+    """Team_vs_BowlingType.csv: per team and bowling type, plus an 'Overall' row per type"""
+    table = _vs_bowler_type(frame, 'batting_team')
+    overall = _vs_bowler_type(frame.assign(batting_team='Overall'), 'batting_team')
+    table = pd.concat([table, overall], ignore_index=True)
+    return pd.DataFrame({
+        'batting_team': table['batting_team'], 'bowling_type': table['bowler_type'],
+        'total_runs': table['runs'].astype('float64'), 'total_balls': table['balls'].astype('float64'),
+        'strike_rate': table['strike_rate'],
+    })
+
+
+def compute_tables(deliveries: pd.DataFrame) -> Dict[str, pd.DataFrame]:
+    """Recompute every derived batting table from raw deliveries, keyed by CSV filename"""
+    frame = prepare_deliveries(deliveries)
+    return {
+        BATTING_SCHEMA.filename: compute_batting_table(frame),
+        TEAM_SCHEMA.filename: compute_team_table(frame),
+        BATTER_VS_BOWLER_SCHEMA.filename: compute_batter_vs_bowler_table(frame),
+        TEAM_VS_BOWLER_SCHEMA.filename: compute_team_vs_bowler_table(frame),
+    }
+
+
+def write_tables(tables: Dict[str, pd.DataFrame], out_dir: Path):
+    """Write recomputed tables in the same text format the R pipeline produced"""
+    schemas = {schema.filename: schema for schema in [
+        BATTING_SCHEMA, TEAM_SCHEMA, BATTER_VS_BOWLER_SCHEMA, TEAM_VS_BOWLER_SCHEMA
+    ]}
+    for filename, table in tables.items():
+        to_source_format(table, schemas[filename]).to_csv(out_dir / filename, index=False)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Recompute the batting CSVs from ball-by-ball deliveries")
+    parser.add_argument("deliveries", type=Path)
+    parser.add_argument("--out-dir", type=Path, default=Path(__file__).parent / "data")
+    args = parser.parse_args(argv)
+
+    tables = compute_tables(pd.read_csv(args.deliveries))
+    write_tables(tables, args.out_dir)
+    for filename, table in tables.items():
+        print(f"Wrote {len(table)} rows to {args.out_dir / filename}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
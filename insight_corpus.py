@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Curated insight corpus from insights.py, served from a marshal artifact.
+
+`python insight_corpus.py build` executes insights.py once and writes its
+dictionaries to data/insights.marshal. The server never imports insights.py
+at startup: `corpus` loads the artifact on first use (or from warmup() in a
+background thread), and only falls back to importing the module when the
+artifact is missing or was built from a different insights.py or Python.
+"""
+import argparse
+import hashlib
+import importlib
+import marshal
+import os
+import sys
+import threading
+from pathlib import Path
+from typing import Callable, Dict, Optional
+
+SOURCE = Path(__file__).parent / "insights.py"
+ARTIFACT = Path(__file__).parent / "data" / "insights.marshal"
+CORPUS_NAMES = ('PLAYER_INSIGHTS', 'TEAM_INSIGHTS', 'VENUE_INSIGHTS', 'OVERALL_BOWLING_AVERAGES')
+
+
+def source_hash(source: Path = SOURCE) -> str:
+    """Hash of insights.py plus the interpreter tag, since marshal is version specific"""
+    digest = hashlib.sha256(sys.implementation.cache_tag.encode())
+    digest.update(source.read_bytes())
+    return digest.hexdigest()
+
+
+def build_corpus(source: Path = SOURCE, artifact: Path = ARTIFACT) -> Path:
+    """Execute ``source`` and write its insight dictionaries to ``artifact``"""
+    namespace = {}
+    exec(compile(source.read_text(), str(source), "exec"), namespace)
+    payload = {"source_hash": source_hash(source), "tables": {name: namespace[name] for name in CORPUS_NAMES}}
+
+    staging = artifact.with_suffix(".tmp")
+    staging.write_bytes(marshal.dumps(payload))
+    os.replace(staging, artifact)
+    return artifact
+
+
+def load_corpus(source: Path = SOURCE, artifact: Path = ARTIFACT) -> Dict[str, dict]:
+    """The insight dictionaries keyed by name, from the artifact when it is fresh"""
+    try:
+        payload = marshal.loads(artifact.read_bytes())
+        if payload.get("source_hash") == source_hash(source):
+            return payload["tables"]
+        print("Insight corpus artifact is stale, importing insights.py")
+    except FileNotFoundError:
+        print("No insight corpus artifact, importing insights.py")
+    except (ValueError, EOFError, TypeError, KeyError) as e:
+        print(f"Error reading insight corpus artifact: {e}")
+
+    module = importlib.import_module(source.stem)
+    return {name: getattr(module, name) for name in CORPUS_NAMES}
+
+
+class InsightCorpus:
+    """Lazily loaded curated insights; the first attribute access loads them once"""
+
+    def __init__(self, source: Path = SOURCE, artifact: Path = ARTIFACT):
+        self.source = source
+        self.artifact = artifact
+        self._tables: Optional[Dict[str, dict]] = None
+        self._lock = threading.Lock()
+
+    def _get(self, name: str) -> dict:
+        tables = self._tables
+        if tables is None:
+            with self._lock:
+                if self._tables is None:
+                    self._tables = load_corpus(self.source, self.artifact)
+                tables = self._tables
+        return tables[name]
+
+    @property
+    def loaded(self) -> bool:
+        return self._tables is not None
+
+    @property
+    def players(self) -> dict:
+        return self._get('PLAYER_INSIGHTS')
+
+    @property
+    def teams(self) -> dict:
+        return self._get('TEAM_INSIGHTS')
+
+    @property
+    def venues(self) -> dict:
+        return self._get('VENUE_INSIGHTS')
+
+    @property
+    def bowling_averages(self) -> dict:
+        return self._get('OVERALL_BOWLING_AVERAGES')
+
+    def load(self):
+        """Load now, if nothing has yet"""
+        self._get('PLAYER_INSIGHTS')
+
+    def warmup(self, on_loaded: Optional[Callable[[], None]] = None) -> Optional[threading.Thread]:
+        """Load the corpus in a background thread so the first request doesn't pay for it.
+
+        ``on_loaded`` runs in that thread once the corpus is in, so data
+        derived from it can catch up; it isn't called if it was already loaded.
+        """
+        if self.loaded:
+            return None
+
+        def load():
+            self.load()
+            if on_loaded is not None:
+                on_loaded()
+
+        thread = threading.Thread(target=load, name="insight-warmup", daemon=True)
+        thread.start()
+        return thread
+
+
+corpus = InsightCorpus()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build or check the insight corpus artifact")
+    parser.add_argument("command", choices=["build", "check"])
+    parser.add_argument("--artifact", type=Path, default=ARTIFACT)
+    args = parser.parse_args(argv)
+
+    if args.command == "build":
+        print(f"Wrote insight corpus to {build_corpus(artifact=args.artifact)}")
+        return 0
+
+    try:
+        fresh = marshal.loads(args.artifact.read_bytes()).get("source_hash") == source_hash()
+    except (OSError, ValueError, EOFError):
+        fresh = False
+    print("Insight corpus is up to date" if fresh else "Insight corpus is missing or stale")
+    return 0 if fresh else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
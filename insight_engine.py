@@ -0,0 +1,294 @@
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from datasets import VenuePhaseArray
+from ranks import RankConfig, RankTable, qualified_mask
+from venues import venue_id
+
+
+@dataclass(frozen=True)
+class InsightRule:
+    """One metric and the sentences used when an entity is strong or weak on it.
+
+    Templates are str.format strings with ``{value}`` (rounded to 2 dp) and
+    ``{rank}`` (" (Rank: 3/124)", or "" for entities outside the ranked pool).
+    """
+    metric: str
+    high: str
+    low: str
+    lower_is_better: bool = False
+
+
+@dataclass(frozen=True)
+class InsightProfile:
+    """Rules plus how many sentences of each kind to emit and the percentile bands.
+
+    An entity's percentile on a rule is the share of the ranked pool it beats
+    (1.0 = best). Rules at or above ``strength_min`` can be strengths, rules
+    at or below ``weakness_max`` areas for improvement; ai_insights are the
+    most extreme remaining rules, worded by which half they fall in.
+    """
+    rules: List[InsightRule]
+    ai_count: int = 3
+    strength_count: int = 2
+    area_count: int = 2
+    strength_min: float = 0.6
+    weakness_max: float = 0.4
+
+
+# Columns computed from others before the rules run
+DERIVED_METRICS: Dict[str, Callable[[pd.DataFrame], pd.Series]] = {
+    'scoring_ball_percentage': lambda frame: 100 - frame['dot_ball_percentage'],
+    'spin_wicket_percentage': lambda frame: frame['Percentage_Of_wickets_Spin_Bowlers'],
+}
+
+# Venue phase metrics pulled out of the VenuePhaseArray: column -> (phase, innings, metric, scale)
+VENUE_PHASE_METRICS = {
+    'powerplay_runs_per_innings': ('powerplay', 'match', 'Runs_Scored', 0.5),
+    'death_overs_runs_per_innings': ('death', 'match', 'Runs_Scored', 0.5),
+}
+
+PLAYER_PROFILE = InsightProfile(rules=[
+    InsightRule('batting_average',
+                "Excellent batting average of {value} across innings{rank}",
+                "Modest batting average of {value} across innings{rank}"),
+    InsightRule('strike_rate',
+                "Maintains a solid overall strike rate of {value} throughout innings{rank}",
+                "Overall strike rate of {value} is below the league's better batters{rank}"),
+    InsightRule('boundary_percentage',
+                "Strong boundary hitting ability with {value}% of deliveries resulting in boundaries{rank}",
+                "Finds the boundary on only {value}% of deliveries{rank}"),
+    InsightRule('balls_per_boundary',
+                "Impressive boundary frequency hitting a boundary every {value} balls{rank}",
+                "Goes {value} balls between boundaries on average{rank}",
+                lower_is_better=True),
+    InsightRule('scoring_ball_percentage',
+                "Excellent strike rotation ability with {value}% of balls resulting in runs{rank}",
+                "Strike rotation issues with only {value}% of balls resulting in runs{rank}"),
+    InsightRule('dot_ball_percentage',
+                "Keeps dot balls down to {value}% of deliveries{rank}",
+                "Faces a high percentage of dot balls at {value}% limiting scoring opportunities{rank}",
+                lower_is_better=True),
+    InsightRule('strike_rate_vs_pace',
+                "Demonstrates good technique against pace bowling with a strike rate of {value}%{rank}",
+                "Struggles against pace bowling with a strike rate of {value}%{rank}"),
+    InsightRule('strike_rate_vs_spin',
+                "Demonstrates strong technique against spin bowling with a strike rate of {value}%{rank}",
+                "Struggles against spin bowling with a strike rate of {value}%{rank}"),
+    InsightRule('batting_average_1st_innings',
+                "Sets up totals batting first with an average of {value}{rank}",
+                "Shows vulnerability in first innings with an average of {value}{rank}"),
+    InsightRule('batting_average_2nd_innings',
+                "Finisher role, 2nd innings average of {value}{rank}",
+                "Less productive in chases with a 2nd innings average of {value}{rank}"),
+    InsightRule('strike_rate_balls_1_10',
+                "Starts quickly with a strike rate of {value}% over the first 10 balls{rank}",
+                "Slow starter with a strike rate of {value}% over the first 10 balls{rank}"),
+    InsightRule('strike_rate_balls_21_30',
+                "Effectively paces innings during the middle phase (balls 21-30) with a strike rate of {value}%{rank}",
+                "Scoring slows during the middle phase (balls 21-30) with a strike rate of {value}%{rank}"),
+    InsightRule('strike_rate_balls_41_50',
+                "Accelerates when set (balls 41-50) with a strike rate of {value}%{rank}",
+                "Doesn't kick on once set (balls 41-50), striking at {value}%{rank}"),
+])
+
+TEAM_PROFILE = InsightProfile(strength_count=3, area_count=3, ai_count=4, rules=[
+    InsightRule('strike_rate',
+                "Strong overall batting performance (SR: {value}){rank}",
+                "Below-par overall scoring rate (SR: {value}){rank}"),
+    InsightRule('First.Innings.Average',
+                "Excellent first innings scoring (Avg: {value}){rank}",
+                "First innings batting (Avg: {value}){rank}"),
+    InsightRule('Second.Innings.Average',
+                "Good performance in run chases (Avg: {value}){rank}",
+                "Struggles in second innings (Avg: {value}){rank}"),
+    InsightRule('boundary_percentage',
+                "Effective boundary hitting capability (Boundary%: {value}%){rank}",
+                "Boundary hitting (Boundary%: {value}%){rank}"),
+    InsightRule('strike_rate_vs_pace',
+                "Strong performance against pace bowling (SR: {value}){rank}",
+                "Scoring rate against pace (SR vs Pace: {value}){rank}"),
+    InsightRule('strike_rate_vs_spin',
+                "Good performance against spin (SR vs Spin: {value}){rank}",
+                "Scoring rate against spin (SR vs Spin: {value}){rank}"),
+    InsightRule('dot_ball_percentage',
+                "Low dot ball percentage (Dot%: {value}%){rank}",
+                "Higher dot ball percentage (Dot%: {value}%){rank}",
+                lower_is_better=True),
+    InsightRule('non_boundary_strike_rate',
+                "Effective strike rotation (Non-boundary SR: {value}){rank}",
+                "Running between the wickets (Non-boundary SR: {value}){rank}"),
+    InsightRule('batting_average',
+                "Good batting average (Avg: {value}){rank}",
+                "Batting average (Avg: {value}){rank}"),
+])
+
+# Venue insights describe conditions, so every rule yields one sentence
+VENUE_RULES = [
+    InsightRule('Average_Score',
+                "High-scoring venue with average score of {value} runs per innings",
+                "Lower-scoring venue with average of {value} runs per innings"),
+    InsightRule('Boundary_Percentage_per_match',
+                "Good boundary percentage of {value}% favors aggressive batting",
+                "Moderate boundary percentage of {value}% requires patient approach"),
+    InsightRule('Percentage_Of_wickets_Pace_Bowlers',
+                "Pace bowlers dominate with {value}% of wickets",
+                "Balanced bowling conditions with pace taking {value}% of wickets"),
+    InsightRule('spin_wicket_percentage',
+                "Spinners play a major role with {value}% of wickets",
+                "Spin takes only {value}% of wickets here"),
+    InsightRule('powerplay_runs_per_innings',
+                "Strong powerplay scoring with average of {value} runs",
+                "Powerplay scoring average of {value} runs"),
+    InsightRule('death_overs_runs_per_innings',
+                "Death overs average of {value} runs provides finishing opportunities",
+                "Death overs average of {value} runs demands strategic batting"),
+]
+
+
+@dataclass(frozen=True)
+class InsightBook:
+    """Generated insights for every batter, team and venue (by venue ID) in one dataset version"""
+    players: Dict[str, Dict[str, List[str]]]
+    teams: Dict[str, Dict[str, List[str]]]
+    venues: Dict[str, Dict[str, List[str]]]
+    # Batters in the ranked pool; others have generated text but thinner samples
+    qualified_players: frozenset
+    build_seconds: float = 0.0
+
+
+def _with_derived(frame: pd.DataFrame, rules: List[InsightRule]) -> pd.DataFrame:
+    missing = {
+        rule.metric: DERIVED_METRICS[rule.metric](frame)
+        for rule in rules
+        if rule.metric not in frame.columns and rule.metric in DERIVED_METRICS
+    }
+    return frame.assign(**missing) if missing else frame
+
+
+def _table_rows(table: RankTable, keys: List[str]) -> np.ndarray:
+    """Row of each key in ``table``, -1 for keys it doesn't rank"""
+    return np.array([table.key_index.get(key, -1) for key in keys], dtype=np.int64)
+
+
+def _score(frame: pd.DataFrame, rules: List[InsightRule], qualified: np.ndarray,
+           rank_table: Optional[RankTable] = None, rows: Optional[np.ndarray] = None):
+    """Value, percentile (1.0 = best) and rank matrices, entities x rules.
+
+    Ranks of metrics in ``rank_table`` (the Rank_* columns) come from it, so
+    the text agrees with the rank endpoints and honours the tie method; the
+    rest are computed here with "min" ties.
+    """
+    n, r = len(frame), len(rules)
+    values = np.full((n, r), np.nan)
+    percentiles = np.full((n, r), np.nan)
+    ranks = np.zeros((n, r), dtype=np.int64)
+    pools = np.zeros(r, dtype=np.int64)
+
+    for j, rule in enumerate(rules):
+        if rule.metric not in frame.columns:
+            continue
+        column = frame[rule.metric].to_numpy('float64')
+        score = -column if rule.lower_is_better else column
+        pool = np.sort(score[qualified & ~np.isnan(score)])
+        if not len(pool):
+            continue
+        worse = np.searchsorted(pool, score, side='left')
+        better = len(pool) - np.searchsorted(pool, score, side='right')
+        in_pool = (qualified & ~np.isnan(score)).astype(np.int64)
+        others = np.maximum(len(pool) - in_pool, 1)
+
+        values[:, j] = column
+        percentiles[:, j] = np.where(np.isnan(score), np.nan, worse / others)
+        ranks[:, j] = np.where(in_pool == 1, better + 1, 0)
+        pools[j] = len(pool)
+
+        col = rank_table.metric_index.get(rule.metric) if rank_table is not None else None
+        if col is not None:
+            table_ranks = np.where(rows >= 0, rank_table.ranks[rows, col], np.nan)
+            ranks[:, j] = np.nan_to_num(table_ranks, nan=0).astype(np.int64)
+            pools[j] = rank_table.pool_sizes[col]
+    return values, percentiles, ranks, pools
+
+
+def _format(rule: InsightRule, strong: bool, value: float, rank: int, pool: int) -> str:
+    template = rule.high if strong else rule.low
+    rank_text = f" (Rank: {rank}/{pool})" if rank else ""
+    return template.format(value=f"{value:.2f}".rstrip('0').rstrip('.'), rank=rank_text)
+
+
+def _entity_insights(profile: InsightProfile, values, percentiles, ranks, pools, i) -> Dict[str, List[str]]:
+    p = percentiles[i]
+    order = [j for j in np.argsort(-np.nan_to_num(p, nan=-1.0)).tolist() if not np.isnan(p[j])]
+
+    strengths = [j for j in order if p[j] >= profile.strength_min][:profile.strength_count]
+    areas = [j for j in reversed(order) if p[j] <= profile.weakness_max][:profile.area_count]
+    used = set(strengths) | set(areas)
+    extremes = sorted((j for j in order if j not in used), key=lambda j: -abs(p[j] - 0.5))
+    ai = extremes[:profile.ai_count]
+
+    def text(j):
+        return _format(profile.rules[j], p[j] >= 0.5, values[i, j], ranks[i, j], pools[j])
+
+    return {
+        "ai_insights": [text(j) for j in ai],
+        "strengths": [text(j) for j in strengths],
+        "areas_for_improvement": [text(j) for j in areas],
+    }
+
+
+def generate_insights(frame: pd.DataFrame, key_column: str, profile: InsightProfile,
+                      qualified: Optional[np.ndarray] = None,
+                      rank_table: Optional[RankTable] = None) -> Dict[str, Dict[str, List[str]]]:
+    """ai_insights / strengths / areas_for_improvement for every row of ``frame``"""
+    frame = _with_derived(frame, profile.rules)
+    if qualified is None:
+        qualified = np.ones(len(frame), dtype=bool)
+    keys = frame[key_column].astype(str).tolist()
+    rows = _table_rows(rank_table, keys) if rank_table is not None else None
+    values, percentiles, ranks, pools = _score(frame, profile.rules, qualified, rank_table, rows)
+    return {
+        key: _entity_insights(profile, values, percentiles, ranks, pools, i)
+        for i, key in enumerate(keys)
+    }
+
+
+def generate_venue_insights(frame: pd.DataFrame, rules: List[InsightRule] = VENUE_RULES) -> Dict[str, Dict[str, List[str]]]:
+    """One condition sentence per rule for every venue, worded by which half it falls in"""
+    frame = _with_derived(frame, rules)
+    values, percentiles, _, _ = _score(frame, rules, np.ones(len(frame), dtype=bool))
+    venues = {}
+    for i, venue in enumerate(frame['venue'].astype(str).tolist()):
+        venues[venue_id(venue)] = {"insights": [
+            _format(rule, percentiles[i, j] >= 0.5, values[i, j], 0, 0)
+            for j, rule in enumerate(rules)
+            if not np.isnan(percentiles[i, j])
+        ]}
+    return venues
+
+
+def build_insight_book(batting_data: Optional[pd.DataFrame], team_data: Optional[pd.DataFrame],
+                       venue_data: Optional[pd.DataFrame], venue_phases: Optional[VenuePhaseArray],
+                       rank_config: RankConfig, batting_ranks: Optional[RankTable] = None,
+                       team_ranks: Optional[RankTable] = None) -> InsightBook:
+    """Generate insights for every batter, team and venue in one batch; rank text comes from the RankTables"""
+    start = time.perf_counter()
+    players, teams, venues, qualified_players = {}, {}, {}, frozenset()
+    if batting_data is not None:
+        qualified = qualified_mask(batting_data, rank_config)
+        players = generate_insights(batting_data, 'Batter_Name', PLAYER_PROFILE, qualified, batting_ranks)
+        qualified_players = frozenset(batting_data.loc[qualified, 'Batter_Name'].astype(str))
+    if team_data is not None:
+        teams = generate_insights(team_data, 'batting_team', TEAM_PROFILE, rank_table=team_ranks)
+    if venue_data is not None:
+        if venue_phases is not None:
+            venue_data = venue_data.assign(**{
+                column: venue_phases.column(phase, innings, metric).astype('float64') * scale
+                for column, (phase, innings, metric, scale) in VENUE_PHASE_METRICS.items()
+            })
+        venues = generate_venue_insights(venue_data)
+    return InsightBook(players, teams, venues, qualified_players, time.perf_counter() - start)
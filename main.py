@@ -1,71 +1,84 @@
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Header, Request, Body
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
-import pandas as pd
+from fastapi.responses import PlainTextResponse
 import json
-from typing import List, Dict, Any, Optional
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Union
 import os
 import sys
+import signal
 from pathlib import Path
 from contextlib import asynccontextmanager
-from insights import PLAYER_INSIGHTS, TEAM_INSIGHTS, VENUE_INSIGHTS, OVERALL_BOWLING_AVERAGES
+import asyncio
+import hmac
+from insight_corpus import corpus
 from config import settings
+from data_store import DatasetStore
+from datasets import TEAM_SCATTER_COLUMNS, scatter_points, team_scatter_points
+from ranks import RankConfig
+from response_cache import CachedResponse, ResponseCache
+from fast_json import NumpyJSONResponse, loads
+from batch import BatchDispatcher, parse_sub_requests
+from offload import Offloader
+from single_flight import SingleFlight
+from metrics import Metrics, MetricsMiddleware
+from profiler import ProfilingMiddleware, RequestProfiler
+from result_cache import ResultCache, canonical_names
+from matchup import Bowler, MAX_OVERS_PER_BOWLER, PHASE_OVERS, plan_overs
 import uvicorn
 
-# Global variables for data
-batting_data = None
-team_data = None
-batter_vs_bowler_data = None
-team_vs_bowler_data = None
-venue_data = None
+# Data directory path
+DATA_DIR = Path(__file__).parent / "data"
+
+# Current dataset; reloads swap in a new immutable Dataset atomically
+store = DatasetStore(
+    DATA_DIR,
+    use_snapshot=settings.USE_DATA_SNAPSHOT,
+    rank_config=RankConfig(
+        min_innings=settings.RANK_MIN_INNINGS,
+        min_balls=settings.RANK_MIN_BALLS,
+        tie_method=settings.RANK_TIE_METHOD
+    ),
+    # Squad lists and curated insight names are searchable alongside the CSVs. Called on
+    # every reload, so the corpus is only read once warmup has loaded it; the warmup
+    # then refreshes the search index (lifespan)
+    extra_player_names=lambda: [name for players in TEAM_PLAYERS.values() for name in players] + (
+        list(corpus.players) if corpus.loaded else [])
+)
+
+# Blocking pandas/numpy work runs here rather than on the event loop
+offload = Offloader(settings.OFFLOAD_THREADS, settings.OFFLOAD_PROCESSES, settings.OFFLOAD_QUEUE_LIMIT)
+# Identical expensive requests arriving together share one computation
+flight = SingleFlight()
+
+def flight_key(data, route: str, *params):
+    return (data.version, data.generation, route, *params)
+
+# Payloads of parameterized endpoints, keyed on canonical parameters
+results = ResultCache(settings.RESULT_CACHE_ENTRIES, settings.RESULT_CACHE_MB * 1024 * 1024)
+store.subscribe(results.on_dataset)
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # Startup
-    global batting_data, team_data, batter_vs_bowler_data, team_vs_bowler_data, venue_data
+    corpus.warmup(on_loaded=store.refresh_player_search)
+    offload.start()
+    if settings.PROFILE_SAMPLE_RATE or settings.PROFILE_SLOW_MS or settings.ADMIN_TOKEN:
+        profiler.start()
     try:
-        print(f"Loading data from: {Path(__file__).parent / 'data'}")
-        data_dir = Path(__file__).parent / "data"
-        print(f"Data directory exists: {data_dir.exists()}")
-        
-        if data_dir.exists():
-            try:
-                batting_data = pd.read_csv(data_dir / "IPL_21_24_Batting.csv")
-                print("Loaded batting data successfully")
-            except Exception as e:
-                print(f"Error loading batting data: {e}")
-            
-            try:
-                team_data = pd.read_csv(data_dir / "IPL_Team_BattingData_21_24.csv")
-                print("Loaded team data successfully")
-            except Exception as e:
-                print(f"Error loading team data: {e}")
-            
-            try:
-                batter_vs_bowler_data = pd.read_csv(data_dir / "Batters_StrikeRateVSBowlerType.csv")
-                print("Loaded batter vs bowler data successfully")
-            except Exception as e:
-                print(f"Error loading batter vs bowler data: {e}")
-            
-            try:
-                team_vs_bowler_data = pd.read_csv(data_dir / "Team_vs_BowlingType.csv")
-                print("Loaded team vs bowler data successfully")
-            except Exception as e:
-                print(f"Error loading team vs bowler data: {e}")
-            
-            try:
-                venue_data = pd.read_csv(data_dir / "IPL_Venue_details.csv")
-                print("Loaded venue data successfully")
-            except Exception as e:
-                print(f"Error loading venue data: {e}")
-        else:
-            print("Data directory not found, using hardcoded data only")
+        # A no-op in prefork workers (serve.py), which inherit the parent's loaded dataset
+        store.reload()
+        # Under serve.py the parent watches the files and re-forks the workers
+        if not settings.PREFORK_PARENT:
+            store.start_watching(settings.DATA_WATCH_INTERVAL)
     except Exception as e:
         print(f"Error during startup: {e}")
         print("Continuing with hardcoded data only")
     
     yield
     # Shutdown
+    store.stop_watching()
+    offload.shutdown()
+    profiler.stop()
     print("Application shutting down")
 
 app = FastAPI(title="IPL Opposition Planning API", version="1.0.0", lifespan=lifespan)
@@ -79,6 +92,29 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+def is_admin_token(token: Optional[str]) -> bool:
+    """Whether ``token`` is the configured admin token, compared in constant time"""
+    return bool(settings.ADMIN_TOKEN) and token is not None and hmac.compare_digest(
+        token.encode(), settings.ADMIN_TOKEN.encode())
+
+# Per-request sampling profiles: forced by admins, sampled at random, or taken from slow requests
+profiler = RequestProfiler(
+    Path(settings.PROFILE_DIR), settings.PROFILE_RING_SIZE, settings.PROFILE_INTERVAL_MS / 1000,
+    settings.PROFILE_SAMPLE_RATE, settings.PROFILE_SLOW_MS / 1000,
+)
+app.add_middleware(
+    ProfilingMiddleware, profiler=profiler,
+    authorize=lambda headers: is_admin_token(headers.get("x-admin-token")),
+)
+
+# Per-route latency histograms and counters, served on /metrics
+metrics = Metrics()
+app.add_middleware(MetricsMiddleware, metrics=metrics)
+store.subscribe(metrics.on_dataset)
+metrics.export("single_flight", flight.stats, counters=("calls", "computed", "coalesced"), gauges=("in_flight",))
+metrics.export("result_cache", results.stats, counters=("hits", "misses", "evictions", "bypassed"),
+               gauges=("entries", "bytes"))
+
 # Team players mapping
 TEAM_PLAYERS = {
     'Chennai Super Kings': [
@@ -147,8 +183,13 @@ VENUES = [
     "Bharat Ratna Shri Atal Bihari Vajpayee Ekana Cricket Stadium, Lucknow"
 ]
 
-# Data directory path
-DATA_DIR = Path(__file__).parent / "data"
+# The 15 key players always shown on the scatter plot
+KEY_SCATTER_PLAYERS = [
+    'Shubman Gill', 'Faf du Plessis', 'Ruturaj Gaikwad', 'Virat Kohli',
+    'KL Rahul', 'Jos Buttler', 'Sanju Samson', 'Shikhar Dhawan',
+    'Suryakumar Yadav', 'Yashasvi Jaiswal', 'Ishan Kishan', 'Rohit Sharma',
+    'Shivam Dube', 'Venkatesh Iyer', 'David Warner'
+]
 
 @app.get("/")
 async def root():
@@ -161,22 +202,33 @@ async def health_check():
 @app.get("/debug")
 async def debug_info():
     """Debug endpoint to check deployment status"""
+    data = store.current
     return {
         "status": "running",
         "environment": settings.ENVIRONMENT,
         "host": settings.HOST,
         "port": settings.PORT,
         "data_loaded": {
-            "batting_data": batting_data is not None,
-            "team_data": team_data is not None,
-            "batter_vs_bowler_data": batter_vs_bowler_data is not None,
-            "team_vs_bowler_data": team_vs_bowler_data is not None,
-            "venue_data": venue_data is not None
+            "batting_data": data.batting_data is not None,
+            "team_data": data.team_data is not None,
+            "batter_vs_bowler_data": data.batter_vs_bowler_data is not None,
+            "team_vs_bowler_data": data.team_vs_bowler_data is not None,
+            "venue_data": data.venue_data is not None
         },
+        "data_version": data.version,
+        "data_generation": data.generation,
         "data_dir_exists": DATA_DIR.exists(),
+        "offload": offload.stats(),
+        "single_flight": flight.stats(),
+        "result_cache": results.stats(),
         "python_version": sys.version
     }
 
+@app.get("/metrics")
+async def get_metrics():
+    """Prometheus text exposition of this process's request and lookup metrics"""
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
 @app.get("/config")
 async def get_config():
     """Get API configuration"""
@@ -186,31 +238,118 @@ async def get_config():
         "version": "1.0.0"
     }
 
+def require_admin(x_admin_token: Optional[str]):
+    """Reject requests that don't carry the configured admin token"""
+    if not settings.ADMIN_TOKEN:
+        raise HTTPException(status_code=403, detail="Admin endpoints are disabled")
+    if not is_admin_token(x_admin_token):
+        raise HTTPException(status_code=401, detail="Invalid admin token")
+
+@app.post("/admin/reload")
+async def reload_data(force: bool = False, x_admin_token: Optional[str] = Header(None)):
+    """Rebuild the dataset from the data directory and swap it in without a restart"""
+    require_admin(x_admin_token)
+    if settings.PREFORK_PARENT:
+        # Reloading here would refresh only this worker; the serve.py parent
+        # reloads once and re-forks every worker onto the new dataset
+        os.kill(settings.PREFORK_PARENT, signal.SIGUSR1 if force else signal.SIGHUP)
+        data = store.current
+        return {"reloaded": "scheduled", "data_version": data.version, "data_generation": data.generation}
+    previous = store.current
+    # Build off the event loop; in-flight requests keep using the old Dataset
+    data = await asyncio.to_thread(store.reload, force)
+    return {
+        "reloaded": data is not previous,
+        "data_version": data.version,
+        "data_generation": data.generation
+    }
+
+@app.get("/admin/profiles")
+async def list_profiles(x_admin_token: Optional[str] = Header(None)):
+    """Stored request profiles, newest first"""
+    require_admin(x_admin_token)
+    return {"profiles": profiler.profiles()}
+
+@app.get("/admin/profiles/{profile_id}")
+async def get_profile(profile_id: str, x_admin_token: Optional[str] = Header(None)):
+    """One profile as collapsed stacks, for flamegraph.pl or speedscope"""
+    require_admin(x_admin_token)
+    stacks = profiler.read(profile_id)
+    if stacks is None:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    return PlainTextResponse(stacks)
+
+# Serialized bodies of the endpoints that only change when the dataset does
+responses = ResponseCache()
+
+def team_insights_payload(data, team_name: str) -> Optional[Dict]:
+    if data.insights and team_name in data.insights.teams:
+        return {"team": team_name, "insights": data.insights.teams[team_name]}
+    if team_name in corpus.teams:
+        return {
+            "team": team_name,
+            "insights": corpus.teams[team_name]
+        }
+    return None
+
+def static_payloads(data) -> Dict[str, Any]:
+    """Builders for every cacheable response under ``data``, keyed by path"""
+    payloads = {
+        "/teams": lambda: {"teams": list(TEAM_PLAYERS.keys())},
+        "/venues": lambda: {"venues": VENUES},
+        "/team-scatter-plot-data": lambda: team_scatter_payload(data),
+    }
+    for team in TEAM_PLAYERS:
+        payloads[f"/teams/{team}/players"] = lambda team=team: {"team": team, "players": TEAM_PLAYERS[team]}
+    # Primed on every reload, so no blocking corpus load here; refresh_player_search
+    # swaps in a new generation once the warmup is done, which primes these too
+    teams = set(corpus.teams if corpus.loaded else ()) | set(data.insights.teams if data.insights else ())
+    for team in teams:
+        payloads[f"/team/{team}/insights"] = lambda team=team: team_insights_payload(data, team)
+    return payloads
+
+# Serialize the new dataset's responses as soon as it goes live
+store.subscribe(lambda data: responses.prime(data, static_payloads(data)))
+
 @app.get("/teams")
-async def get_teams():
+async def get_teams(request: Request):
     """Get all IPL teams"""
-    return {"teams": list(TEAM_PLAYERS.keys())}
+    return responses.respond(request, store.current, "/teams", lambda: {"teams": list(TEAM_PLAYERS.keys())})
 
 @app.get("/teams/{team_name}/players")
-async def get_team_players(team_name: str):
+async def get_team_players(team_name: str, request: Request):
     """Get players for a specific team"""
     if team_name not in TEAM_PLAYERS:
         raise HTTPException(status_code=404, detail="Team not found")
-    return {"team": team_name, "players": TEAM_PLAYERS[team_name]}
+    return responses.respond(request, store.current, f"/teams/{team_name}/players",
+                             lambda: {"team": team_name, "players": TEAM_PLAYERS[team_name]})
 
 @app.get("/venues")
-async def get_venues():
+async def get_venues(request: Request):
     """Get all venues"""
-    return {"venues": VENUES}
+    return responses.respond(request, store.current, "/venues", lambda: {"venues": VENUES})
 
-@app.get("/player/{player_name}/insights")
-async def get_player_insights(player_name: str):
-    """Get insights for a specific player"""
-    if player_name in PLAYER_INSIGHTS:
+@app.get("/players/search")
+async def search_players(q: str = "", limit: int = 10):
+    """Search every known player name by prefix, surname prefix or close spelling"""
+    index = store.current.player_search
+    return {"query": q, "results": index.search(q, limit) if index else []}
+
+@metrics.timed("player_insights")
+def player_insights_payload(data, player_name: str) -> Dict:
+    """Insights for one player, from generated text, the curated corpus or a default"""
+    insights = data.insights
+    # Generated text for batters with a ranked sample, then the curated entries
+    # (which also cover bowlers), then generated text from thin samples
+    if insights and player_name in insights.qualified_players:
+        return {"player": player_name, "insights": insights.players[player_name]}
+    if player_name in corpus.players:
         return {
             "player": player_name,
-            "insights": PLAYER_INSIGHTS[player_name]
+            "insights": corpus.players[player_name]
         }
+    if insights and player_name in insights.players:
+        return {"player": player_name, "insights": insights.players[player_name]}
     else:
         # Generate default insights for players not in hardcoded data
         return {
@@ -232,24 +371,40 @@ async def get_player_insights(player_name: str):
             }
         }
 
+@app.get("/player/{player_name}/insights")
+async def get_player_insights(player_name: str):
+    """Get insights for a specific player"""
+    return player_insights_payload(store.current, player_name)
+
 @app.get("/team/{team_name}/insights")
-async def get_team_insights(team_name: str):
+async def get_team_insights(team_name: str, request: Request):
     """Get insights for a specific team"""
-    if team_name in TEAM_INSIGHTS:
-        return {
-            "team": team_name,
-            "insights": TEAM_INSIGHTS[team_name]
-        }
-    else:
+    data = store.current
+    payload = team_insights_payload(data, team_name)
+    if payload is None:
         raise HTTPException(status_code=404, detail="Team insights not found")
+    return responses.respond(request, data, f"/team/{team_name}/insights", lambda: payload)
 
-@app.get("/venue/{venue_name}/insights")
-async def get_venue_insights(venue_name: str):
-    """Get insights for a specific venue"""
-    if venue_name in VENUE_INSIGHTS:
+@app.post("/venues/resolve")
+async def resolve_venues(names: List[str]):
+    """Resolve any spellings of venue names to canonical venue IDs in one call"""
+    resolver = store.current.venue_resolver
+    ids = resolver.resolve_many(names) if resolver else [None] * len(names)
+    return {"venues": [
+        {"name": name, "venue_id": venue, "canonical_name": resolver.name_of(venue) if venue else None}
+        for name, venue in zip(names, ids)
+    ]}
+
+def venue_insights_payload(data, venue_name: str) -> Dict:
+    """Insights for one venue under any spelling, from generated text, the curated corpus or a default"""
+    venue = data.venue_resolver.resolve(venue_name) if data.venue_resolver else None
+    if venue and data.insights and venue in data.insights.venues:
+        return {"venue": venue_name, "venue_id": venue, "insights": data.insights.venues[venue]}
+    canonical = data.venue_resolver.name_of(venue) if venue else venue_name
+    if canonical in corpus.venues:
         return {
             "venue": venue_name,
-            "insights": VENUE_INSIGHTS[venue_name]
+            "insights": corpus.venues[canonical]
         }
     else:
         # Generate default venue insights
@@ -266,10 +421,76 @@ async def get_venue_insights(venue_name: str):
             }
         }
 
+@app.get("/venue/{venue_name}/insights")
+async def get_venue_insights(venue_name: str):
+    """Get insights for a specific venue"""
+    return venue_insights_payload(store.current, venue_name)
+
+@metrics.timed("team_dossier")
+def team_dossier_payload(data, team_name: str, venue_name: Optional[str] = None) -> Dict:
+    """Everything the opposition page shows for one squad, built in one pass"""
+    players = TEAM_PLAYERS[team_name]
+    weakest = (data.bowler_type_matrix.weakest_bowler_types(players)
+               if data.bowler_type_matrix is not None else {})
+    team_insights = team_insights_payload(data, team_name)
+    team_bowling = team_bowling_payload(data, team_name)
+
+    dossier = {
+        "team": team_name,
+        "data_version": data.version,
+        "insights": team_insights["insights"] if team_insights else None,
+        "bowling_stats": team_bowling["bowling_stats"],
+        # Shared by every player entry, so sent once
+        "overall_averages": {
+            "team": overall_bowling_averages("team"),
+            "batter": overall_bowling_averages("batter"),
+        },
+        "players": [
+            {
+                "name": player,
+                "insights": player_insights_payload(data, player)["insights"],
+                "bowling_stats": player_bowling_payload(data, player)["bowling_stats"],
+                "weakest_bowler_type": weakest.get(player),
+            }
+            for player in players
+        ],
+    }
+    if venue_name:
+        # Canonical name, so every spelling of a venue yields the same body
+        venue_id = data.venue_resolver.resolve(venue_name) if data.venue_resolver else None
+        venue = venue_insights_payload(data, data.venue_resolver.name_of(venue_id) if venue_id else venue_name)
+        venue_id = venue.get("venue_id")
+        venue["phases"] = data.venue_phases.phase_stats(venue_id) if venue_id and data.venue_phases else None
+        dossier["venue"] = venue
+    return dossier
+
+async def cached_entry(data, key: str, build: Callable[[], Any]) -> CachedResponse:
+    """``key``'s cached body; a miss is built once on the thread pool however many requests wait for it"""
+    return responses.lookup(data, key) or await flight.do(
+        flight_key(data, key), lambda: offload.cpu(responses.get, data, key, build))
+
+async def team_dossier(data, team_name: str, venue: Optional[str]) -> Union[CachedResponse, Dict]:
+    """The cached dossier body, or a fresh payload when ``venue`` doesn't resolve"""
+    venue_id = data.venue_resolver.resolve(venue) if venue and data.venue_resolver else None
+    if venue and venue_id is None:
+        # Not cached: every unresolvable spelling would add an entry that lives as long as the dataset
+        return await offload.cpu(team_dossier_payload, data, team_name, venue)
+    return await cached_entry(data, f"/team/{team_name}/dossier?venue={venue_id or ''}",
+                              lambda: team_dossier_payload(data, team_name, venue))
+
+@app.get("/team/{team_name}/dossier")
+async def get_team_dossier(team_name: str, request: Request, venue: Optional[str] = None):
+    """Get the whole opposition page for a team (squad, insights, bowling matchups, optional venue) in one call"""
+    if team_name not in TEAM_PLAYERS:
+        raise HTTPException(status_code=404, detail="Team not found")
+    dossier = await team_dossier(store.current, team_name, venue)
+    return responses.send(request, dossier) if isinstance(dossier, CachedResponse) else dossier
+
 @app.get("/scatter-plot-data")
 async def get_scatter_plot_data(selected_players: str = ""):
     """Get scatter plot data for players"""
-    if batting_data is None:
+    data = store.current
+    if data.scatter_frame is None:
         # Return hardcoded data if CSV not loaded
         key_players_data = [
             {'name': 'Shubman Gill', 'first_innings_avg': 45.2, 'second_innings_avg': 38.5, 'first_innings_sr': 142.8, 'second_innings_sr': 135.2},
@@ -303,47 +524,29 @@ async def get_scatter_plot_data(selected_players: str = ""):
                     'second_innings_sr': 130.0 + (len(player) % 12)
                 })
         
-        return {"scatter_data": key_players_data}
-    
-    # Define the 15 key players for scatter plot
-    key_players = [
-        'Shubman Gill', 'Faf du Plessis', 'Ruturaj Gaikwad', 'Virat Kohli',
-        'KL Rahul', 'Jos Buttler', 'Sanju Samson', 'Shikhar Dhawan',
-        'Suryakumar Yadav', 'Yashasvi Jaiswal', 'Ishan Kishan', 'Rohit Sharma',
-        'Shivam Dube', 'Venkatesh Iyer', 'David Warner'
-    ]
-    
-    # Parse selected players
-    selected_player_list = selected_players.split(',') if selected_players else []
-    selected_player_list = [p.strip() for p in selected_player_list if p.strip()]
+        return NumpyJSONResponse({"scatter_data": key_players_data})
     
+    selected = canonical_selection(data, selected_players)
+    payload = await flight.do(flight_key(data, "/scatter-plot-data", selected),
+                              lambda: offload.cpu(scatter_payload, data, selected_players))
+    return NumpyJSONResponse(payload)
+
+def canonical_selection(data, selected_players: str) -> tuple:
+    """Selected players as a trimmed, deduplicated, sorted tuple of canonical names"""
+    resolve = data.player_search.canonical if data.player_search else None
+    return canonical_names(selected_players.split(','), resolve)
+
+@results.cached("/scatter-plot-data", lambda data, selected_players: (canonical_selection(data, selected_players),))
+@metrics.timed("scatter_payload")
+def scatter_payload(data, selected_player_list: tuple) -> Dict:
+    """Key players plus the selected ones, from the loaded scatter frame"""
     # Combine key players with selected players
-    all_players_to_show = list(set(key_players + selected_player_list))
+    all_players_to_show = set(KEY_SCATTER_PLAYERS) | set(selected_player_list)
     
-    scatter_data = []
-    for _, row in batting_data.iterrows():
-        if row['Batter_Name'] in all_players_to_show:
-            # Convert strike rate strings to float values
-            first_sr = row['strike_rate_1st_innings']
-            second_sr = row['strike_rate_2nd_innings']
-            
-            # Remove % symbol and convert to float
-            if isinstance(first_sr, str) and first_sr.endswith('%'):
-                first_sr = float(first_sr.replace('%', ''))
-            if isinstance(second_sr, str) and second_sr.endswith('%'):
-                second_sr = float(second_sr.replace('%', ''))
-                
-            scatter_data.append({
-                'name': row['Batter_Name'],
-                'first_innings_avg': float(row['batting_average_1st_innings']) if row['batting_average_1st_innings'] else 0,
-                'second_innings_avg': float(row['batting_average_2nd_innings']) if row['batting_average_2nd_innings'] else 0,
-                'first_innings_sr': float(first_sr) if first_sr else 0,
-                'second_innings_sr': float(second_sr) if second_sr else 0,
-                'isSelected': row['Batter_Name'] in selected_player_list
-            })
+    scatter_data = scatter_points(data.scatter_frame, all_players_to_show, selected_player_list)
     
     # Add any selected players not found in the data with default values
-    found_players = [p['name'] for p in scatter_data]
+    found_players = {p['name'] for p in scatter_data}
     for player in selected_player_list:
         if player not in found_players:
             scatter_data.append({
@@ -357,29 +560,81 @@ async def get_scatter_plot_data(selected_players: str = ""):
     
     return {"scatter_data": scatter_data}
 
+TEAM_SCATTER_FALLBACK = [
+    {"name": "Chennai Super Kings", "first_innings_avg": 173.59, "second_innings_avg": 152.45, "first_innings_sr": 144.27, "second_innings_sr": 134.38},
+    {"name": "Mumbai Indians", "first_innings_avg": 170.25, "second_innings_avg": 151.25, "first_innings_sr": 140.05, "second_innings_sr": 138.75},
+    {"name": "Royal Challengers Bangalore", "first_innings_avg": 175.85, "second_innings_avg": 146.75, "first_innings_sr": 142.15, "second_innings_sr": 135.25},
+    {"name": "Kolkata Knight Riders", "first_innings_avg": 169.44, "second_innings_avg": 149.25, "first_innings_sr": 141.33, "second_innings_sr": 134.38},
+    {"name": "Delhi Capitals", "first_innings_avg": 166.58, "second_innings_avg": 151.18, "first_innings_sr": 137.81, "second_innings_sr": 135.23},
+    {"name": "Punjab Kings", "first_innings_avg": 168.25, "second_innings_avg": 148.50, "first_innings_sr": 136.75, "second_innings_sr": 134.25},
+    {"name": "Rajasthan Royals", "first_innings_avg": 165.25, "second_innings_avg": 159.75, "first_innings_sr": 139.85, "second_innings_sr": 137.25},
+    {"name": "Sunrisers Hyderabad", "first_innings_avg": 167.50, "second_innings_avg": 154.25, "first_innings_sr": 139.25, "second_innings_sr": 136.75},
+    {"name": "Gujarat Titans", "first_innings_avg": 164.75, "second_innings_avg": 157.75, "first_innings_sr": 138.50, "second_innings_sr": 135.60},
+    {"name": "Lucknow Super Giants", "first_innings_avg": 170.17, "second_innings_avg": 150.81, "first_innings_sr": 135.25, "second_innings_sr": 133.75}
+]
+
+# Axes used when a request picks only one of x / y
+TEAM_SCATTER_DEFAULT_AXES = ("First.Innings.Average", "strike_rate_1st_innings")
+
+def team_scatter_axes(data, x: Optional[str], y: Optional[str]) -> Optional[Dict[str, str]]:
+    """Output field -> team column for a scatter request, None for the classic four-field payload"""
+    if x is None and y is None:
+        return None
+    axes = {"x": x or TEAM_SCATTER_DEFAULT_AXES[0], "y": y or TEAM_SCATTER_DEFAULT_AXES[1]}
+    frame = data.team_scatter_frame
+    available = list(frame.columns) if frame is not None else []
+    unknown = [metric for metric in axes.values() if metric not in available]
+    if unknown:
+        raise HTTPException(status_code=422, detail=f"Unknown team metrics {unknown}, expected one of {available}")
+    return axes
+
+def team_scatter_payload(data, axes: Optional[Dict[str, str]] = None) -> Dict:
+    """Scatter plot data for teams, computed from the team table"""
+    frame = data.team_scatter_frame
+    if axes is None:
+        if frame is None:
+            return {"team_scatter_data": TEAM_SCATTER_FALLBACK}
+        return {"team_scatter_data": team_scatter_points(frame, TEAM_SCATTER_COLUMNS)}
+    return {"x_metric": axes["x"], "y_metric": axes["y"], "team_scatter_data": team_scatter_points(frame, axes)}
+
+async def team_scatter(data, x: Optional[str], y: Optional[str]) -> CachedResponse:
+    axes = team_scatter_axes(data, x, y)
+    # Cached per dataset version, so each metric pair is computed once
+    key = "/team-scatter-plot-data" if axes is None else f"/team-scatter-plot-data?x={axes['x']}&y={axes['y']}"
+    return await cached_entry(data, key, lambda: team_scatter_payload(data, axes))
+
 @app.get("/team-scatter-plot-data")
-async def get_team_scatter_plot_data():
-    """Get scatter plot data for teams"""
-    # Hardcoded team data for scatter plot
-    team_scatter_data = [
-        {"name": "Chennai Super Kings", "first_innings_avg": 173.59, "second_innings_avg": 152.45, "first_innings_sr": 144.27, "second_innings_sr": 134.38},
-        {"name": "Mumbai Indians", "first_innings_avg": 170.25, "second_innings_avg": 151.25, "first_innings_sr": 140.05, "second_innings_sr": 138.75},
-        {"name": "Royal Challengers Bangalore", "first_innings_avg": 175.85, "second_innings_avg": 146.75, "first_innings_sr": 142.15, "second_innings_sr": 135.25},
-        {"name": "Kolkata Knight Riders", "first_innings_avg": 169.44, "second_innings_avg": 149.25, "first_innings_sr": 141.33, "second_innings_sr": 134.38},
-        {"name": "Delhi Capitals", "first_innings_avg": 166.58, "second_innings_avg": 151.18, "first_innings_sr": 137.81, "second_innings_sr": 135.23},
-        {"name": "Punjab Kings", "first_innings_avg": 168.25, "second_innings_avg": 148.50, "first_innings_sr": 136.75, "second_innings_sr": 134.25},
-        {"name": "Rajasthan Royals", "first_innings_avg": 165.25, "second_innings_avg": 159.75, "first_innings_sr": 139.85, "second_innings_sr": 137.25},
-        {"name": "Sunrisers Hyderabad", "first_innings_avg": 167.50, "second_innings_avg": 154.25, "first_innings_sr": 139.25, "second_innings_sr": 136.75},
-        {"name": "Gujarat Titans", "first_innings_avg": 164.75, "second_innings_avg": 157.75, "first_innings_sr": 138.50, "second_innings_sr": 135.60},
-        {"name": "Lucknow Super Giants", "first_innings_avg": 170.17, "second_innings_avg": 150.81, "first_innings_sr": 135.25, "second_innings_sr": 133.75}
-    ]
-    
-    return {"team_scatter_data": team_scatter_data}
+async def get_team_scatter_plot_data(request: Request, x: Optional[str] = None, y: Optional[str] = None):
+    """Get scatter plot data for teams; ``x`` and ``y`` pick any numeric team column as axes"""
+    return responses.send(request, await team_scatter(store.current, x, y))
 
-@app.get("/player/{player_name}/bowling-stats")
-async def get_player_bowling_stats(player_name: str):
-    """Get player stats against different bowling types"""
-    if batter_vs_bowler_data is None:
+# League strike rates by bowling type, used when the curated corpus has none
+DEFAULT_OVERALL_AVERAGES = {
+    "batter": {
+        "Left arm pace": 128.5,
+        "Right arm pace": 127.2,
+        "Off spin": 118.3,
+        "Leg spin": 122.1,
+        "Slow left arm orthodox": 112.8,
+        "Left arm wrist spin": 120.4
+    },
+    "team": {
+        "Left arm pace": 133.2,
+        "Right arm pace": 130.8,
+        "Off spin": 123.5,
+        "Leg spin": 126.7,
+        "Slow left arm orthodox": 118.9,
+        "Left arm wrist spin": 124.3
+    },
+}
+
+def overall_bowling_averages(kind: str) -> Dict:
+    """League averages against each bowling type for ``kind`` ("batter" or "team")"""
+    return corpus.bowling_averages.get(kind, DEFAULT_OVERALL_AVERAGES[kind])
+
+def player_bowling_payload(data, player_name: str) -> Dict:
+    """Player stats against different bowling types"""
+    if data.bowler_type_matrix is None:
         # Return default stats if data not loaded
         return {
             "player": player_name,
@@ -391,19 +646,12 @@ async def get_player_bowling_stats(player_name: str):
                 "Slow left arm orthodox": 110.0,
                 "Left arm wrist spin": 118.0
             },
-            "overall_averages": OVERALL_BOWLING_AVERAGES.get("batter", {
-                "Left arm pace": 128.5,
-                "Right arm pace": 127.2,
-                "Off spin": 118.3,
-                "Leg spin": 122.1,
-                "Slow left arm orthodox": 112.8,
-                "Left arm wrist spin": 120.4
-            })
+            "overall_averages": overall_bowling_averages("batter")
         }
     
-    player_stats = batter_vs_bowler_data[batter_vs_bowler_data['Batter_Name'] == player_name]
+    bowling_stats = data.bowler_type_matrix.strike_rates(player_name)
     
-    if player_stats.empty:
+    if not bowling_stats:
         # Return default stats if player not found
         return {
             "player": player_name,
@@ -415,37 +663,23 @@ async def get_player_bowling_stats(player_name: str):
                 "Slow left arm orthodox": 110.0,
                 "Left arm wrist spin": 118.0
             },
-            "overall_averages": OVERALL_BOWLING_AVERAGES.get("batter", {
-                "Left arm pace": 128.5,
-                "Right arm pace": 127.2,
-                "Off spin": 118.3,
-                "Leg spin": 122.1,
-                "Slow left arm orthodox": 112.8,
-                "Left arm wrist spin": 120.4
-            })
+            "overall_averages": overall_bowling_averages("batter")
         }
     
-    bowling_stats = {}
-    for _, row in player_stats.iterrows():
-        bowling_stats[row['bowler.type']] = row['StrikeRate']
-    
     return {
         "player": player_name,
         "bowling_stats": bowling_stats,
-        "overall_averages": OVERALL_BOWLING_AVERAGES.get("batter", {
-            "Left arm pace": 128.5,
-            "Right arm pace": 127.2,
-            "Off spin": 118.3,
-            "Leg spin": 122.1,
-            "Slow left arm orthodox": 112.8,
-            "Left arm wrist spin": 120.4
-        })
+        "overall_averages": overall_bowling_averages("batter")
     }
 
-@app.get("/team/{team_name}/bowling-stats")
-async def get_team_bowling_stats(team_name: str):
-    """Get team stats against different bowling types"""
-    if team_vs_bowler_data is None:
+@app.get("/player/{player_name}/bowling-stats")
+async def get_player_bowling_stats(player_name: str):
+    """Get player stats against different bowling types"""
+    return NumpyJSONResponse(player_bowling_payload(store.current, player_name))
+
+def team_bowling_payload(data, team_name: str) -> Dict:
+    """Team stats against different bowling types"""
+    if data.team_bowling_index is None:
         # Return default stats if data not loaded
         return {
             "team": team_name,
@@ -457,19 +691,12 @@ async def get_team_bowling_stats(team_name: str):
                 "Slow left arm orthodox": 120.0,
                 "Left arm wrist spin": 126.0
             },
-            "overall_averages": OVERALL_BOWLING_AVERAGES.get("team", {
-                "Left arm pace": 133.2,
-                "Right arm pace": 130.8,
-                "Off spin": 123.5,
-                "Leg spin": 126.7,
-                "Slow left arm orthodox": 118.9,
-                "Left arm wrist spin": 124.3
-            })
+            "overall_averages": overall_bowling_averages("team")
         }
     
-    team_stats = team_vs_bowler_data[team_vs_bowler_data['batting_team'] == team_name]
+    bowling_stats = data.team_bowling_index.get(team_name)
     
-    if team_stats.empty:
+    if not bowling_stats:
         # Return default stats if team not found
         return {
             "team": team_name,
@@ -481,33 +708,101 @@ async def get_team_bowling_stats(team_name: str):
                 "Slow left arm orthodox": 120.0,
                 "Left arm wrist spin": 126.0
             },
-            "overall_averages": OVERALL_BOWLING_AVERAGES.get("team", {
-                "Left arm pace": 133.2,
-                "Right arm pace": 130.8,
-                "Off spin": 123.5,
-                "Leg spin": 126.7,
-                "Slow left arm orthodox": 118.9,
-                "Left arm wrist spin": 124.3
-            })
+            "overall_averages": overall_bowling_averages("team")
         }
     
-    bowling_stats = {}
-    for _, row in team_stats.iterrows():
-        bowling_stats[row['bowling_type']] = row['strike_rate']
-    
     return {
         "team": team_name,
         "bowling_stats": bowling_stats,
-        "overall_averages": OVERALL_BOWLING_AVERAGES.get("team", {
-            "Left arm pace": 133.2,
-            "Right arm pace": 130.8,
-            "Off spin": 123.5,
-            "Leg spin": 126.7,
-            "Slow left arm orthodox": 118.9,
-            "Left arm wrist spin": 124.3
-        })
+        "overall_averages": overall_bowling_averages("team")
     }
 
+@app.get("/team/{team_name}/bowling-stats")
+async def get_team_bowling_stats(team_name: str):
+    """Get team stats against different bowling types"""
+    return NumpyJSONResponse(team_bowling_payload(store.current, team_name))
+
+def found(payload, detail: str):
+    if payload is None:
+        raise HTTPException(status_code=404, detail=detail)
+    return payload
+
+def team_players_payload(team_name: str) -> Dict:
+    return {"team": team_name, "players": found(TEAM_PLAYERS.get(team_name), "Team not found")}
+
+async def batch_body(pending: Awaitable[Union[CachedResponse, Dict]]) -> Any:
+    """A cached route's payload for /batch, sharing the route's cache and single flight"""
+    result = await pending
+    return loads(result.body) if isinstance(result, CachedResponse) else result
+
+# Sub-requests /batch answers straight from the Dataset; other GET routes go through the app
+batch = BatchDispatcher(app, {
+    "/teams": lambda data, path, query: {"teams": list(TEAM_PLAYERS.keys())},
+    "/teams/{team_name}/players": lambda data, path, query: team_players_payload(path["team_name"]),
+    "/venues": lambda data, path, query: {"venues": VENUES},
+    "/player/{player_name}/insights": lambda data, path, query: player_insights_payload(data, path["player_name"]),
+    "/player/{player_name}/bowling-stats": lambda data, path, query: player_bowling_payload(data, path["player_name"]),
+    "/team/{team_name}/insights": lambda data, path, query: found(
+        team_insights_payload(data, path["team_name"]), "Team insights not found"),
+    "/team/{team_name}/bowling-stats": lambda data, path, query: team_bowling_payload(data, path["team_name"]),
+    "/team/{team_name}/dossier": lambda data, path, query: batch_body(team_dossier(
+        data, team_players_payload(path["team_name"])["team"], query.get("venue"))),
+    "/venue/{venue_name}/insights": lambda data, path, query: venue_insights_payload(data, path["venue_name"]),
+    "/team-scatter-plot-data": lambda data, path, query: batch_body(
+        team_scatter(data, query.get("x"), query.get("y"))),
+})
+
+@app.post("/matchup/plan")
+async def plan_matchup(body: Dict[str, Any] = Body(...)):
+    """Over-by-over bowling plan minimizing expected runs against an opposition XI.
+
+    Body: {"batters": [... in batting order], "bowlers": [{"name", "type",
+    "max_overs"?, "phases"?}]}
+    """
+    data = store.current
+    if data.bowler_type_matrix is None:
+        raise HTTPException(status_code=503, detail="Bowling type data not loaded")
+    batters = body.get("batters") or []
+    if not isinstance(batters, list) or not batters or len(batters) > 11:
+        raise HTTPException(status_code=422, detail="batters must list 1-11 players in batting order")
+    try:
+        bowlers = [
+            Bowler(
+                name=str(item["name"]),
+                bowler_type=str(item["type"]),
+                max_overs=min(int(item.get("max_overs", MAX_OVERS_PER_BOWLER)), MAX_OVERS_PER_BOWLER),
+                phases=tuple(item["phases"]) if item.get("phases") else None,
+            )
+            for item in body.get("bowlers") or []
+        ]
+    except (KeyError, TypeError, ValueError):
+        raise HTTPException(status_code=422, detail="Each bowler needs a name and type")
+    bad_phases = sorted({p for b in bowlers for p in (b.phases or ())} - set(PHASE_OVERS))
+    if bad_phases:
+        raise HTTPException(status_code=422, detail=f"Unknown phases {bad_phases}")
+
+    try:
+        plan = await flight.do(
+            flight_key(data, "/matchup/plan", json.dumps(body, sort_keys=True, default=str)),
+            lambda: offload.analytics(plan_overs, data.bowler_type_matrix, [str(b) for b in batters], bowlers))
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    return NumpyJSONResponse({
+        "total_expected_runs": plan.total_expected_runs,
+        "overs": plan.overs,
+        "bowler_overs": plan.bowler_overs,
+        "expected_runs": plan.expected_runs,
+    })
+
+@app.post("/batch")
+async def run_batch(body: Dict[str, Any] = Body(...)):
+    """Run many GET lookups in one request: {"requests": ["/player/KL Rahul/insights", {"id": "x", "path": ...}]}"""
+    sub_requests = parse_sub_requests(body.get("requests") or [])
+    # data_version covers the registered handlers; other routes read store.current themselves
+    data = store.current
+    results = await batch.run(data, sub_requests)
+    return NumpyJSONResponse({"data_version": data.version, "results": results})
+
 if __name__ == "__main__":
     import os
     port = int(os.getenv("PORT", "8000"))
@@ -0,0 +1,197 @@
+import itertools
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from datasets import BowlerTypeMatrix
+
+# Overs in each phase of a T20 innings, in order
+PHASE_OVERS = {'powerplay': 6, 'middle': 9, 'death': 5}
+MAX_OVERS_PER_BOWLER = 4
+
+# Share of each phase's balls faced by batting positions 1-11. Openers
+# dominate the powerplay, the middle order the middle overs and the finishers
+# the death; each row sums to 1.
+PHASE_EXPOSURE = {
+    'powerplay': [0.36, 0.34, 0.16, 0.08, 0.04, 0.02, 0, 0, 0, 0, 0],
+    'middle':    [0.08, 0.10, 0.20, 0.22, 0.18, 0.12, 0.06, 0.04, 0, 0, 0],
+    'death':     [0.01, 0.02, 0.05, 0.10, 0.18, 0.22, 0.20, 0.12, 0.06, 0.03, 0.01],
+}
+
+# Balls of league-average scoring blended into every batter's record, so a
+# 6-ball sample against a bowler type doesn't swing the plan
+PRIOR_BALLS = 30.0
+
+
+@dataclass(frozen=True)
+class Bowler:
+    name: str
+    bowler_type: str
+    max_overs: int = MAX_OVERS_PER_BOWLER
+    # Phases this bowler may bowl in; None allows all
+    phases: Optional[Tuple[str, ...]] = None
+
+
+@dataclass(frozen=True)
+class OverPlan:
+    total_expected_runs: float
+    overs: List[Dict]
+    bowler_overs: Dict[str, Dict[str, int]]
+    # Expected runs per over for each batter against each bowler type
+    expected_runs: Dict[str, Dict[str, float]] = field(default_factory=dict)
+
+
+def expected_runs_matrix(matrix: BowlerTypeMatrix, batters: Sequence[str]) -> np.ndarray:
+    """Expected runs per over, (len(batters), len(matrix.bowler_types)), shrunk toward the league rate.
+
+    Unknown batters, or types a batter never faced, get the league rate for
+    that bowler type.
+    """
+    runs = np.nan_to_num(matrix.runs)
+    balls = np.nan_to_num(matrix.balls_faced)
+    league_rate = runs.sum(axis=0) / np.maximum(balls.sum(axis=0), 1)
+
+    rows = matrix.rows_for(batters)
+    known = rows >= 0
+    batter_runs = np.zeros((len(batters), len(matrix.bowler_types)))
+    batter_balls = np.zeros_like(batter_runs)
+    batter_runs[known] = runs[rows[known]]
+    batter_balls[known] = balls[rows[known]]
+    rate = (batter_runs + PRIOR_BALLS * league_rate) / (batter_balls + PRIOR_BALLS)
+    return 6 * rate
+
+
+def phase_costs(expected_runs: np.ndarray) -> np.ndarray:
+    """Expected runs per over for each phase x bowler type, weighting batters by batting-order exposure"""
+    exposure = np.array([PHASE_EXPOSURE[phase][:len(expected_runs)] for phase in PHASE_OVERS], dtype=float)
+    exposure /= np.maximum(exposure.sum(axis=1, keepdims=True), 1e-12)
+    return exposure @ expected_runs
+
+
+def _phase_limits(phase_overs: int) -> int:
+    # No bowler bowls consecutive overs, so one phase holds at most every other over
+    return (phase_overs + 1) // 2
+
+
+def allocate_overs(costs: np.ndarray, bowlers: Sequence[Bowler]) -> Tuple[float, np.ndarray]:
+    """Overs per bowler per phase minimizing expected runs: (total, (bowlers, phases) int array).
+
+    Dynamic programme over bowlers whose state is the overs still needed in
+    each phase (7 x 10 x 6 states for a T20). Each bowler's choices are every
+    split of up to max_overs across the phases they're allowed in. Each step
+    is one vectorized min over shifted copies of the state table. ``costs``
+    is (bowlers, phases) expected runs per over.
+    """
+    phases = list(PHASE_OVERS)
+    need = tuple(PHASE_OVERS.values())
+    shape = tuple(n + 1 for n in need)
+    total = np.full(shape, np.inf)
+    total[need] = 0.0  # state = overs still needed; start with every over unassigned
+    choices_taken = []
+
+    for b, bowler in enumerate(bowlers):
+        allowed = [phase in (bowler.phases or phases) for phase in phases]
+        limits = [min(_phase_limits(n), bowler.max_overs) if ok else 0 for n, ok in zip(need, allowed)]
+        options = [
+            split for split in itertools.product(*(range(limit + 1) for limit in limits))
+            if sum(split) <= bowler.max_overs
+        ]
+        best = np.full(shape, np.inf)
+        best_choice = np.zeros(shape + (len(phases),), dtype=np.int8)
+        for split in options:
+            # Bowling `split` moves every state s to s - split
+            source = tuple(slice(n, None) for n in split)
+            target = tuple(slice(0, size - n) for size, n in zip(shape, split))
+            candidate = total[source] + float(np.dot(costs[b], split))
+            better = candidate < best[target]
+            best[target] = np.where(better, candidate, best[target])
+            best_choice[target][better] = split
+        total = best
+        choices_taken.append(best_choice)
+
+    if not np.isfinite(total[(0,) * len(phases)]):
+        raise ValueError("These bowlers can't cover every over within their limits")
+
+    # Walk back from "nothing left to bowl" to recover each bowler's split
+    allocation = np.zeros((len(bowlers), len(phases)), dtype=int)
+    state = (0,) * len(phases)
+    for b in range(len(bowlers) - 1, -1, -1):
+        split = choices_taken[b][state]
+        allocation[b] = split
+        state = tuple(s + int(n) for s, n in zip(state, split))
+    return float(total[(0,) * len(phases)]), allocation
+
+
+def sequence_overs(allocation: np.ndarray) -> List[int]:
+    """Bowler index for every over, never giving one bowler two overs in a row"""
+    phases = list(PHASE_OVERS)
+    slots = [p for p, phase in enumerate(phases) for _ in range(PHASE_OVERS[phase])]
+    remaining = allocation.copy()
+    order: List[int] = []
+    budget = [10_000]  # search nodes; the greedy order almost never backtracks
+
+    def place(over: int, previous: int) -> bool:
+        if over == len(slots):
+            return True
+        budget[0] -= 1
+        if budget[0] < 0:
+            return False
+        p = slots[over]
+        # Most overs still owed in this phase first, then most overs owed overall
+        candidates = sorted(np.flatnonzero(remaining[:, p]).tolist(),
+                            key=lambda b: (-remaining[b, p], -remaining[b].sum()))
+        for b in candidates:
+            if b == previous:
+                continue
+            remaining[b, p] -= 1
+            order.append(int(b))
+            if place(over + 1, b):
+                return True
+            order.pop()
+            remaining[b, p] += 1
+        return False
+
+    if not place(0, -1):
+        raise ValueError("No over order avoids consecutive overs for this allocation")
+    return order
+
+
+def plan_overs(matrix: BowlerTypeMatrix, batters: Sequence[str], bowlers: Sequence[Bowler]) -> OverPlan:
+    """Over-by-over plan for ``bowlers`` against ``batters`` (in batting order) minimizing expected runs"""
+    unknown = sorted({b.bowler_type for b in bowlers} - set(matrix.type_index))
+    if unknown:
+        raise ValueError(f"Unknown bowler types {unknown}, expected one of {matrix.bowler_types}")
+
+    per_batter = expected_runs_matrix(matrix, batters)
+    by_phase = phase_costs(per_batter)
+    type_columns = [matrix.type_index[b.bowler_type] for b in bowlers]
+    costs = by_phase[:, type_columns].T  # (bowlers, phases)
+
+    total, allocation = allocate_overs(costs, bowlers)
+    order = sequence_overs(allocation)
+
+    phases = list(PHASE_OVERS)
+    slots = [phase for phase in phases for _ in range(PHASE_OVERS[phase])]
+    overs = [
+        {
+            "over": i + 1,
+            "phase": phase,
+            "bowler": bowlers[b].name,
+            "bowler_type": bowlers[b].bowler_type,
+            "expected_runs": round(float(costs[b, phases.index(phase)]), 2),
+        }
+        for i, (phase, b) in enumerate(zip(slots, order))
+    ]
+    return OverPlan(
+        total_expected_runs=round(total, 2),
+        overs=overs,
+        bowler_overs={
+            bowler.name: {phase: int(n) for phase, n in zip(phases, allocation[b]) if n}
+            for b, bowler in enumerate(bowlers)
+        },
+        expected_runs={
+            batter: dict(zip(matrix.bowler_types, np.round(per_batter[i], 2).tolist()))
+            for i, batter in enumerate(batters)
+        },
+    )
@@ -0,0 +1,214 @@
+import functools
+import os
+import threading
+import time
+from bisect import bisect_left
+from typing import Callable, Dict, List, Optional, Tuple
+
+# Upper bounds in seconds; +Inf is implicit
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+# Label used for requests no route matched, so probes for random paths can't
+# create unbounded series
+UNMATCHED = "unmatched"
+METHODS = frozenset({"GET", "HEAD", "POST", "PUT", "PATCH", "DELETE", "OPTIONS"})
+
+
+class Histogram:
+    """Cumulative-on-export latency histogram.
+
+    Recording is one bisect and three in-place adds. Request metrics are only
+    recorded on the event loop thread, so they need no lock. observe_locked()
+    is for timings recorded from pool threads.
+    """
+
+    __slots__ = ("counts", "sum", "_lock")
+
+    def __init__(self):
+        self.counts = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, seconds: float):
+        self.counts[bisect_left(LATENCY_BUCKETS, seconds)] += 1
+        self.sum += seconds
+
+    def observe_locked(self, seconds: float):
+        with self._lock:
+            self.observe(seconds)
+
+
+class RouteStats:
+    __slots__ = ("latency", "requests", "request_bytes", "response_bytes", "statuses")
+
+    def __init__(self):
+        self.latency = Histogram()
+        self.requests = 0
+        self.request_bytes = 0
+        self.response_bytes = 0
+        self.statuses: Dict[int, int] = {}
+
+
+class Metrics:
+    """Process-local request and lookup metrics, rendered in Prometheus text format.
+
+    Each prefork worker (serve.py) keeps its own and a scrape sees the worker
+    that answered it, so every series carries a ``pid`` label: counters from
+    different workers stay separate series instead of looking like resets.
+    Sum over ``pid`` in queries for the whole server.
+    """
+
+    def __init__(self, prefix: str = "ipl"):
+        self.prefix = prefix
+        self.routes: Dict[Tuple[str, str], RouteStats] = {}
+        self.lookups: Dict[str, Histogram] = {}
+        self.in_flight = 0
+        self.dataset: Optional[Tuple[str, int]] = None
+        self.dataset_swaps = 0
+        self.exports: List[Tuple[str, Callable[[], Dict], Tuple[str, ...], Tuple[str, ...]]] = []
+
+    def route(self, method: str, path: str) -> RouteStats:
+        stats = self.routes.get((method, path))
+        if stats is None:
+            stats = self.routes[(method, path)] = RouteStats()
+        return stats
+
+    def on_dataset(self, dataset):
+        self.dataset = (dataset.version, dataset.generation)
+        self.dataset_swaps += 1
+
+    def observe_lookup(self, name: str, seconds: float):
+        histogram = self.lookups.get(name)
+        if histogram is None:
+            histogram = self.lookups.setdefault(name, Histogram())
+        histogram.observe_locked(seconds)
+
+    def export(self, name: str, read: Callable[[], Dict], counters: Tuple[str, ...] = (),
+               gauges: Tuple[str, ...] = ()):
+        """Render fields of ``read()`` at scrape time: counters as <name>_<field>_total, gauges as <name>_<field>"""
+        self.exports.append((name, read, counters, gauges))
+
+    def timed(self, name: str) -> Callable:
+        """Decorator recording each call's duration under lookup ``name``"""
+        def decorate(fn):
+            @functools.wraps(fn)
+            def wrapper(*args, **kwargs):
+                start = time.perf_counter()
+                try:
+                    return fn(*args, **kwargs)
+                finally:
+                    self.observe_lookup(name, time.perf_counter() - start)
+            return wrapper
+        return decorate
+
+    def render(self) -> str:
+        p = self.prefix
+        pid = f'pid="{os.getpid()}"'
+        lines: List[str] = []
+
+        def histogram(name: str, labels: str, h: Histogram):
+            cumulative = 0
+            for bound, count in zip(LATENCY_BUCKETS, h.counts):
+                cumulative += count
+                lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {cumulative}')
+            cumulative += h.counts[-1]
+            lines.append(f'{name}_bucket{{{labels},le="+Inf"}} {cumulative}')
+            lines.append(f"{name}_sum{{{labels}}} {h.sum:.6f}")
+            lines.append(f"{name}_count{{{labels}}} {cumulative}")
+
+        routes = sorted(self.routes.items())
+        lines += [f"# HELP {p}_request_duration_seconds Request latency by route",
+                  f"# TYPE {p}_request_duration_seconds histogram"]
+        for (method, path), stats in routes:
+            histogram(f"{p}_request_duration_seconds", f'{pid},method="{method}",route="{_escape(path)}"', stats.latency)
+
+        lines += [f"# HELP {p}_requests_total Requests by route and status",
+                  f"# TYPE {p}_requests_total counter"]
+        for (method, path), stats in routes:
+            for status, count in sorted(stats.statuses.items()):
+                lines.append(f'{p}_requests_total{{{pid},method="{method}",route="{_escape(path)}",status="{status}"}} {count}')
+
+        for metric, attribute, help_text in [
+            ("request_bytes_total", "request_bytes", "Request body bytes by route"),
+            ("response_bytes_total", "response_bytes", "Response body bytes by route"),
+        ]:
+            lines += [f"# HELP {p}_{metric} {help_text}", f"# TYPE {p}_{metric} counter"]
+            for (method, path), stats in routes:
+                lines.append(f'{p}_{metric}{{{pid},method="{method}",route="{_escape(path)}"}} {getattr(stats, attribute)}')
+
+        lines += [f"# HELP {p}_requests_in_flight Requests being handled", f"# TYPE {p}_requests_in_flight gauge",
+                  f'{p}_requests_in_flight{{{pid}}} {self.in_flight}']
+
+        lines += [f"# HELP {p}_lookup_duration_seconds Dataset lookup and build timings",
+                  f"# TYPE {p}_lookup_duration_seconds histogram"]
+        for name, h in sorted(self.lookups.items()):
+            with h._lock:
+                histogram(f"{p}_lookup_duration_seconds", f'{pid},lookup="{_escape(name)}"', h)
+
+        if self.dataset:
+            version, generation = self.dataset
+            lines += [f"# HELP {p}_dataset_info Dataset version being served", f"# TYPE {p}_dataset_info gauge",
+                      f'{p}_dataset_info{{{pid},version="{_escape(version)}",generation="{generation}"}} 1',
+                      f"# HELP {p}_dataset_swaps_total Datasets swapped in since start",
+                      f"# TYPE {p}_dataset_swaps_total counter",
+                      f"{p}_dataset_swaps_total{{{pid}}} {self.dataset_swaps}"]
+
+        for name, read, counters, gauges in self.exports:
+            stats = read()
+            for field, kind, suffix in [*((f, "counter", "_total") for f in counters),
+                                        *((f, "gauge", "") for f in gauges)]:
+                metric = f"{p}_{name}_{field}{suffix}"
+                lines += [f"# HELP {metric} {field.replace('_', ' ').capitalize()} ({name.replace('_', ' ')})",
+                          f"# TYPE {metric} {kind}", f"{metric}{{{pid}}} {stats[field]}"]
+        return "\n".join(lines) + "\n"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class MetricsMiddleware:
+    """Pure ASGI middleware timing every HTTP request against its route template.
+
+    Avoids BaseHTTPMiddleware, whose per-request task and stream plumbing
+    would cost more than the measurement itself.
+    """
+
+    def __init__(self, app, metrics: Metrics):
+        self.app = app
+        self.metrics = metrics
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        metrics = self.metrics
+        start = time.perf_counter()
+        status = 500
+        sent = 0
+        metrics.in_flight += 1
+
+        async def send_wrapper(message):
+            nonlocal status, sent
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            elif message["type"] == "http.response.body":
+                sent += len(message.get("body", b""))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            metrics.in_flight -= 1
+            route = scope.get("route")
+            method = scope["method"]
+            stats = metrics.route(method if method in METHODS else "OTHER", getattr(route, "path", UNMATCHED))
+            stats.latency.observe(time.perf_counter() - start)
+            stats.requests += 1
+            stats.statuses[status] = stats.statuses.get(status, 0) + 1
+            stats.response_bytes += sent
+            for name, value in scope["headers"]:
+                if name == b"content-length":
+                    if value.isdigit():
+                        stats.request_bytes += int(value)
+                    break
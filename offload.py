@@ -0,0 +1,84 @@
+import asyncio
+import importlib
+import multiprocessing
+import threading
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+from fastapi import HTTPException
+
+
+class Offloader:
+    """Runs blocking handler work off the event loop so slow requests don't stall fast ones.
+
+    ``cpu()`` is for pandas/numpy work of a few ms: it runs on a bounded
+    thread pool. ``analytics()`` is for heavier solves (the matchup planner)
+    and uses a process pool when ``processes`` > 0, so it doesn't compete
+    with the event loop for the GIL; arguments and results must pickle, and
+    the callable must be a module-level function. With ``threads`` == 0
+    everything runs inline on the loop, as handlers did before.
+
+    At most ``queue_limit`` calls wait or run at once; beyond that callers get
+    a 503 instead of queueing without bound.
+    """
+
+    def __init__(self, threads: int = 4, processes: int = 0, queue_limit: int = 64):
+        self.threads = threads
+        self.processes = processes
+        self.queue_limit = queue_limit
+        self._threads: Optional[ThreadPoolExecutor] = None
+        self._processes: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+        self.in_flight = 0
+        self.completed = 0
+        self.rejected = 0
+
+    def start(self):
+        if self.threads > 0 and self._threads is None:
+            self._threads = ThreadPoolExecutor(max_workers=self.threads, thread_name_prefix="offload")
+        if self.processes > 0 and self._processes is None:
+            # spawn, not fork: the parent runs the data watcher and pool threads
+            self._processes = ProcessPoolExecutor(
+                max_workers=self.processes, mp_context=multiprocessing.get_context("spawn"))
+            # Start every worker and import the analytics modules now, not on the first request
+            for _ in range(self.processes):
+                self._processes.submit(importlib.import_module, "matchup")
+
+    def shutdown(self):
+        for pool in (self._threads, self._processes):
+            if pool is not None:
+                pool.shutdown(wait=False, cancel_futures=True)
+        self._threads = self._processes = None
+
+    async def _run(self, pool: Optional[Executor], fn: Callable, *args) -> Any:
+        if pool is None:
+            return fn(*args)
+        with self._lock:
+            if self.in_flight >= self.queue_limit:
+                self.rejected += 1
+                raise HTTPException(status_code=503, detail="Server busy, try again shortly",
+                                    headers={"Retry-After": "1"})
+            self.in_flight += 1
+        try:
+            return await asyncio.get_running_loop().run_in_executor(pool, fn, *args)
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+                self.completed += 1
+
+    async def cpu(self, fn: Callable, *args) -> Any:
+        """``fn(*args)`` on the thread pool"""
+        return await self._run(self._threads, fn, *args)
+
+    async def analytics(self, fn: Callable, *args) -> Any:
+        """``fn(*args)`` on the process pool, falling back to the thread pool"""
+        return await self._run(self._processes or self._threads, fn, *args)
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "threads": self.threads if self._threads else 0,
+            "processes": self.processes if self._processes else 0,
+            "in_flight": self.in_flight,
+            "completed": self.completed,
+            "rejected": self.rejected,
+        }
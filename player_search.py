@@ -0,0 +1,187 @@
+import re
+import unicodedata
+from bisect import bisect_left
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# Match kinds, best first
+EXACT, PREFIX, TOKEN_PREFIX, FUZZY = 'exact', 'prefix', 'token_prefix', 'fuzzy'
+_KIND_ORDER = {EXACT: 0, PREFIX: 1, TOKEN_PREFIX: 2, FUZZY: 3}
+
+MAX_LIMIT = 50
+# Prefixes this short match too many names to rank per request, so their
+# results are ranked once at build time
+_PRECOMPUTED_PREFIX_LENGTH = 2
+# Longest prefix range ranked per request; longer ranges keep the first entries
+_MAX_SCAN = 2000
+
+
+def normalize_player_name(name: str) -> str:
+    """Lowercase ASCII tokens separated by single spaces: "Faf du Plessis" -> "faf du plessis" """
+    text = unicodedata.normalize('NFKD', name).encode('ascii', 'ignore').decode().lower()
+    return " ".join(re.findall(r"[a-z0-9]+", text))
+
+
+def _deletes(token: str) -> List[str]:
+    return [token[:i] + token[i + 1:] for i in range(len(token))]
+
+
+def _edit_distance(a: str, b: str, limit: int) -> int:
+    """Optimal string alignment distance (adjacent swaps cost 1), cut off above ``limit``"""
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    previous2, previous = None, list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        current = [i] + [0] * len(b)
+        for j in range(1, len(b) + 1):
+            cost = a[i - 1] != b[j - 1]
+            current[j] = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                current[j] = min(current[j], previous2[j - 2] + 1)
+        if min(current) > limit:
+            return limit + 1
+        previous2, previous = previous, current
+    return previous[-1]
+
+
+def max_edits(token: str) -> int:
+    """Typos tolerated in one query token: none for very short tokens, two for long ones"""
+    return 0 if len(token) < 4 else 1 if len(token) < 7 else 2
+
+
+@dataclass(frozen=True)
+class PlayerSearchIndex:
+    """Sorted-array prefix index plus a deletion index for typo matching.
+
+    ``keys`` holds every normalized name and every token suffix of it
+    ("virat kohli" and "kohli"), sorted, so a prefix query is one bisect and
+    a contiguous scan. ``deletes`` maps each single-character deletion of a
+    name token to the tokens it came from (SymSpell style), so typo
+    candidates come from dict lookups rather than a scan of all names.
+    """
+    names: List[str]
+    name_tokens: List[List[str]]
+    weights: List[float]
+    keys: List[str]
+    key_names: List[int]
+    key_is_full: List[bool]
+    token_names: Dict[str, List[int]]
+    deletes: Dict[str, List[str]]
+    precomputed: Dict[str, List[Tuple[int, str]]]
+
+    def _rank(self, matches: Dict[int, str], limit: int) -> List[Tuple[int, str]]:
+        order = sorted(matches.items(), key=lambda item: (
+            _KIND_ORDER[item[1]], -self.weights[item[0]], len(self.names[item[0]]), self.names[item[0]]))
+        return order[:limit]
+
+    def _prefix_matches(self, query: str, matches: Dict[int, str], max_scan: Optional[int] = _MAX_SCAN):
+        start = bisect_left(self.keys, query)
+        end = bisect_left(self.keys, query + "\x7f", start)
+        if max_scan is not None:
+            end = min(end, start + max_scan)
+        for position in range(start, end):
+            name = self.key_names[position]
+            if self.key_is_full[position]:
+                kind = EXACT if self.keys[position] == query else PREFIX
+            else:
+                kind = TOKEN_PREFIX
+            if name not in matches or _KIND_ORDER[kind] < _KIND_ORDER[matches[name]]:
+                matches[name] = kind
+
+    def _fuzzy_matches(self, query: str, matches: Dict[int, str]):
+        tokens = query.split()
+        target = max(tokens, key=len)
+        limit = max_edits(target)
+        if not limit:
+            return
+        candidates = set(self.deletes.get(target, ()))
+        if target in self.token_names:
+            candidates.add(target)
+        for deleted in _deletes(target):
+            candidates.update(self.deletes.get(deleted, ()))
+            if deleted in self.token_names:
+                candidates.add(deleted)
+        others = tokens[:tokens.index(target)] + tokens[tokens.index(target) + 1:]
+        for token in candidates:
+            if _edit_distance(target, token, limit) > limit:
+                continue
+            for name in self.token_names[token]:
+                if name in matches:
+                    continue
+                # Remaining query tokens must still prefix some token of the name
+                name_tokens = self.name_tokens[name]
+                if all(any(t.startswith(other) for t in name_tokens) for other in others):
+                    matches[name] = FUZZY
+
+    def canonical(self, name: str) -> Optional[str]:
+        """The indexed spelling of ``name`` if it matches one up to case, accents and spacing"""
+        query = normalize_player_name(name)
+        i = bisect_left(self.keys, query)
+        while i < len(self.keys) and self.keys[i] == query:
+            if self.key_is_full[i]:
+                return self.names[self.key_names[i]]
+            i += 1
+        return None
+
+    def search(self, query: str, limit: int = 10) -> List[Dict]:
+        """Ranked matches for ``query``: exact, then name prefix, token prefix and typo matches"""
+        query = normalize_player_name(query)
+        limit = max(1, min(limit, MAX_LIMIT))
+        if not query:
+            return []
+
+        ranked = self.precomputed.get(query)
+        if ranked is None:
+            matches: Dict[int, str] = {}
+            self._prefix_matches(query, matches)
+            if len(matches) < limit:
+                self._fuzzy_matches(query, matches)
+            ranked = self._rank(matches, limit)
+        return [{"name": self.names[name], "match": kind} for name, kind in ranked[:limit]]
+
+
+def build_player_search_index(names: Iterable[str], weights: Optional[Dict[str, float]] = None) -> PlayerSearchIndex:
+    """Index ``names`` (deduplicated, first spelling wins). ``weights`` ranks ties, e.g. innings played."""
+    weights = weights or {}
+    unique: Dict[str, str] = {}
+    for name in names:
+        if isinstance(name, str) and name.strip():
+            unique.setdefault(normalize_player_name(name), name.strip())
+    unique.pop("", None)
+
+    display = list(unique.values())
+    entries = []
+    token_names: Dict[str, List[int]] = {}
+    for i, normalized in enumerate(unique):
+        tokens = normalized.split()
+        entries.append((normalized, i, True))
+        for t in range(1, len(tokens)):
+            entries.append((" ".join(tokens[t:]), i, False))
+        for token in tokens:
+            token_names.setdefault(token, []).append(i)
+    entries.sort()
+
+    deletes: Dict[str, List[str]] = {}
+    for token in token_names:
+        for deleted in _deletes(token):
+            deletes.setdefault(deleted, []).append(token)
+
+    index = PlayerSearchIndex(
+        names=display,
+        name_tokens=[normalized.split() for normalized in unique],
+        weights=[float(weights.get(name, 0.0)) for name in display],
+        keys=[entry[0] for entry in entries],
+        key_names=[entry[1] for entry in entries],
+        key_is_full=[entry[2] for entry in entries],
+        token_names=token_names,
+        deletes=deletes,
+        precomputed={},
+    )
+
+    # Rank every one- and two-character prefix once
+    prefixes = {key[:length] for key in index.keys for length in range(1, _PRECOMPUTED_PREFIX_LENGTH + 1)}
+    for prefix in prefixes:
+        matches: Dict[int, str] = {}
+        index._prefix_matches(prefix, matches, max_scan=None)
+        index.precomputed[prefix] = index._rank(matches, MAX_LIMIT)
+    return index
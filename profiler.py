@@ -0,0 +1,234 @@
+import itertools
+import json
+import os
+import random
+import sys
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+# Leaf frames of threads that are only waiting for work; dropped from samples
+_IDLE_LEAVES = {("threading.py", "wait"), ("queue.py", "get"), ("selectors.py", "select"),
+                ("thread.py", "_worker")}
+
+
+def _frame_name(frame) -> str:
+    code = frame.f_code
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})".replace(";", ":")
+
+
+def collapse(frame, thread_name: str) -> Optional[str]:
+    """One thread's stack as a collapsed "thread;outer;...;inner" line, None when it's idle"""
+    if (os.path.basename(frame.f_code.co_filename), frame.f_code.co_name) in _IDLE_LEAVES:
+        return None
+    names = []
+    while frame is not None:
+        names.append(_frame_name(frame))
+        frame = frame.f_back
+    names.append(thread_name)
+    return ";".join(reversed(names))
+
+
+_ids = itertools.count(1)
+
+
+class Capture:
+    __slots__ = ("id", "path", "reason", "started", "sampling", "stacks", "samples")
+
+    def __init__(self, path: str, reason: Optional[str]):
+        # Unique across prefork workers sharing one profile directory
+        self.id = f"{os.getpid():x}x{next(_ids):x}"
+        self.path = path
+        self.reason = reason
+        self.started = time.perf_counter()
+        # Forced and sampled captures record from the first sample; slow ones
+        # start once the request crosses the threshold
+        self.sampling = reason is not None
+        self.stacks: Counter = Counter()
+        self.samples = 0
+
+
+class RequestProfiler:
+    """Sampling profiler for individual requests, with an on-disk ring of results.
+
+    One background thread samples every live thread's stack each ``interval``
+    seconds while any capture is recording, and otherwise just watches for
+    requests running past ``slow_seconds``. A capture starts on the first
+    sample, so profiling costs nothing until a request asks for it
+    (admin header), is picked by ``sample_rate``, or turns out to be slow.
+    A slow capture only covers the time after the threshold, which is the
+    slow part.
+
+    Samples include every thread, so the event loop thread also shows other
+    requests that ran concurrently. Output is collapsed stacks (one
+    "frame;frame;frame count" line per distinct stack), which flamegraph.pl
+    and speedscope both open. The newest ``ring_size`` profiles are kept in
+    ``directory``, each with a JSON sidecar describing the request.
+    """
+
+    def __init__(self, directory: Path, ring_size: int = 50, interval: float = 0.001,
+                 sample_rate: float = 0.0, slow_seconds: float = 0.0):
+        self.directory = Path(directory)
+        # At least one: trimming with [:-0] would keep everything
+        self.ring_size = max(1, ring_size)
+        self.interval = interval
+        self.sample_rate = sample_rate
+        self.slow_seconds = slow_seconds
+        self._active: Dict[str, Capture] = {}
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def start(self):
+        if self._thread is None:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="request-profiler", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join()
+            self._thread = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None
+
+    def begin(self, path: str, forced: bool = False) -> Optional[Capture]:
+        """Track a request; returns None when it can't be profiled at all"""
+        if self._thread is None:
+            return None
+        if forced:
+            reason = "requested"
+        elif self.sample_rate and random.random() < self.sample_rate:
+            reason = "sampled"
+        elif self.slow_seconds:
+            reason = None
+        else:
+            return None
+        capture = Capture(path, reason)
+        self._active[capture.id] = capture
+        return capture
+
+    def end(self, capture: Capture, route: str, status: int) -> Optional[str]:
+        """Stop tracking; writes and returns the profile id if anything was recorded"""
+        duration = time.perf_counter() - capture.started
+        with self._lock:
+            # Under the lock, so the sampler is never mid-update when this is written out
+            self._active.pop(capture.id, None)
+        # A forced capture is always written, so the id it returned resolves
+        if not capture.sampling or (not capture.samples and capture.reason != "requested"):
+            return None
+        self._write(capture, {
+            "id": capture.id, "reason": capture.reason, "route": route, "path": capture.path,
+            "status": status, "duration_ms": round(duration * 1000, 2), "samples": capture.samples,
+            "interval_ms": self.interval * 1000, "captured_at": time.time(),
+        })
+        return capture.id
+
+    def _run(self):
+        own = threading.get_ident()
+        while not self._stop.is_set():
+            captures = list(self._active.values())
+            if self.slow_seconds:
+                now = time.perf_counter()
+                for capture in captures:
+                    if not capture.sampling and now - capture.started >= self.slow_seconds:
+                        capture.reason = "slow"
+                        capture.sampling = True
+            recording = [capture for capture in captures if capture.sampling]
+            if not recording:
+                self._stop.wait(min(self.slow_seconds / 4, 0.01) if self.slow_seconds else 0.01)
+                continue
+
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            stacks = []
+            for ident, frame in sys._current_frames().items():
+                if ident != own:
+                    stack = collapse(frame, names.get(ident, f"thread-{ident}"))
+                    if stack:
+                        stacks.append(stack)
+            with self._lock:
+                for capture in recording:
+                    if capture.id in self._active:
+                        capture.stacks.update(stacks)
+                        capture.samples += 1
+            self._stop.wait(self.interval)
+
+    def _write(self, capture: Capture, meta: Dict):
+        stem = f"{int(meta['captured_at'] * 1000)}-{capture.id}"
+        with self._lock:
+            body = "".join(f"{stack} {count}\n" for stack, count in capture.stacks.most_common())
+            (self.directory / f"{stem}.collapsed").write_text(body)
+            (self.directory / f"{stem}.json").write_text(json.dumps(meta))
+            for old in sorted(self.directory.glob("*.json"))[:-self.ring_size]:
+                old.unlink(missing_ok=True)
+                old.with_suffix(".collapsed").unlink(missing_ok=True)
+
+    def profiles(self) -> List[Dict]:
+        """Metadata of the stored profiles, newest first"""
+        profiles = []
+        for meta in sorted(self.directory.glob("*.json"), reverse=True):
+            try:
+                profiles.append(json.loads(meta.read_text()))
+            except (OSError, ValueError):
+                continue
+        return profiles
+
+    def read(self, profile_id: str) -> Optional[str]:
+        """Collapsed stacks of one stored profile"""
+        if not profile_id.isalnum():
+            return None
+        for path in self.directory.glob(f"*-{profile_id}.collapsed"):
+            try:
+                return path.read_text()
+            except OSError:
+                return None
+        return None
+
+
+class ProfilingMiddleware:
+    """Pure ASGI middleware handing each request to a RequestProfiler.
+
+    ``authorize(headers)`` decides whether an ``X-Profile: 1`` header may force
+    a capture; forced captures report their id in ``X-Profile-Id``.
+    """
+
+    def __init__(self, app, profiler: RequestProfiler, authorize: Callable[[Dict[str, str]], bool]):
+        self.app = app
+        self.profiler = profiler
+        self.authorize = authorize
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not self.profiler.running:
+            return await self.app(scope, receive, send)
+
+        forced = False
+        for name, value in scope["headers"]:
+            if name == b"x-profile" and value == b"1":
+                forced = self.authorize({k.decode("latin-1"): v.decode("latin-1") for k, v in scope["headers"]})
+                break
+        capture = self.profiler.begin(scope["path"], forced)
+        if capture is None:
+            return await self.app(scope, receive, send)
+
+        status = 500
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                if forced:
+                    message = {**message, "headers": [*message.get("headers", []),
+                                                      (b"x-profile-id", capture.id.encode())]}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            route = getattr(scope.get("route"), "path", scope["path"])
+            self.profiler.end(capture, route, status)
@@ -0,0 +1,119 @@
+import numpy as np
+import pandas as pd
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+from schema import RANK_PREFIX
+
+# Rank columns whose metric column doesn't follow the Rank_<metric> naming
+RANK_METRIC_ALIASES = {
+    'Rank_First.Innings.Average': ['batting_average_1st_innings', 'First.Innings.Average'],
+    'Rank_Second.Innings.Average': ['batting_average_2nd_innings', 'Second.Innings.Average'],
+}
+
+# Metrics where a smaller value ranks higher
+LOWER_IS_BETTER_PREFIXES = ('dot_ball_percentage', 'balls_per_boundary')
+
+TIE_METHODS = ('min', 'max', 'average', 'dense', 'first')
+
+
+@dataclass(frozen=True)
+class RankConfig:
+    """Who qualifies for a rank and how ties are broken.
+
+    Rows below either threshold get no rank and don't count towards the pool
+    size. ``tie_method`` is any pandas rank method; "min" gives 1, 2, 2, 4.
+    """
+    min_innings: int = 0
+    min_balls: float = 0
+    tie_method: str = 'min'
+
+
+@dataclass(frozen=True)
+class RankSpec:
+    rank_column: str
+    metric: str
+    ascending: bool  # True when a smaller metric value is better
+
+
+@dataclass(frozen=True)
+class RankTable:
+    """O(1) rank lookups: (rank, pool size) for any key and metric"""
+    key_index: Dict[str, int]
+    metric_index: Dict[str, int]
+    ranks: np.ndarray      # float32 (keys x metrics), NaN when unranked
+    pool_sizes: np.ndarray  # int (metrics,)
+
+    def rank_of(self, key: str, metric: str) -> Optional[Tuple[int, int]]:
+        """(rank, pool size) for ``key`` on ``metric``, or None if unranked/unknown"""
+        row = self.key_index.get(key)
+        col = self.metric_index.get(metric)
+        if row is None or col is None:
+            return None
+        rank = self.ranks[row, col]
+        if np.isnan(rank):
+            return None
+        return int(rank), int(self.pool_sizes[col])
+
+
+def rank_specs(frame: pd.DataFrame) -> List[RankSpec]:
+    """Pair every Rank_* column in ``frame`` with the metric column it ranks.
+
+    Rank columns with no matching metric (e.g. the team file's
+    Rank_StrikeRate_in_Death_Overs) are skipped and keep their loaded values.
+    """
+    specs = []
+    for column in frame.columns:
+        if not column.startswith(RANK_PREFIX):
+            continue
+        candidates = RANK_METRIC_ALIASES.get(column, [column[len(RANK_PREFIX):]])
+        metric = next((name for name in candidates if name in frame.columns), None)
+        if metric is None:
+            continue
+        specs.append(RankSpec(column, metric, metric.startswith(LOWER_IS_BETTER_PREFIXES)))
+    return specs
+
+
+def qualified_mask(frame: pd.DataFrame, config: RankConfig) -> np.ndarray:
+    """Rows meeting the innings and balls-faced thresholds (files without those columns all qualify)"""
+    mask = np.ones(len(frame), dtype=bool)
+    if 'Total_Innings_Played' in frame.columns:
+        innings = frame['Total_Innings_Played'].to_numpy('float64')
+        mask &= innings >= config.min_innings
+        if config.min_balls and 'average_balls_faced_per_innings' in frame.columns:
+            balls = innings * frame['average_balls_faced_per_innings'].to_numpy('float64')
+            mask &= balls >= config.min_balls
+    return mask
+
+
+def compute_ranks(frame: pd.DataFrame, key_column: str, config: RankConfig) -> Tuple[pd.DataFrame, RankTable]:
+    """Fill every rankable Rank_* column in one vectorized pass.
+
+    Returns a new frame with the rank columns replaced and a RankTable for
+    O(1) lookups by key and metric name.
+    """
+    if config.tie_method not in TIE_METHODS:
+        raise ValueError(f"Unknown rank tie method {config.tie_method!r}, expected one of {TIE_METHODS}")
+
+    specs = rank_specs(frame)
+    values = frame[[spec.metric for spec in specs]].to_numpy('float64', copy=True)
+    # Flip higher-is-better metrics so one ascending rank serves every column
+    values[:, [not spec.ascending for spec in specs]] *= -1
+    values[~qualified_mask(frame, config)] = np.nan
+
+    ranked = pd.DataFrame(values).rank(method=config.tie_method, ascending=True, na_option='keep')
+    ranks = ranked.to_numpy('float32')
+    ranks.setflags(write=False)
+    pool_sizes = (~np.isnan(values)).sum(axis=0)
+
+    frame = frame.copy()
+    for i, spec in enumerate(specs):
+        frame[spec.rank_column] = ranks[:, i]
+
+    table = RankTable(
+        key_index={str(key): i for i, key in enumerate(frame[key_column].tolist())},
+        metric_index={spec.metric: i for i, spec in enumerate(specs)},
+        ranks=ranks,
+        pool_sizes=pool_sizes,
+    )
+    return frame, table
@@ -0,0 +1,101 @@
+import hashlib
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Optional
+
+from fastapi import Request, Response
+
+from fast_json import dumps
+
+
+@dataclass(frozen=True)
+class CachedResponse:
+    body: bytes
+    etag: str
+
+
+def serialize(payload: Any) -> bytes:
+    """Compact UTF-8 JSON with NaN as null, like every other data endpoint"""
+    return dumps(payload)
+
+
+def _dataset_key(dataset) -> str:
+    return f"{dataset.version}.{dataset.generation}"
+
+
+def _etag(dataset, body: bytes) -> str:
+    # Strong validator: dataset version and generation plus the body digest,
+    # so a payload built from code that changed between deploys never collides
+    return f'"{_dataset_key(dataset)}-{hashlib.blake2b(body, digest_size=8).hexdigest()}"'
+
+
+def _matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    # Weak comparison, as RFC 9110 requires for If-None-Match
+    candidates = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    return etag in candidates
+
+
+class ResponseCache:
+    """Pre-serialized JSON bodies for endpoints that only change on reload.
+
+    Entries are keyed by dataset version (and rank generation). Only the two
+    newest datasets are kept, so requests still holding the Dataset from just
+    before a reload keep hitting their own entries. prime() builds a set of
+    payloads up front so the first request after a reload is a hit too.
+    """
+
+    KEEP_DATASETS = 2
+
+    def __init__(self):
+        self._by_dataset: Dict[str, Dict[str, CachedResponse]] = {}
+
+    def _install(self, key: str, entries: Dict[str, CachedResponse]) -> Dict[str, CachedResponse]:
+        by_dataset = {k: v for k, v in self._by_dataset.items() if k != key}
+        by_dataset[key] = entries
+        # Replace the whole mapping so concurrent readers never see it mid-update
+        self._by_dataset = dict(list(by_dataset.items())[-self.KEEP_DATASETS:])
+        return entries
+
+    def _current(self, dataset) -> Dict[str, CachedResponse]:
+        key = _dataset_key(dataset)
+        entries = self._by_dataset.get(key)
+        return entries if entries is not None else self._install(key, {})
+
+    def lookup(self, dataset, key: str) -> Optional[CachedResponse]:
+        """The cached entry for ``key`` if there is one, without building it"""
+        entries = self._by_dataset.get(_dataset_key(dataset))
+        return entries.get(key) if entries is not None else None
+
+    def get(self, dataset, key: str, build: Callable[[], Any]) -> CachedResponse:
+        entries = self._current(dataset)
+        entry = entries.get(key)
+        if entry is None:
+            body = serialize(build())
+            entry = CachedResponse(body, _etag(dataset, body))
+            entries[key] = entry
+        return entry
+
+    def prime(self, dataset, builders: Dict[str, Callable[[], Any]]):
+        """Serialize every payload in ``builders`` for ``dataset`` ahead of the first request"""
+        entries = {}
+        for key, build in builders.items():
+            body = serialize(build())
+            entries[key] = CachedResponse(body, _etag(dataset, body))
+        self._install(_dataset_key(dataset), entries)
+
+    def respond(self, request: Request, dataset, key: str, build: Callable[[], Any]) -> Response:
+        """The cached body for ``key``, or 304 when the client already holds it"""
+        return self.send(request, self.get(dataset, key, build))
+
+    def send(self, request: Request, entry: CachedResponse) -> Response:
+        """``entry`` as a response to ``request``, or 304 when the client already holds it"""
+        headers = {"ETag": entry.etag, "Cache-Control": "no-cache"}
+        if _matches(request.headers.get("if-none-match"), entry.etag):
+            return Response(status_code=304, headers=headers)
+        return Response(content=entry.body, media_type="application/json", headers=headers)
+
+    def __len__(self):
+        return sum(len(entries) for entries in self._by_dataset.values())
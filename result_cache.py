@@ -0,0 +1,114 @@
+import functools
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Iterable, Optional, Tuple
+
+from fast_json import dumps
+
+
+def canonical_names(raw: Iterable[str], resolve: Optional[Callable[[str], Optional[str]]] = None) -> Tuple[str, ...]:
+    """Trimmed, name-resolved, deduplicated and sorted names, e.g. from a comma-separated parameter.
+
+    ``resolve`` maps a spelling to its canonical name (None leaves it as typed),
+    so "virat kohli" and "Virat Kohli" become one key.
+    """
+    names = set()
+    for name in raw:
+        name = name.strip()
+        if name:
+            names.add((resolve(name) if resolve else None) or name)
+    return tuple(sorted(names))
+
+
+class ResultCache:
+    """Bounded LRU of computed payloads for parameterized endpoints.
+
+    Keys are (endpoint name, canonical parameters), so equivalent requests
+    share one entry. Entries belong to one dataset: on_dataset() (subscribed
+    to the DatasetStore) drops everything when a new version goes live, and
+    requests still holding an older Dataset compute without caching. The
+    cache is bounded by entry count and by the payloads' serialized size.
+    Cached payloads are shared between requests and must not be mutated.
+    """
+
+    def __init__(self, max_entries: int = 1024, max_bytes: int = 32 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[Hashable, Tuple[Any, int]]" = OrderedDict()
+        self._version: Optional[str] = None
+        self._lock = threading.Lock()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.bypassed = 0
+
+    def on_dataset(self, dataset):
+        with self._lock:
+            self._version = f"{dataset.version}.{dataset.generation}"
+            self._entries.clear()
+            self.bytes = 0
+
+    def get(self, dataset, key: Hashable, build: Callable[[], Any]) -> Any:
+        version = f"{dataset.version}.{dataset.generation}"
+        with self._lock:
+            if self._version is None:
+                self._version = version
+            current = version == self._version
+            entry = self._entries.get(key) if current else None
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+            if current:
+                self.misses += 1
+            else:
+                self.bypassed += 1
+
+        payload = build()
+        if current:
+            self._store(version, key, payload, len(dumps(payload)))
+        return payload
+
+    def _store(self, version: str, key: Hashable, payload: Any, size: int):
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            if version != self._version:
+                return  # a reload landed while this was building
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self.bytes -= previous[1]
+            self._entries[key] = (payload, size)
+            self.bytes += size
+            while len(self._entries) > self.max_entries or self.bytes > self.max_bytes:
+                _, (_, evicted) = self._entries.popitem(last=False)
+                self.bytes -= evicted
+                self.evictions += 1
+
+    def cached(self, name: str, canonical: Callable[..., Tuple]):
+        """Decorator for ``fn(dataset, *params)`` payload builders.
+
+        The wrapper takes the raw request arguments. ``canonical(dataset, *args)``
+        turns them into the tuple of normalized params that ``fn`` receives and
+        the entry is keyed on, so equivalent requests share one entry.
+        """
+        def decorate(fn):
+            @functools.wraps(fn)
+            def wrapper(dataset, *args):
+                params = canonical(dataset, *args)
+                return self.get(dataset, (name, params), lambda: fn(dataset, *params))
+            return wrapper
+        return decorate
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "bytes": self.bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "bypassed": self.bypassed,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else None,
+        }
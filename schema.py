@@ -0,0 +1,214 @@
+import pandas as pd
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List
+
+# Column kinds understood by normalize()
+TEXT = "text"          # free-form names, kept as strings
+CATEGORY = "category"  # small closed vocabularies (teams, bowler types)
+INTEGER = "integer"    # counts, int32
+FLOAT = "float"        # plain numeric, float64
+PERCENT = "percent"    # "146.81%" / "NaN%" strings, float64 with real NaN
+RANK = "rank"          # ordinal ranks, float32 so blanks stay NaN
+
+RANK_PREFIX = "Rank_"
+
+
+@dataclass(frozen=True)
+class TableSchema:
+    """Declared column types for one CSV in the data directory.
+
+    Columns not listed explicitly are FLOAT, except ``Rank_*`` columns which
+    are RANK. ``key`` rows with no value are dropped, as are pandas index
+    artifacts (``Unnamed: 0`` and friends) left over from the R export.
+    """
+    filename: str
+    key: str
+    columns: Dict[str, str] = field(default_factory=dict)
+
+    def kind_of(self, column: str) -> str:
+        if column in self.columns:
+            return self.columns[column]
+        if column.startswith(RANK_PREFIX):
+            return RANK
+        return FLOAT
+
+
+def _kinds(kind: str, columns: List[str]) -> Dict[str, str]:
+    return {column: kind for column in columns}
+
+
+# Percent-formatted metrics shared by the player and team batting files
+_BATTING_PERCENT_COLUMNS = [
+    'dot_ball_percentage', 'boundary_percentage', 'non_boundary_strike_rate',
+    'strike_rate_first_5_balls', 'strike_rate_first_10_balls',
+    'strike_rate_vs_pace', 'dot_ball_percentage_vs_pace', 'boundary_percentage_vs_pace',
+    'non_boundary_strike_rate_vs_pace', 'strike_rate_first_5_balls_vs_pace', 'strike_rate_first_10_balls_vs_pace',
+    'strike_rate_vs_spin', 'dot_ball_percentage_vs_spin', 'boundary_percentage_vs_spin',
+    'non_boundary_strike_rate_vs_spin', 'strike_rate_first_5_balls_vs_spin', 'strike_rate_first_10_balls_vs_spin',
+    'strike_rate_1st_innings', 'strike_rate_2nd_innings',
+    'strike_rate_balls_1_10', 'strike_rate_balls_11_20', 'strike_rate_balls_21_30',
+    'strike_rate_balls_31_40', 'strike_rate_balls_41_50',
+]
+
+_VENUE_PHASES = ['Powerplay', 'MiddleOvers', 'DeathOvers']
+_VENUE_PERCENT_COLUMNS = [
+    'Boundary_Percentage_per_match', 'Boundary_Percentage_First_Innings', 'Boundary_Percentage_Second_Innings',
+    'Percentage_Of_wickets_Pace_Bowlers', 'Percentage_Of_wickets_Spin_Bowlers',
+    'Percentage_Of_Wickets_by_Spinners_First_Innings', 'Percentage_Of_Wickets_by_Pacers_First_Innings',
+    'Percentage_Of_Wickets_by_Pacers_Second_Innings', 'Percentage_Of_Wickets_by_Spinners_Second_Innings',
+] + [
+    f"{phase}_{metric}_{scope}"
+    for phase in _VENUE_PHASES
+    for metric in ['Dot_Pct', 'Boundary_Pct']
+    for scope in ['perMatch', 'First_Innings', 'Second_Innings']
+]
+
+# Suffixes an R merge() leaves on columns present in both inputs
+MERGE_SUFFIXES = ('.x', '.y')
+
+BATTING_SCHEMA = TableSchema(
+    filename="IPL_21_24_Batting.csv",
+    key="Batter_Name",
+    columns={
+        'Batter_Name': TEXT,
+        **_kinds(INTEGER, ['Total_Runs_Scored', 'Total_Innings_Played', 'Total_Times_Out']),
+        **_kinds(PERCENT, _BATTING_PERCENT_COLUMNS),
+    },
+)
+
+TEAM_SCHEMA = TableSchema(
+    filename="IPL_Team_BattingData_21_24.csv",
+    key="batting_team",
+    columns={
+        'batting_team': CATEGORY,
+        # The team export has no overall strike_rate_first_10_balls column
+        **_kinds(PERCENT, ['strike_rate'] + [
+            column for column in _BATTING_PERCENT_COLUMNS if column != 'strike_rate_first_10_balls'
+        ]),
+    },
+)
+
+BATTER_VS_BOWLER_SCHEMA = TableSchema(
+    filename="Batters_StrikeRateVSBowlerType.csv",
+    key="Batter_Name",
+    columns={
+        'Batter_Name': TEXT,
+        'bowler.type': CATEGORY,
+        **_kinds(INTEGER, ['Runs', 'BallsFaced']),
+    },
+)
+
+TEAM_VS_BOWLER_SCHEMA = TableSchema(
+    filename="Team_vs_BowlingType.csv",
+    key="batting_team",
+    columns={
+        'batting_team': CATEGORY,
+        'bowling_type': CATEGORY,
+    },
+)
+
+VENUE_SCHEMA = TableSchema(
+    filename="IPL_Venue_details.csv",
+    key="venue",
+    columns={
+        'venue': TEXT,
+        'city': CATEGORY,
+        'MatchesPlayed': INTEGER,
+        **_kinds(PERCENT, _VENUE_PERCENT_COLUMNS),
+    },
+)
+
+# Every CSV in the data directory, in load order
+SCHEMAS = [BATTING_SCHEMA, TEAM_SCHEMA, BATTER_VS_BOWLER_SCHEMA, TEAM_VS_BOWLER_SCHEMA, VENUE_SCHEMA]
+
+
+def parse_percent(series: pd.Series) -> pd.Series:
+    """Convert a column of "146.81%" / "NaN%" strings (or plain numbers) to float64"""
+    if pd.api.types.is_numeric_dtype(series):
+        return series.astype('float64')
+    cleaned = series.astype('string').str.rstrip('%')
+    return pd.to_numeric(cleaned, errors='coerce').astype('float64')
+
+
+def _convert(series: pd.Series, kind: str) -> pd.Series:
+    if kind == TEXT:
+        return series.astype('string')
+    if kind == CATEGORY:
+        return series.astype('category')
+    if kind == PERCENT:
+        return parse_percent(series)
+    if kind == RANK:
+        return pd.to_numeric(series, errors='coerce').astype('float32')
+    if kind == INTEGER:
+        values = pd.to_numeric(series, errors='coerce')
+        # Counts with gaps cannot be int32; keep them as float so NaN survives
+        return values.astype('int32') if values.notna().all() else values.astype('float64')
+    return pd.to_numeric(series, errors='coerce').astype('float64')
+
+
+def drop_merge_duplicates(frame: pd.DataFrame) -> pd.DataFrame:
+    """Collapse ``<name>.x`` / ``<name>.y`` column pairs into one ``<name>`` column.
+
+    When the two sides disagree the ``.x`` values win and the disagreement is
+    reported, so the declared ``<name>`` column always exists.
+    """
+    left, right = MERGE_SUFFIXES
+    renames, dropped = {}, []
+    for column in frame.columns:
+        if not column.endswith(left):
+            continue
+        base = column[:-len(left)]
+        twin = base + right
+        if twin not in frame.columns or base in frame.columns:
+            continue
+        if not frame[column].equals(frame[twin]):
+            differ = (frame[column] != frame[twin]) & ~(frame[column].isna() & frame[twin].isna())
+            print(f"Merge columns {column} and {twin} differ in {int(differ.sum())} rows, keeping {column}")
+        renames[column] = base
+        dropped.append(twin)
+    if not renames:
+        return frame
+    return frame.drop(columns=dropped).rename(columns=renames)
+
+
+def normalize(frame: pd.DataFrame, schema: TableSchema) -> pd.DataFrame:
+    """Apply ``schema`` to a raw CSV frame in one pass over its columns"""
+    frame = drop_merge_duplicates(frame)
+    missing = [column for column in schema.columns if column not in frame.columns]
+    if missing:
+        raise ValueError(f"{schema.filename} is missing declared columns: {missing}")
+
+    frame = frame.loc[frame[schema.key].notna()]
+    columns = {
+        column: _convert(frame[column], schema.kind_of(column))
+        for column in frame.columns
+        if not column.startswith("Unnamed:")
+    }
+    return pd.DataFrame(columns).reset_index(drop=True)
+
+
+def load_table(data_dir: Path, schema: TableSchema) -> pd.DataFrame:
+    """Read one CSV from ``data_dir`` and normalize it against ``schema``"""
+    return normalize(pd.read_csv(data_dir / schema.filename), schema)
+
+
+def _format_number(values: pd.Series) -> pd.Series:
+    """Round to 2 dp and drop trailing zeros, the way the R export wrote numbers"""
+    text = values.round(2).map(lambda value: f"{value:.2f}".rstrip('0').rstrip('.'))
+    return text.where(values.notna(), "NaN")
+
+
+def to_source_format(frame: pd.DataFrame, schema: TableSchema) -> pd.DataFrame:
+    """Inverse of normalize(): render typed columns back to the CSV text conventions"""
+    columns = {}
+    for column in frame.columns:
+        kind = schema.kind_of(column)
+        values = frame[column]
+        if kind == PERCENT:
+            columns[column] = _format_number(values.astype('float64')) + "%"
+        elif kind == FLOAT and pd.api.types.is_float_dtype(values):
+            columns[column] = values.round(2)
+        else:
+            columns[column] = values
+    return pd.DataFrame(columns)
@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+Prefork production launcher.
+
+The parent process imports the app, loads and indexes every dataset and
+serializes the cached responses once, then forks WEB_CONCURRENCY workers that
+all accept on one shared listening socket. The workers inherit the loaded
+Dataset and share its pages with the parent copy-on-write, so N workers cost
+far less than N copies of the data and no worker parses a CSV at startup.
+
+Two things keep those pages shared:
+- the bulk of the data is numpy buffers (column blocks, matrices, venue
+  arrays), whose memory is never written when a worker reads it;
+- gc.freeze() moves everything loaded so far into the permanent generation,
+  so the cyclic GC never rewrites those objects' headers in a worker.
+Reference counts of the Python objects a worker does touch (dict keys,
+strings) still dirty their pages, which is why the per-worker private memory
+isn't zero.
+
+Workers that die are replaced by a fresh fork of the parent, which still holds
+the data. SIGTERM/SIGINT stop every worker and then the parent.
+
+Reloads go through the parent so every worker serves the same dataset. The
+parent watches the data directory itself (workers don't), and POST
+/admin/reload in a worker just signals it: SIGHUP reloads if the files
+changed, SIGUSR1 forces a rebuild. When the dataset changes the parent forks a
+new set of workers and sends SIGTERM to the old ones, which finish their
+in-flight requests first.
+
+Usage: WEB_CONCURRENCY=4 python serve.py
+       kill -HUP <parent pid>    # reload
+"""
+import gc
+import os
+import signal
+import socket
+import sys
+import time
+
+import uvicorn
+
+from config import settings
+
+
+def bind(host: str, port: int) -> socket.socket:
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(2048)
+    sock.set_inheritable(True)
+    return sock
+
+
+def preload(force: bool = True):
+    """Import the app and (re)build everything the workers will share; returns (app, store)"""
+    from main import app, corpus, store
+
+    # Loaded up front here, unlike in a single process: the parent serves no
+    # requests, and loading before the fork lets every worker share one copy
+    corpus.load()
+    # Let the previous dataset's cycles be collected before the new one is frozen
+    gc.unfreeze()
+    # Also primes the response cache through the store's subscribers
+    store.reload(force=force)
+    gc.collect()
+    gc.freeze()
+    return app, store
+
+
+def run_worker(app, sock: socket.socket):
+    # Parent's handlers would stop every sibling; a worker only stops itself
+    for signum in (signal.SIGTERM, signal.SIGINT, signal.SIGHUP, signal.SIGUSR1):
+        signal.signal(signum, signal.SIG_DFL)
+    config = uvicorn.Config(app, log_level="info")
+    server = uvicorn.Server(config)
+    try:
+        server.run(sockets=[sock])
+    finally:
+        os._exit(0)
+
+
+def spawn(app, sock: socket.socket) -> int:
+    pid = os.fork()
+    if pid == 0:
+        run_worker(app, sock)
+    return pid
+
+
+def main():
+    workers = max(1, settings.WEB_CONCURRENCY)
+    sock = bind(settings.HOST, settings.PORT)
+    app, store = preload()
+    print(f"Starting {workers} worker(s) on {settings.HOST}:{settings.PORT}")
+    if workers == 1:
+        run_worker(app, sock)
+
+    # Workers send reloads here instead of reloading only themselves, and
+    # leave the file watching to this process
+    settings.PREFORK_PARENT = os.getpid()
+    children = {spawn(app, sock) for _ in range(workers)}
+    retiring = set()
+    stopping = False
+    reload_requested = None  # None, or whether the reload is forced
+
+    def stop(signum, frame):
+        nonlocal stopping
+        stopping = True
+        for pid in children | retiring:
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    def request_reload(signum, frame):
+        nonlocal reload_requested
+        reload_requested = bool(reload_requested) or signum == signal.SIGUSR1
+
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+    signal.signal(signal.SIGHUP, request_reload)
+    signal.signal(signal.SIGUSR1, request_reload)
+
+    watch_interval = settings.DATA_WATCH_INTERVAL
+    last_signature = store.file_signature()
+    next_watch = time.monotonic() + watch_interval
+
+    while children or retiring:
+        if watch_interval > 0 and not stopping and time.monotonic() >= next_watch:
+            next_watch = time.monotonic() + watch_interval
+            signature = store.file_signature()
+            if signature != last_signature:
+                last_signature = signature
+                print("Data directory changed, reloading")
+                reload_requested = bool(reload_requested)
+
+        if reload_requested is not None and not stopping:
+            force, reload_requested = reload_requested, None
+            previous = store.current
+            try:
+                preload(force)
+            except Exception as e:
+                print(f"Error reloading data: {e}")
+            if store.current is not previous:
+                # Fork the new generation first; the shared socket keeps serving
+                # while the old workers finish their requests and exit
+                print(f"Re-forking {workers} worker(s) for dataset {store.current.version}")
+                retiring |= children
+                children = {spawn(app, sock) for _ in range(workers)}
+                for pid in retiring:
+                    try:
+                        os.kill(pid, signal.SIGTERM)
+                    except ProcessLookupError:
+                        pass
+
+        try:
+            pid, status = os.waitpid(-1, os.WNOHANG)
+        except ChildProcessError:
+            break
+        if pid == 0:
+            time.sleep(0.2)
+            continue
+        if pid in retiring:
+            retiring.discard(pid)
+            continue
+        children.discard(pid)
+        if not stopping:
+            print(f"Worker {pid} exited with status {status}, starting a replacement")
+            time.sleep(1)  # don't spin if workers die on startup
+            children.add(spawn(app, sock))
+    sys.exit(0)
+
+
+if __name__ == "__main__":
+    main()
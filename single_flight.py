@@ -0,0 +1,48 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable
+
+
+class SingleFlight:
+    """Collapses concurrent identical computations into one.
+
+    The first caller for a key starts ``compute()`` as a task; callers
+    arriving with the same key while it is in flight await that same result
+    (or exception) instead of starting their own. Cancelling any caller,
+    including the first, leaves the computation running for the others. Nothing is kept once it finishes, so this
+    only merges bursts; keys should include the dataset version so a reload
+    never hands out a result computed from the old data.
+    """
+
+    def __init__(self):
+        self._in_flight: Dict[Hashable, asyncio.Task] = {}
+        self.calls = 0
+        self.computed = 0
+        self.coalesced = 0
+
+    async def do(self, key: Hashable, compute: Callable[[], Awaitable[Any]]) -> Any:
+        self.calls += 1
+        task = self._in_flight.get(key)
+        if task is not None:
+            self.coalesced += 1
+        else:
+            # Its own task, so the computation belongs to no single caller
+            task = asyncio.ensure_future(compute())
+            self._in_flight[key] = task
+            self.computed += 1
+            task.add_done_callback(lambda done: self._finished(key, done))
+        # shield: any one client disconnecting, the first included, mustn't cancel everyone's result
+        return await asyncio.shield(task)
+
+    def _finished(self, key: Hashable, task: asyncio.Task):
+        if self._in_flight.get(key) is task:
+            del self._in_flight[key]
+        if not task.cancelled():
+            task.exception()  # marks it retrieved when every caller has gone
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "calls": self.calls,
+            "computed": self.computed,
+            "coalesced": self.coalesced,
+            "in_flight": len(self._in_flight),
+        }
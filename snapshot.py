@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+Typed binary snapshot of the data/ directory.
+
+`python snapshot.py build` converts every CSV declared in schema.SCHEMAS into
+column blocks stored as .npy files plus a manifest.json. At startup
+load_snapshot() memory-maps those blocks instead of re-parsing the CSVs, and
+returns None (so callers fall back to CSV) when the snapshot is missing or was
+built from different CSV contents.
+"""
+import argparse
+import hashlib
+import json
+import shutil
+import sys
+import tempfile
+from pathlib import Path
+from typing import Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+from schema import CATEGORY, SCHEMAS, TEXT, TableSchema, load_table
+
+SNAPSHOT_DIRNAME = "snapshot"
+MANIFEST = "manifest.json"
+# Bump when the on-disk layout changes so old snapshots are rebuilt
+FORMAT_VERSION = 1
+
+
+def source_hash(data_dir: Path) -> str:
+    """Content hash of every source CSV plus the schema declarations that shaped it"""
+    digest = hashlib.sha256(f"format={FORMAT_VERSION}".encode())
+    for schema in SCHEMAS:
+        digest.update(repr(sorted(schema.columns.items())).encode())
+        digest.update(schema.filename.encode())
+        with open(data_dir / schema.filename, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _write_table(frame: pd.DataFrame, schema: TableSchema, out_dir: Path) -> dict:
+    """Write one normalized table as per-dtype blocks plus text/category columns.
+
+    Numeric blocks are stored column-major (one row per CSV column) so every
+    column is a contiguous slice of the memory map.
+    """
+    stem = Path(schema.filename).stem
+    entry = {"columns": list(frame.columns), "rows": len(frame), "blocks": [], "text": {}, "category": {}}
+
+    numeric: Dict[str, list] = {}
+    for column in frame.columns:
+        kind = schema.kind_of(column)
+        if kind == TEXT:
+            filename = f"{stem}.{len(entry['text'])}.text.npy"
+            np.save(out_dir / filename, frame[column].to_numpy(dtype=str))
+            entry["text"][column] = filename
+        elif kind == CATEGORY:
+            filename = f"{stem}.{len(entry['category'])}.codes.npy"
+            values = frame[column].cat
+            np.save(out_dir / filename, values.codes.to_numpy())
+            entry["category"][column] = {"file": filename, "categories": values.categories.tolist()}
+        else:
+            numeric.setdefault(frame[column].dtype.name, []).append(column)
+
+    for dtype, columns in numeric.items():
+        filename = f"{stem}.{dtype}.npy"
+        np.save(out_dir / filename, np.ascontiguousarray(frame[columns].to_numpy(dtype=dtype).T))
+        entry["blocks"].append({"file": filename, "columns": columns})
+    return entry
+
+
+def build_snapshot(data_dir: Path, snapshot_dir: Optional[Path] = None) -> Path:
+    """Parse the CSVs in ``data_dir`` and write a fresh snapshot, replacing any old one"""
+    snapshot_dir = snapshot_dir or data_dir / SNAPSHOT_DIRNAME
+    manifest = {"format": FORMAT_VERSION, "source_hash": source_hash(data_dir), "tables": {}}
+
+    staging = Path(tempfile.mkdtemp(prefix=".snapshot-", dir=snapshot_dir.parent))
+    try:
+        for schema in SCHEMAS:
+            frame = load_table(data_dir, schema)
+            manifest["tables"][schema.filename] = _write_table(frame, schema, staging)
+        (staging / MANIFEST).write_text(json.dumps(manifest, indent=1))
+
+        # Swap the finished snapshot in so readers never see a half-written one
+        if snapshot_dir.exists():
+            shutil.rmtree(snapshot_dir)
+        staging.rename(snapshot_dir)
+    except BaseException:
+        shutil.rmtree(staging, ignore_errors=True)
+        raise
+    return snapshot_dir
+
+
+def _read_table(entry: dict, snapshot_dir: Path) -> pd.DataFrame:
+    columns = {}
+    for block in entry["blocks"]:
+        values = np.load(snapshot_dir / block["file"], mmap_mode="r")
+        for i, column in enumerate(block["columns"]):
+            columns[column] = values[i]
+    for column, filename in entry["text"].items():
+        columns[column] = pd.array(np.load(snapshot_dir / filename), dtype="string")
+    for column, spec in entry["category"].items():
+        codes = np.load(snapshot_dir / spec["file"], mmap_mode="r")
+        columns[column] = pd.Categorical.from_codes(codes, categories=spec["categories"])
+    return pd.DataFrame({column: columns[column] for column in entry["columns"]}, copy=False)
+
+
+def load_snapshot(data_dir: Path, snapshot_dir: Optional[Path] = None,
+                  current_hash: Optional[str] = None) -> Optional[Dict[str, pd.DataFrame]]:
+    """Memory-map the snapshot for ``data_dir``, keyed by CSV filename.
+
+    Returns None when there is no snapshot, it uses an older format, or its
+    source hash no longer matches the CSVs on disk. Pass ``current_hash`` if
+    the caller has already computed source_hash(data_dir).
+    """
+    snapshot_dir = snapshot_dir or data_dir / SNAPSHOT_DIRNAME
+    manifest_path = snapshot_dir / MANIFEST
+    if not manifest_path.exists():
+        return None
+
+    manifest = json.loads(manifest_path.read_text())
+    if manifest.get("format") != FORMAT_VERSION:
+        return None
+    try:
+        if manifest.get("source_hash") != (current_hash or source_hash(data_dir)):
+            return None
+    except FileNotFoundError:
+        return None
+
+    return {
+        filename: _read_table(entry, snapshot_dir)
+        for filename, entry in manifest["tables"].items()
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build or check the binary data snapshot")
+    parser.add_argument("command", choices=["build", "check"])
+    parser.add_argument("--data-dir", type=Path, default=Path(__file__).parent / "data")
+    parser.add_argument("--snapshot-dir", type=Path, default=None)
+    args = parser.parse_args(argv)
+
+    if args.command == "build":
+        path = build_snapshot(args.data_dir, args.snapshot_dir)
+        print(f"Wrote snapshot to {path}")
+        return 0
+
+    fresh = load_snapshot(args.data_dir, args.snapshot_dir) is not None
+    print("Snapshot is up to date" if fresh else "Snapshot is missing or stale")
+    return 0 if fresh else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
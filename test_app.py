@@ -6,7 +6,7 @@ import sys
 import os
 sys.path.append(os.path.dirname(__file__))
 
-from main import app
+from main import app, store
 from fastapi.testclient import TestClient
 
 def test_basic_endpoints():
@@ -37,5 +37,596 @@ def test_basic_endpoints():
     print(f"Status: {response.status_code}")
     print(f"Response: {response.json()}")
 
+def test_scatter_plot_data():
+    """Scatter data comes from the indexed batting frame, with selected players flagged"""
+    with TestClient(app) as client:
+        response = client.get("/scatter-plot-data", params={"selected_players": " Rinku Singh ,Not A Player"})
+        assert response.status_code == 200
+        points = {p['name']: p for p in response.json()['scatter_data']}
+
+        assert points['Virat Kohli']['isSelected'] is False
+        assert points['Rinku Singh']['isSelected'] is True
+        assert isinstance(points['Rinku Singh']['first_innings_sr'], float)
+        # Unknown players fall back to generated defaults
+        assert points['Not A Player']['first_innings_avg'] == 35.0 + (len('Not A Player') % 10)
+
+        # A batter listed twice in the CSV gets both rows, as before the indexed frame
+        rows = client.get("/scatter-plot-data", params={"selected_players": "Navdeep Saini"}).json()['scatter_data']
+        assert sum(p['name'] == 'Navdeep Saini' for p in rows) == 2
+
+def test_schema_normalization():
+    """Percent and rank columns are parsed to floats once, at load time"""
+    from pathlib import Path
+    from schema import BATTING_SCHEMA, TEAM_SCHEMA, load_table
+
+    data_dir = Path(__file__).parent / "data"
+    batting = load_table(data_dir, BATTING_SCHEMA)
+    assert batting['strike_rate_1st_innings'].dtype == 'float64'
+    assert batting['Rank_strike_rate'].dtype == 'float32'
+    assert batting['Batter_Name'].notna().all()
+
+    team = load_table(data_dir, TEAM_SCHEMA)
+    csk = team[team['batting_team'] == 'Chennai Super Kings'].iloc[0]
+    assert csk['strike_rate'] == 140.72
+
+def test_bowling_stats_lookup():
+    """Bowling-stats endpoints answer from the startup index, falling back to defaults"""
+    with TestClient(app) as client:
+        response = client.get("/player/Ayush Badoni/bowling-stats")
+        assert response.json()['bowling_stats']['Left arm pace'] == 145.68
+
+        response = client.get("/team/Chennai Super Kings/bowling-stats")
+        assert response.json()['bowling_stats']['Off spin'] == 112.24
+
+        response = client.get("/player/Not A Player/bowling-stats")
+        assert response.json()['bowling_stats']['Left arm pace'] == 130.0
+
+def test_bowler_type_matrix():
+    """The dense batter x bowler-type matrix agrees with the long table"""
+    from pathlib import Path
+    from datasets import build_bowler_type_matrix
+    from schema import BATTER_VS_BOWLER_SCHEMA, load_table
+
+    table = load_table(Path(__file__).parent / "data", BATTER_VS_BOWLER_SCHEMA)
+    matrix = build_bowler_type_matrix(table)
+    assert matrix.strike_rate.shape == (table['Batter_Name'].nunique(), 6)
+    assert int(matrix.present.sum()) == len(table)
+
+    row = matrix.player_index['Ayush Badoni']
+    col = matrix.type_index['Slow left arm orthodox']
+    assert matrix.runs[row, col] == 14 and matrix.balls_faced[row, col] == 16
+    assert matrix.strike_rates('A Kamboj') == {'Right arm pace': 100.0}
+    assert matrix.weakest_bowler_types(['Ayush Badoni', 'Nobody']) == {
+        'Ayush Badoni': 'Slow left arm orthodox', 'Nobody': None
+    }
+
+def test_data_snapshot():
+    """The binary snapshot round-trips the CSVs and goes stale when a CSV changes"""
+    import shutil
+    import tempfile
+    from pathlib import Path
+    from schema import BATTING_SCHEMA, load_table
+    from snapshot import build_snapshot, load_snapshot
+
+    with tempfile.TemporaryDirectory() as tmp:
+        data_dir = Path(tmp) / "data"
+        shutil.copytree(Path(__file__).parent / "data", data_dir, ignore=shutil.ignore_patterns("snapshot"))
+        build_snapshot(data_dir)
+
+        tables = load_snapshot(data_dir)
+        expected = load_table(data_dir, BATTING_SCHEMA)
+        assert tables[BATTING_SCHEMA.filename]['strike_rate'].tolist() == expected['strike_rate'].tolist()
+        assert tables[BATTING_SCHEMA.filename]['Batter_Name'].tolist() == expected['Batter_Name'].tolist()
+
+        with open(data_dir / BATTING_SCHEMA.filename, "a") as f:
+            f.write("\n")
+        assert load_snapshot(data_dir) is None
+
+def test_dataset_hot_reload():
+    """A reload builds a new Dataset and swaps it in; the old one stays intact"""
+    import shutil
+    import tempfile
+    from pathlib import Path
+    from data_store import DatasetStore
+
+    with tempfile.TemporaryDirectory() as tmp:
+        data_dir = Path(tmp) / "data"
+        shutil.copytree(Path(__file__).parent / "data", data_dir, ignore=shutil.ignore_patterns("snapshot"))
+        store = DatasetStore(data_dir)
+        first = store.reload()
+        assert store.reload() is first  # unchanged content is not reloaded
+
+        csv = data_dir / "Team_vs_BowlingType.csv"
+        csv.write_text(csv.read_text().replace("Off spin,110,98,112.24", "Off spin,110,98,99.99"))
+        second = store.reload()
+        assert store.current is second and second.generation == first.generation + 1
+        assert second.version != first.version
+        assert second.team_bowling_index['Chennai Super Kings']['Off spin'] == 99.99
+        assert first.team_bowling_index['Chennai Super Kings']['Off spin'] == 112.24
+
+    with TestClient(app) as client:
+        assert client.post("/admin/reload").status_code == 403
+
+def test_ingest_deliveries():
+    """Batting metrics recomputed from a hand-checked handful of deliveries"""
+    import pandas as pd
+    from ingest import DELIVERY_COLUMNS, compute_tables
+    from schema import BATTING_SCHEMA, TEAM_SCHEMA, normalize, to_source_format
+
+    deliveries = pd.DataFrame([
+        (1, 1, 0, 'A', 'x', 'Right arm pace', 4, 0, 0, ''),
+        (1, 1, 0, 'A', 'x', 'Right arm pace', 0, 0, 0, ''),
+        (1, 1, 0, 'A', 'x', 'Right arm pace', 0, 1, 1, ''),
+        (1, 1, 0, 'A', 'x', 'Right arm pace', 1, 0, 0, ''),
+        (1, 1, 1, 'A', 'y', 'Off spin', 6, 0, 0, ''),
+        (1, 1, 1, 'A', 'y', 'Off spin', 0, 0, 0, 'y'),
+        (1, 2, 0, 'B', 'z', 'Leg spin', 2, 0, 0, ''),
+    ], columns=DELIVERY_COLUMNS)
+    tables = compute_tables(deliveries)
+
+    batting = tables[BATTING_SCHEMA.filename].set_index('Batter_Name')
+    assert batting.loc['x', 'Total_Runs_Scored'] == 5
+    assert batting.loc['x', 'average_balls_faced_per_innings'] == 3  # the wide is not a ball faced
+    assert round(batting.loc['x', 'dot_ball_percentage'], 2) == 33.33
+    assert batting.loc['x', 'non_boundary_strike_rate'] == 50.0
+    assert batting.loc['y', 'batting_average_vs_spin'] == 6.0
+    assert batting.loc['z', 'strike_rate_2nd_innings'] == 200.0
+
+    team = tables[TEAM_SCHEMA.filename].set_index('batting_team')
+    assert team.loc['A', 'First.Innings.Average'] == 12  # 11 off the bat plus one wide
+    assert team.loc['A', 'batting_average'] == 11
+
+    # The written CSV text parses back to the same numbers
+    source = to_source_format(tables[BATTING_SCHEMA.filename], BATTING_SCHEMA)
+    assert source.loc[0, 'dot_ball_percentage'] == '33.33%'
+    parsed = normalize(source, BATTING_SCHEMA)
+    assert parsed['strike_rate_vs_pace'].iloc[0] == round(batting.loc['x', 'strike_rate_vs_pace'], 2)
+
+def test_rank_engine():
+    """Rank columns are filled against the qualified pool; team ranks match the source file"""
+    from pathlib import Path
+    from ranks import RankConfig, compute_ranks
+    from schema import BATTING_SCHEMA, TEAM_SCHEMA, load_table
+
+    data_dir = Path(__file__).parent / "data"
+    batting, ranks = compute_ranks(load_table(data_dir, BATTING_SCHEMA), 'Batter_Name', RankConfig(min_innings=10))
+    assert ranks.rank_of('KL Rahul', 'batting_average') == (3, 124)
+    assert batting['Rank_batting_average'].notna().sum() == 124
+    # Lower dot-ball percentage ranks higher
+    best = batting.loc[batting['Rank_dot_ball_percentage'] == 1, 'dot_ball_percentage'].iloc[0]
+    assert best == batting.loc[batting['Rank_dot_ball_percentage'].notna(), 'dot_ball_percentage'].min()
+
+    team = load_table(data_dir, TEAM_SCHEMA)
+    ranked, _ = compute_ranks(team, 'batting_team', RankConfig())
+    assert (ranked['Rank_strike_rate'] == team['Rank_strike_rate']).all()
+    assert (ranked['Rank_StrikeRate_in_Death_Overs'] == team['Rank_StrikeRate_in_Death_Overs']).all()
+
+def test_insight_engine():
+    """Every batter, team and venue gets generated insights, with ranks from the qualified pool"""
+    from pathlib import Path
+    from data_store import load_dataset
+    from insight_engine import PLAYER_PROFILE
+    from ranks import RankConfig
+
+    dataset = load_dataset(Path(__file__).parent / "data", use_snapshot=False, rank_config=RankConfig(min_innings=10))
+    book = dataset.insights
+    assert len(book.players) == dataset.batting_data['Batter_Name'].nunique()
+    assert len(book.teams) == len(dataset.team_data)
+    assert len(book.venues) == len(dataset.venue_data)
+    assert book.build_seconds < 1
+
+    rahul = book.players['KL Rahul']
+    assert set(rahul) == {"ai_insights", "strengths", "areas_for_improvement"}
+    assert "Excellent batting average of 48.48 across innings (Rank: 3/124)" in rahul["strengths"]
+    assert book.venues['arun-jaitley-stadium-delhi']["insights"]
+
+    # Rank text comes from the RankTable, so it follows the configured tie method
+    tied = load_dataset(Path(__file__).parent / "data", use_snapshot=False,
+                        rank_config=RankConfig(min_innings=10, tie_method="max"))
+    prefixes = [(template.split("{value}")[0], rule.metric)
+                for rule in PLAYER_PROFILE.rules for template in (rule.high, rule.low)]
+    checked = 0
+    for player, insights in tied.insights.players.items():
+        for sentence in sum(insights.values(), []):
+            metric = next(metric for prefix, metric in prefixes if sentence.startswith(prefix))
+            ranked = tied.batting_ranks.rank_of(player, metric)
+            if ranked:
+                assert sentence.endswith("(Rank: %d/%d)" % ranked)
+                checked += 1
+    assert checked
+
+    with TestClient(app) as client:
+        response = client.get("/player/KL Rahul/insights")
+        assert response.json()["insights"] == store.current.insights.players['KL Rahul']
+
+def test_insight_corpus():
+    """The marshal artifact round-trips insights.py and is ignored once stale"""
+    import tempfile
+    from pathlib import Path
+    from insight_corpus import InsightCorpus, SOURCE, build_corpus, load_corpus
+    import insights
+
+    with tempfile.TemporaryDirectory() as tmp:
+        artifact = build_corpus(artifact=Path(tmp) / "insights.marshal")
+        corpus = InsightCorpus(artifact=artifact)
+        assert not corpus.loaded
+        assert corpus.players == insights.PLAYER_INSIGHTS
+        assert corpus.bowling_averages == insights.OVERALL_BOWLING_AVERAGES
+        assert corpus.loaded
+
+        # An artifact built from other source falls back to importing insights.py
+        source = Path(tmp) / "insights.py"
+        source.write_text(SOURCE.read_text() + "\n# edited\n")
+        build_corpus(source, artifact)
+        assert load_corpus(SOURCE, artifact)['TEAM_INSIGHTS'] == insights.TEAM_INSIGHTS
+
+        # Reloads don't wait for the corpus; its names join the search index once warmup loads it
+        from data_store import DatasetStore
+        source.write_text(SOURCE.read_text() + "\nPLAYER_INSIGHTS['Corpus Only'] = {}\n")
+        build_corpus(source, artifact)
+        lazy = InsightCorpus(source, artifact)
+        names_store = DatasetStore(Path(__file__).parent / "data", use_snapshot=False,
+                                   extra_player_names=lambda: list(lazy.players) if lazy.loaded else [])
+        names_store.reload()
+        assert not lazy.loaded and "Corpus Only" not in names_store.current.player_search.names
+        lazy.warmup(on_loaded=names_store.refresh_player_search).join()
+        assert "Corpus Only" in names_store.current.player_search.names
+        assert names_store.current.generation == 2
+        assert names_store.refresh_player_search().generation == 2
+
+def test_venue_phases():
+    """Duplicate .x/.y venue columns collapse and the phase metrics land in one float32 array"""
+    import pandas as pd
+    from pathlib import Path
+    from datasets import build_venue_phases
+    from venues import venue_id
+    from schema import VENUE_SCHEMA, load_table
+
+    data_dir = Path(__file__).parent / "data"
+    venues = load_table(data_dir, VENUE_SCHEMA)
+    assert not [column for column in venues.columns if column.endswith(('.x', '.y'))]
+    assert len(venues.columns) == 136 - 54 - 1  # Unnamed: 0 and the .y twins
+
+    # A pair that disagrees still yields the base column, from the .x side
+    from schema import drop_merge_duplicates
+    merged = drop_merge_duplicates(pd.DataFrame({"a.x": [1.0, 2.0], "a.y": [1.0, 3.0], "b": [0, 0]}))
+    assert list(merged.columns) == ["a", "b"] and merged["a"].tolist() == [1.0, 2.0]
+
+    summary, phases = build_venue_phases(venues)
+    assert phases.values.shape == (17, 3, 3, 6)
+    assert 'Powerplay_Runs_Scored_perMatch' not in summary.columns
+    raw = pd.read_csv(data_dir / VENUE_SCHEMA.filename)
+    venue = venue_id(raw['venue'].iloc[0])
+    assert phases.value(venue, 'death', 'first', 'Runs_Scored') == float(
+        raw['DeathOvers_Runs_Scored_First_Innings.y'].astype('float32').iloc[0])
+    assert phases.phase_stats(venue)['powerplay']['Dot_Pct'] == 40.35
+
+def test_venue_resolver():
+    """Every spelling of a ground resolves to the same canonical venue ID"""
+    from main import VENUES
+
+    with TestClient(app) as client:
+        resolver = store.current.venue_resolver
+        assert resolver.resolve("M. A. Chidambaram Stadium, Chennai") == "ma-chidambaram-stadium-chepauk-chennai"
+        assert resolver.resolve("m chinnaswamy stadium, bangalore") == "m-chinnaswamy-stadium-bengaluru"
+        assert resolver.resolve("Feroz Shah Kotla, Delhi") == "arun-jaitley-stadium-delhi"
+        assert resolver.resolve("Mumbai") is None  # three grounds, no guess
+        assert None not in resolver.resolve_many(VENUES)
+
+        response = client.get("/venue/M. A. Chidambaram Stadium, Chennai/insights")
+        assert response.json()["venue_id"] == "ma-chidambaram-stadium-chepauk-chennai"
+        response = client.post("/venues/resolve", json=["Wankhede", "Lord's"])
+        assert [row["venue_id"] for row in response.json()["venues"]] == ["wankhede-stadium-mumbai", None]
+
+def test_player_search():
+    """Search matches name prefixes, surnames and small misspellings across every name source"""
+    with TestClient(app) as client:
+        def names(query):
+            return [row["name"] for row in client.get("/players/search", params={"q": query}).json()["results"]]
+
+        assert names("Virat Kohli")[0] == "Virat Kohli"
+        assert "Virat Kohli" in names("vir")
+        assert "Virat Kohli" in names("kohli")
+        assert "Jasprit Bumrah" in names("jaspirt")
+        # Bowlers only appear in the squad lists
+        assert "Trent Boult" in names("boult")
+        assert names("zzzz") == []
+
+def test_response_cache():
+    """Static endpoints carry a strong ETag tied to the dataset and answer If-None-Match with 304"""
+    with TestClient(app) as client:
+        first = client.get("/teams")
+        etag = first.headers["etag"]
+        assert first.json()["teams"] and etag.startswith(f'"{store.current.version}.')
+        cached = client.get("/teams", headers={"If-None-Match": etag})
+        assert cached.status_code == 304 and not cached.content
+        assert client.get("/teams/Nope/players").status_code == 404
+
+        # A new dataset generation invalidates every tag
+        store.rerank(store.rank_config)
+        assert client.get("/teams", headers={"If-None-Match": etag}).status_code == 200
+
+def test_fast_json():
+    """NaN/inf serialize as null and numpy values need no conversion, with or without orjson"""
+    import numpy as np
+    import fast_json
+
+    payload = {"sr": float("nan"), "rates": np.array([141.5, np.nan, np.inf]), "balls": np.int64(12)}
+    expected = b'{"sr":null,"rates":[141.5,null,null],"balls":12}'
+    assert fast_json.NumpyJSONResponse(payload).body == expected
+
+    orjson, fast_json.orjson = fast_json.orjson, None
+    try:
+        assert fast_json.dumps(payload) == expected
+    finally:
+        fast_json.orjson = orjson
+
+    with TestClient(app) as client:
+        assert client.get("/player/KL Rahul/bowling-stats").json()["bowling_stats"]
+
+def test_team_dossier():
+    """One dossier call carries what the per-player fan-out used to fetch"""
+    with TestClient(app) as client:
+        team = "Chennai Super Kings"
+        dossier = client.get(f"/team/{team}/dossier", params={"venue": "Chepauk"}).json()
+        squad = client.get(f"/teams/{team}/players").json()["players"]
+        assert [player["name"] for player in dossier["players"]] == squad
+
+        first = dossier["players"][0]
+        assert first["insights"] == client.get(f"/player/{first['name']}/insights").json()["insights"]
+        assert first["bowling_stats"] == client.get(f"/player/{first['name']}/bowling-stats").json()["bowling_stats"]
+        assert dossier["venue"]["venue_id"] == "ma-chidambaram-stadium-chepauk-chennai"
+        assert dossier["venue"]["venue"] == store.current.venue_resolver.name_of(dossier["venue"]["venue_id"])
+        assert client.get(f"/team/{team}/dossier", params={"venue": "chepauk"}).json() == dossier
+        from main import responses
+        cached = len(responses)
+        assert client.get(f"/team/{team}/dossier", params={"venue": "Nowhere Ground 123"}).status_code == 200
+        assert len(responses) == cached
+        assert set(dossier["venue"]["phases"]) == {"powerplay", "middle", "death"}
+        assert client.get("/team/Nope/dossier").status_code == 404
+
+def test_batch():
+    """Sub-requests resolve against one dataset, each with its own status"""
+    with TestClient(app) as client:
+        response = client.post("/batch", json={"requests": [
+            "/player/KL Rahul/bowling-stats",
+            {"id": "search", "path": "/players/search?q=kohli"},
+            "/team/Nope/insights",
+            "/no/such/route",
+            "/metrics",
+        ]})
+        results = response.json()["results"]
+        assert results["/metrics"]["status"] == 200 and "# TYPE" in results["/metrics"]["body"]
+        assert results["/player/KL Rahul/bowling-stats"]["body"] == client.get("/player/KL Rahul/bowling-stats").json()
+        assert results["search"]["body"]["results"][0]["name"] == "Virat Kohli"
+        assert results["/team/Nope/insights"] == {"status": 404, "error": "Team insights not found"}
+        assert results["/no/such/route"]["status"] == 404
+        assert client.post("/batch", json={"requests": [{"id": 1}]}).status_code == 422
+
+        # Dossiers share the route's cached bodies instead of being rebuilt on the event loop
+        from main import flight
+        team = "Mumbai Indians"
+        computed = flight.stats()["computed"]
+        results = client.post("/batch", json={"requests": [
+            {"id": str(i), "path": f"/team/{team}/dossier?venue=Wankhede"} for i in range(20)
+        ] + ["/team/Nope/dossier"]}).json()["results"]
+        assert flight.stats()["computed"] == computed + 1
+        assert results["0"]["body"] == client.get(f"/team/{team}/dossier", params={"venue": "Wankhede"}).json()
+        assert results["/team/Nope/dossier"]["status"] == 404
+
+def test_matchup_plan():
+    """Plans cover all 20 overs, within 4 per bowler and never back to back"""
+    with TestClient(app) as client:
+        bowlers = [
+            {"name": "A", "type": "Right arm pace"},
+            {"name": "B", "type": "Left arm pace"},
+            {"name": "C", "type": "Off spin", "phases": ["middle"]},
+            {"name": "D", "type": "Leg spin"},
+            {"name": "E", "type": "Right arm pace", "phases": ["powerplay", "death"]},
+            {"name": "F", "type": "Slow left arm orthodox"},
+        ]
+        batters = client.get("/teams/Chennai Super Kings/players").json()["players"][:11]
+        plan = client.post("/matchup/plan", json={"batters": batters, "bowlers": bowlers}).json()
+        names = [over["bowler"] for over in plan["overs"]]
+        assert len(names) == 20
+        assert all(names.count(name) <= 4 for name in names)
+        assert all(a != b for a, b in zip(names, names[1:]))
+        assert all(over["phase"] == "middle" for over in plan["overs"] if over["bowler"] == "C")
+        assert abs(sum(over["expected_runs"] for over in plan["overs"]) - plan["total_expected_runs"]) < 0.1
+
+        too_few = client.post("/matchup/plan", json={"batters": batters, "bowlers": bowlers[:4]})
+        assert too_few.status_code == 422
+        bad_type = client.post("/matchup/plan", json={"batters": batters, "bowlers": [{"name": "X", "type": "Googly"}] * 5})
+        assert bad_type.status_code == 422
+
+def test_team_scatter_metrics():
+    """Team scatter comes from the team CSV, with any numeric column as an axis"""
+    with TestClient(app) as client:
+        points = client.get("/team-scatter-plot-data").json()["team_scatter_data"]
+        csk = next(point for point in points if point["name"] == "Chennai Super Kings")
+        assert csk == {"name": "Chennai Super Kings", "first_innings_avg": 173.59, "second_innings_avg": 152.45,
+                       "first_innings_sr": 144.27, "second_innings_sr": 134.38}
+
+        params = {"x": "boundary_percentage", "y": "dot_ball_percentage"}
+        response = client.get("/team-scatter-plot-data", params=params)
+        body = response.json()
+        assert (body["x_metric"], body["y_metric"]) == ("boundary_percentage", "dot_ball_percentage")
+        assert {"name": "Chennai Super Kings", "x": 18.42, "y": 34.77} in body["team_scatter_data"]
+        again = client.get("/team-scatter-plot-data", params=params, headers={"If-None-Match": response.headers["etag"]})
+        assert again.status_code == 304
+        assert client.get("/team-scatter-plot-data", params={"x": "batting_team"}).status_code == 422
+
+def test_offload():
+    """Offloaded calls run on the pool, inline when disabled, and shed load past the queue limit"""
+    import asyncio
+    import threading
+    import time
+    from fastapi import HTTPException
+    from offload import Offloader
+
+    pool = Offloader(threads=2, queue_limit=1)
+    pool.start()
+    try:
+        assert asyncio.run(pool.cpu(threading.current_thread)) is not threading.current_thread()
+        assert Offloader(threads=0).stats()["threads"] == 0
+        assert asyncio.run(Offloader(threads=0).cpu(threading.current_thread)) is threading.current_thread()
+
+        async def two_at_once():
+            return await asyncio.gather(pool.cpu(time.sleep, 0.05), pool.cpu(time.sleep, 0.05), return_exceptions=True)
+        results = asyncio.run(two_at_once())
+        assert sum(isinstance(r, HTTPException) and r.status_code == 503 for r in results) == 1
+        assert pool.stats()["rejected"] == 1
+    finally:
+        pool.shutdown()
+
+def test_single_flight():
+    """Concurrent identical calls share one computation, errors included"""
+    import asyncio
+    from single_flight import SingleFlight
+
+    flight = SingleFlight()
+    runs = []
+
+    async def compute(value):
+        runs.append(value)
+        await asyncio.sleep(0.01)
+        if value == "bad":
+            raise ValueError(value)
+        return [value]
+
+    async def burst():
+        same = await asyncio.gather(*(flight.do("k", lambda: compute("a")) for _ in range(10)))
+        failed = await asyncio.gather(*(flight.do("e", lambda: compute("bad")) for _ in range(3)),
+                                      return_exceptions=True)
+        return same, failed
+
+    same, failed = asyncio.run(burst())
+    assert runs == ["a", "bad"]
+    assert all(result is same[0] for result in same)
+    assert all(isinstance(error, ValueError) for error in failed)
+    assert flight.stats() == {"calls": 13, "computed": 2, "coalesced": 11, "in_flight": 0}
+
+    async def leader_cancelled():
+        leader = asyncio.ensure_future(flight.do("c", lambda: compute("c")))
+        await asyncio.sleep(0)
+        followers = [asyncio.ensure_future(flight.do("c", lambda: compute("c"))) for _ in range(2)]
+        await asyncio.sleep(0)
+        leader.cancel()
+        return await asyncio.gather(*followers), leader.cancelled()
+
+    followers, cancelled = asyncio.run(leader_cancelled())
+    assert cancelled and followers == [["c"], ["c"]]
+    assert runs == ["a", "bad", "c"] and flight.stats()["in_flight"] == 0
+
+def test_result_cache():
+    """Equivalent scatter selections share one entry; the cache is bounded and per dataset"""
+    from main import results
+    from result_cache import ResultCache
+
+    with TestClient(app) as client:
+        results.on_dataset(store.current)
+        before = results.stats()
+        first = client.get("/scatter-plot-data", params={"selected_players": "Virat Kohli,KL Rahul"}).json()
+        second = client.get("/scatter-plot-data", params={"selected_players": " kl rahul , Virat Kohli,KL Rahul"}).json()
+        assert first == second
+        assert sum(point["isSelected"] for point in first["scatter_data"]) == 2
+        after = results.stats()
+        assert (after["hits"] - before["hits"], after["misses"] - before["misses"]) == (1, 1)
+
+    cache = ResultCache(max_entries=2, max_bytes=40)
+    data = store.current
+    for i in range(3):
+        cache.get(data, i, lambda: [i])
+    assert cache.stats()["entries"] == 2 and cache.stats()["evictions"] == 1
+    cache.get(data, "big", lambda: ["x" * 30])
+    assert cache.stats()["bytes"] <= 40
+    cache.on_dataset(data)
+    assert cache.stats()["entries"] == 0
+
+def test_metrics():
+    """Requests are recorded per route template and exposed in Prometheus text format"""
+    with TestClient(app) as client:
+        client.get("/player/Virat Kohli/insights")
+        client.get("/player/KL Rahul/insights")
+        client.get("/no/such/route")
+        response = client.get("/metrics")
+        assert response.headers["content-type"].startswith("text/plain")
+        lines = response.text.splitlines()
+        pid = f'pid="{os.getpid()}"'
+        route = f'{pid},method="GET",route="/player/{{player_name}}/insights"'
+        count = next(line for line in lines if line.startswith(f"ipl_request_duration_seconds_count{{{route}}}"))
+        assert int(count.split()[-1]) >= 2
+        assert f'ipl_request_duration_seconds_bucket{{{route},le="+Inf"}}' in response.text
+        assert 'route="unmatched",status="404"' in response.text
+        assert not any("Virat" in line for line in lines)
+        assert f'ipl_lookup_duration_seconds_count{{{pid},lookup="player_insights"}}' in response.text
+        # Every sample is labelled with the worker, so prefork workers never look like counter resets
+        assert all(pid in line for line in lines if not line.startswith("#"))
+        assert f"ipl_single_flight_coalesced_total{{{pid}}}" in response.text
+        assert f"ipl_result_cache_hits_total{{{pid}}}" in response.text
+
+def test_request_profiler():
+    """Admins can force a profile; slow requests are captured; the ring stays bounded"""
+    import tempfile
+    import time
+    from pathlib import Path
+    from config import settings
+    from main import profiler
+    from profiler import RequestProfiler
+
+    with tempfile.TemporaryDirectory() as tmp:
+        token, directory = settings.ADMIN_TOKEN, profiler.directory
+        settings.ADMIN_TOKEN, profiler.directory = "secret", Path(tmp) / "forced"
+        try:
+            with TestClient(app) as client:
+                headers = {"X-Profile": "1", "X-Admin-Token": "secret"}
+                response = client.get("/player/Virat Kohli/insights", headers=headers)
+                profile_id = response.headers["x-profile-id"]
+                listed = client.get("/admin/profiles", headers={"X-Admin-Token": "secret"}).json()["profiles"]
+                assert listed[0]["id"] == profile_id
+                assert listed[0]["route"] == "/player/{player_name}/insights"
+                assert client.get(f"/admin/profiles/{profile_id}", headers={"X-Admin-Token": "secret"}).status_code == 200
+                assert "x-profile-id" not in client.get("/health", headers={"X-Profile": "1"}).headers
+                assert client.get("/admin/profiles").status_code == 401
+        finally:
+            settings.ADMIN_TOKEN, profiler.directory = token, directory
+
+        slow = RequestProfiler(Path(tmp) / "slow", ring_size=2, slow_seconds=0.01)
+        slow.start()
+        try:
+            for _ in range(3):
+                capture = slow.begin("/slow")
+                time.sleep(0.05)
+                slow.end(capture, "/slow", 200)
+        finally:
+            slow.stop()
+        profiles = slow.profiles()
+        assert len(profiles) == 2 and {p["reason"] for p in profiles} == {"slow"}
+        assert "test_request_profiler" in slow.read(profiles[0]["id"])
+
 if __name__ == "__main__":
     test_basic_endpoints()
+    test_scatter_plot_data()
+    test_schema_normalization()
+    test_bowling_stats_lookup()
+    test_bowler_type_matrix()
+    test_data_snapshot()
+    test_dataset_hot_reload()
+    test_ingest_deliveries()
+    test_rank_engine()
+    test_insight_engine()
+    test_insight_corpus()
+    test_venue_phases()
+    test_venue_resolver()
+    test_player_search()
+    test_response_cache()
+    test_fast_json()
+    test_team_dossier()
+    test_batch()
+    test_matchup_plan()
+    test_team_scatter_metrics()
+    test_offload()
+    test_single_flight()
+    test_result_cache()
+    test_metrics()
+    test_request_profiler()
@@ -0,0 +1,146 @@
+import re
+import unicodedata
+from collections import Counter
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional
+
+# Old and new spellings of the same city, folded before matching
+CITY_SYNONYMS = {
+    'bangalore': 'bengaluru',
+    'madras': 'chennai',
+    'bombay': 'mumbai',
+    'calcutta': 'kolkata',
+    'vizag': 'visakhapatnam',
+}
+
+# Former names of grounds that were renamed, mapped to the current name
+RENAMED_VENUES = {
+    'Feroz Shah Kotla, Delhi': 'Arun Jaitley Stadium, Delhi',
+    'Sardar Patel Stadium, Motera, Ahmedabad': 'Narendra Modi Stadium, Ahmedabad',
+}
+
+# Fuzzy matches need this share of the query's trigrams to appear in the venue
+MIN_TRIGRAM_SCORE = 0.6
+_CACHE_LIMIT = 4096
+
+
+def _tokens(name: str) -> List[str]:
+    text = unicodedata.normalize('NFKD', name).encode('ascii', 'ignore').decode().lower()
+    return [CITY_SYNONYMS.get(token, token) for token in re.findall(r"[a-z0-9]+", text)]
+
+
+def normalize_venue_name(name: str) -> str:
+    """Lowercase, drop punctuation and fold city synonyms: "M. A. Chidambaram, Madras" -> "m a chidambaram chennai" """
+    return " ".join(_tokens(name))
+
+
+def venue_id(name: str) -> str:
+    """Stable canonical ID for a venue's canonical name, e.g. "eden-gardens-kolkata" """
+    return "-".join(_tokens(name))
+
+
+def _trigrams(name: str) -> set:
+    # Spaces are dropped so "M A Chidambaram" and "MA Chidambaram" share trigrams
+    compact = "".join(_tokens(name))
+    return {compact[i:i + 3] for i in range(len(compact) - 2)} or {compact}
+
+
+def _aliases(name: str) -> List[str]:
+    """Spellings generated from one canonical name: in full, without the city, and collapsed"""
+    normalized = normalize_venue_name(name)
+    parts = [normalize_venue_name(part) for part in name.split(',')]
+    aliases = [normalized, normalized.replace(" ", ""), parts[0]]
+    # "Ground, Suburb, City" -> also "Ground, City"
+    if len(parts) > 2:
+        aliases.append(f"{parts[0]} {parts[-1]}")
+    return aliases
+
+
+@dataclass
+class VenueResolver:
+    """Resolves any spelling of a venue to its canonical ID.
+
+    Exact and generated aliases resolve with one dict lookup; anything else
+    goes through the trigram index and the answer is memoized, so repeat
+    misspellings cost the same as an alias hit.
+    """
+    ids: List[str]
+    names: Dict[str, str]         # id -> canonical name
+    aliases: Dict[str, str]       # normalized spelling -> id
+    trigrams: Dict[str, List[int]]  # trigram -> positions in ids
+    venue_trigrams: List[set]
+    _memo: Dict[str, Optional[str]]
+
+    def resolve(self, name: str) -> Optional[str]:
+        """Canonical venue ID for ``name``, or None when nothing is close enough"""
+        found = self.aliases.get(name)
+        if found is not None:
+            return found
+        try:
+            return self._memo[name]
+        except KeyError:
+            pass
+
+        normalized = normalize_venue_name(name)
+        found = self.aliases.get(normalized) or self._fuzzy(name)
+        if len(self._memo) >= _CACHE_LIMIT:
+            self._memo.clear()
+        self._memo[name] = found
+        return found
+
+    def resolve_many(self, names: Iterable[str]) -> List[Optional[str]]:
+        """resolve() for every name, in order"""
+        return [self.resolve(name) for name in names]
+
+    def name_of(self, venue: str) -> Optional[str]:
+        return self.names.get(venue)
+
+    def _fuzzy(self, name: str) -> Optional[str]:
+        query = _trigrams(name)
+        shared = Counter()
+        for gram in query:
+            shared.update(self.trigrams.get(gram, ()))
+        if not shared:
+            return None
+        (best, score), *rest = shared.most_common(2)
+        if score / len(query) < MIN_TRIGRAM_SCORE:
+            return None
+        if rest and rest[0][1] == score:
+            # A bare city name ("Mumbai") matches several grounds equally; don't guess
+            if score == len(query):
+                return None
+            # Otherwise prefer the venue with the fewest unmatched trigrams
+            tied = [i for i, count in shared.items() if count == score]
+            best = min(tied, key=lambda i: len(self.venue_trigrams[i]))
+        return self.ids[best]
+
+
+def build_venue_resolver(canonical_names: Iterable[str], extra_aliases: Iterable[str] = ()) -> VenueResolver:
+    """Index ``canonical_names`` and map each of ``extra_aliases`` to its closest canonical venue"""
+    names = list(dict.fromkeys(canonical_names))
+    ids = [venue_id(name) for name in names]
+
+    aliases: Dict[str, str] = {}
+    trigrams: Dict[str, List[int]] = {}
+    venue_trigrams = []
+    for i, (vid, name) in enumerate(zip(ids, names)):
+        aliases[name] = vid
+        for alias in _aliases(name):
+            aliases.setdefault(alias, vid)
+        grams = _trigrams(name)
+        venue_trigrams.append(grams)
+        for gram in grams:
+            trigrams.setdefault(gram, []).append(i)
+
+    resolver = VenueResolver(ids, dict(zip(ids, names)), aliases, trigrams, venue_trigrams, {})
+    for old, new in RENAMED_VENUES.items():
+        if new in aliases:
+            for alias in _aliases(old):
+                aliases.setdefault(alias, aliases[new])
+    # Known alternate spellings (e.g. the /venues list) become exact aliases
+    for alias in extra_aliases:
+        found = resolver.resolve(alias)
+        if found is not None:
+            aliases.setdefault(alias, found)
+            aliases.setdefault(normalize_venue_name(alias), found)
+    return resolver